@@ -1,9 +1,15 @@
+import re
+from pathlib import Path
+
 from setuptools import setup
 
+# Version is defined only in src/version.py, the package uses it in keys of cached results.
+VERSION = re.search(r'__version__ = "(.+)"', Path("src/version.py").read_text()).group(1)
 
 setup(
     name="call-center-tools",
-    version="1.0.0",
+    version=VERSION,
     packages=["call_center_tools"],
     package_dir={"call_center_tools": "src"},
+    extras_require={"numpy": ["numpy"]},
 )
@@ -2,17 +2,80 @@
 Module docstring
 """
 
-from .erlang import erlang_b, erlang_c
+from .aio import acalc_staffing, acalc_staffing_batch
+from .cache import CacheInfo, PersistentStaffingCache, StaffingCache
+from .erlang import (
+    EngsetIterator,
+    ErlangIterator,
+    agents_for_blocking,
+    engset_b,
+    engset_c,
+    erlang_b,
+    erlang_b_derivative,
+    erlang_b_stable,
+    erlang_c,
+    erlang_c_derivative,
+    erlang_c_stable,
+)
+from .erlang_a import ErlangAData, calc_staffing_erlang_a, erlang_a
+from .erlang_table import ErlangCTable, build_erlang_c_table
+from .finite_queue import (
+    FiniteQueueData,
+    calc_staffing_finite_queue,
+    finite_queue,
+    finite_queue_sequence,
+)
+from .planner import (
+    IntervalForecast,
+    IntervalPlan,
+    PlannerStats,
+    plan_csv,
+    plan_intervals,
+    plan_parallel,
+    read_forecast,
+    write_plan,
+)
 from .staffing import (
+    ChatStaffingData,
+    LazyStaffingData,
+    SearchMethod,
+    SearchStats,
     StaffingData,
+    StaffingRow,
+    StaffingTable,
     TimeUnit,
     add_shrinkage,
     agents_to_meet_occupancy,
+    calc_agents_continuous,
     calc_average_speed_of_answer,
+    calc_average_speed_of_answer_continuous,
     calc_calls_per_hour,
     calc_immediate_answer,
     calc_occupancy,
     calc_service_level,
+    calc_service_level_continuous,
     calc_staffing,
+    calc_staffing_batch,
+    calc_staffing_chat,
+    calc_staffing_curve,
+    calc_staffing_sequence,
     calc_traffic_intensity,
+    calc_wait_time_cdf,
+    calc_wait_time_quantiles,
+    estimate_agents,
+    max_agents_for_service_level,
+    max_aht_for_agents,
+    max_calls_for_agents,
+)
+from .vectorized import (
+    agents_for_blocking_array,
+    engset_b_array,
+    engset_c_array,
+    erlang_b_array,
+    erlang_c_array,
+    max_aht_for_agents_array,
+    max_calls_for_agents_array,
+    wait_time_cdf_array,
+    wait_time_quantiles_array,
 )
+from .version import __version__
@@ -0,0 +1,199 @@
+"""
+Module contains asyncio versions of staffing calculations.
+
+Calculations are run in executor, so event loop is not blocked. Identical requests
+which are in flight at the same time share one calculation.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from numbers import Number
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Union
+from weakref import WeakKeyDictionary
+
+from .staffing import (
+    SearchMethod,
+    StaffingData,
+    StaffingTable,
+    TimeUnit,
+    calc_staffing,
+    calc_staffing_batch,
+)
+
+# Calculations in flight for each event loop: key of request -> [future, number of waiters].
+_in_flight: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, List[Any]]]" = (
+    WeakKeyDictionary()
+)
+
+
+def __freeze(value: Any) -> Hashable:
+    """
+    Convert parameter of request to hashable value.
+
+    Parameters
+    ----------
+    value : Any
+        Scalar or iterable parameter.
+
+    Returns
+    -------
+    Hashable
+        The same scalar or tuple of values.
+    """
+    # NumPy scalars are not int or float, but are numbers.
+    if value is None or isinstance(value, (str, Number, TimeUnit, SearchMethod)):
+        return value
+    return tuple(value)
+
+
+async def __run_shared(
+    key: Hashable,
+    function: Callable[[], Any],
+    executor: Optional[Executor],
+    timeout: Optional[float],
+) -> Any:
+    """
+    Run function in executor or join the same calculation which is already in flight.
+
+    Each waiter has its own timeout and can be cancelled without affecting other waiters.
+    Calculation is cancelled when there are no waiters left, if it's not started yet.
+
+    Parameters
+    ----------
+    key : Hashable
+        Key of the request, requests with equal keys share calculation.
+    function : Callable[[], Any]
+        Calculation, should be picklable for process pool executor.
+    executor : Executor, optional
+        Executor for calculation, default executor of event loop if not specified.
+    timeout : float, optional
+        The longest time to wait for result in seconds.
+
+    Returns
+    -------
+    Any
+        Result of the function.
+    """
+    loop = asyncio.get_running_loop()
+    in_flight = _in_flight.setdefault(loop, {})
+    entry = in_flight.get(key)
+    if entry is None:
+        entry = [loop.run_in_executor(executor, function), 0]
+        in_flight[key] = entry
+
+        def forget(_: Any, entry: List[Any] = entry) -> None:
+            if in_flight.get(key) is entry:
+                del in_flight[key]
+
+        entry[0].add_done_callback(forget)
+    entry[1] += 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(entry[0]), timeout)
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0 and not entry[0].done():
+            entry[0].cancel()
+
+
+async def acalc_staffing(
+    calls_per_hour: float,
+    aht: float,
+    agents: Optional[int] = None,
+    max_occupancy: float = 0.85,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    shrinkage: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+    search: SearchMethod = SearchMethod.LINEAR,
+    sources: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    timeout: Optional[float] = None,
+) -> StaffingData:
+    """
+    Async version of calc_staffing(), calculation parameters are the same except lazy.
+
+    Result is shared by identical requests in flight and each waiter gets its own copy,
+    so it is always eager StaffingData.
+
+    Parameters
+    ----------
+    executor : Executor, optional
+        Executor for calculation, default executor of event loop if not specified.
+        ProcessPoolExecutor runs calculations in parallel with each other.
+    timeout : float, optional
+        The longest time to wait for result in seconds, asyncio.TimeoutError is raised after it.
+
+    Returns
+    -------
+    StaffingData
+        Result of calculations. Each waiter gets its own copy.
+
+    Examples
+    --------
+    >>> async def plan():
+    ...     return await asyncio.gather(*(acalc_staffing(1000, 120) for _ in range(100)))
+    >>> results = asyncio.run(plan())  # calculated only once
+    >>> results[0].agents
+    40
+    """
+    arguments = (
+        calls_per_hour,
+        aht,
+        agents,
+        max_occupancy,
+        target_answer_time,
+        target_service_level,
+        shrinkage,
+        time_unit,
+        search,
+    )
+    function = functools.partial(calc_staffing, *arguments, sources=sources)
+    key = ("calc_staffing",) + arguments + (sources,)
+    result = await __run_shared(key, function, executor, timeout)
+    return result.copy()
+
+
+async def acalc_staffing_batch(
+    calls_per_hour: Iterable[float],
+    aht: Union[float, Iterable[float]],
+    agents: Optional[Iterable[Optional[int]]] = None,
+    max_occupancy: Union[float, Iterable[float]] = 0.85,
+    target_answer_time: Union[float, Iterable[float]] = 20,
+    target_service_level: Union[float, Iterable[float]] = 0.80,
+    shrinkage: Union[None, float, Iterable[Optional[float]]] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+    executor: Optional[Executor] = None,
+    timeout: Optional[float] = None,
+) -> StaffingTable:
+    """
+    Async version of calc_staffing_batch(), calculation parameters are the same.
+
+    Parameters
+    ----------
+    executor : Executor, optional
+        Executor for calculation, default executor of event loop if not specified.
+    timeout : float, optional
+        The longest time to wait for result in seconds, asyncio.TimeoutError is raised after it.
+
+    Returns
+    -------
+    StaffingTable
+        Result of calculations. Each waiter gets its own copy.
+    """
+    arguments = tuple(
+        __freeze(value)
+        for value in (
+            calls_per_hour,
+            aht,
+            agents,
+            max_occupancy,
+            target_answer_time,
+            target_service_level,
+            shrinkage,
+            time_unit,
+        )
+    )
+    function = functools.partial(calc_staffing_batch, *arguments)
+    result = await __run_shared(("calc_staffing_batch",) + arguments, function, executor, timeout)
+    return result[:]
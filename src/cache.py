@@ -0,0 +1,495 @@
+"""
+Module contains bounded thread-safe cache for Erlang and staffing calculations
+and persistent cache of staffing results in SQLite database.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .erlang import erlang_b, erlang_c
+from .staffing import (
+    STAFFING_TABLE_FIELDS,
+    SearchMethod,
+    StaffingData,
+    TimeUnit,
+    calc_staffing,
+    calc_traffic_intensity,
+)
+from .version import __version__
+
+# Fields of StaffingData stored in persistent cache, the same as in StaffingTable.
+# search_stats is not stored.
+PERSISTENT_FIELDS = STAFFING_TABLE_FIELDS
+
+
+@dataclass
+class CacheInfo:
+    """
+    Cache statistics.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Part of calls answered from cache. Range 0-1(0%-100%).
+        """
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class StaffingCache:
+    """
+    LRU cache for erlang_b(), erlang_c() and calc_staffing() calls.
+
+    Cache is opt-in: call methods of the cache instead of module functions.
+    Calculation is done outside of the lock, so cache can be shared by threads of a pool.
+    When cache is full the least recently used result is removed.
+
+    Parameters
+    ----------
+    maxsize : int, default=4096
+        The highest number of cached results.
+    intensity_quantum : float, optional
+        If specified - traffic intensity is rounded to the nearest multiple of this value
+        before calculation, so close intensities share one cached result.
+
+    Examples
+    --------
+    >>> cache = StaffingCache(maxsize=1000, intensity_quantum=0.01)
+    >>> cache.calc_staffing(calls_per_hour=1000, aht=120).agents
+    40
+    >>> cache.calc_staffing(calls_per_hour=1000.01, aht=120).agents
+    40
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=1000, currsize=1)
+    """
+
+    def __init__(self, maxsize: int = 4096, intensity_quantum: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError(f"Cache size should be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.intensity_quantum = intensity_quantum
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def quantize(self, t_intensity: float) -> float:
+        """
+        Round traffic intensity to the nearest multiple of intensity_quantum.
+
+        Parameters
+        ----------
+        t_intensity : float
+            Traffic intensity in Erlangs.
+
+        Returns
+        -------
+        float
+            Rounded traffic intensity. The same value if quantization is disabled.
+        """
+        if not self.intensity_quantum:
+            return t_intensity
+        return round(t_intensity / self.intensity_quantum) * self.intensity_quantum
+
+    def _lookup(self, key: Hashable, calculate: Callable[[], Any]) -> Any:
+        """
+        Return cached result for the key, calculate and store it if there is no such result.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the result.
+        calculate : Callable[[], Any]
+            Function which calculates result.
+
+        Returns
+        -------
+        Any
+            Cached or calculated result.
+        """
+        with self._lock:
+            if key in self._results:
+                self._hits += 1
+                self._results.move_to_end(key)
+                return self._results[key]
+            self._misses += 1
+        result = calculate()
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def erlang_b(self, t_intensity: float, agents: int) -> float:
+        """
+        Cached version of erlang_b().
+
+        Parameters
+        ----------
+        t_intensity : float
+            Traffic intensity in Erlangs.
+        agents : int
+            Number of agents.
+
+        Returns
+        -------
+        float
+            Probability of blocking. Range 0-1(0%-100%).
+        """
+        t_intensity = self.quantize(t_intensity)
+        return self._lookup(
+            ("erlang_b", t_intensity, agents), lambda: erlang_b(t_intensity, agents)
+        )
+
+    def erlang_c(self, t_intensity: float, agents: int) -> float:
+        """
+        Cached version of erlang_c().
+
+        Parameters
+        ----------
+        t_intensity : float
+            Traffic intensity in Erlangs.
+        agents : int
+            Number of agents.
+
+        Returns
+        -------
+        float
+            Probability that there is no available agents to answer the call.
+            Range 0-1(0%-100%).
+        """
+        t_intensity = self.quantize(t_intensity)
+        return self._lookup(
+            ("erlang_c", t_intensity, agents), lambda: erlang_c(t_intensity, agents)
+        )
+
+    def calc_staffing(
+        self,
+        calls_per_hour: float,
+        aht: float,
+        agents: Optional[int] = None,
+        max_occupancy: float = 0.85,
+        target_answer_time: float = 20,
+        target_service_level: float = 0.80,
+        shrinkage: Optional[float] = None,
+        time_unit: TimeUnit = TimeUnit.SEC,
+        search: SearchMethod = SearchMethod.LINEAR,
+        sources: Optional[int] = None,
+    ) -> StaffingData:
+        """
+        Cached version of calc_staffing(), parameters are the same except lazy.
+
+        If quantization is enabled, calls_per_hour is adjusted so that traffic intensity
+        is a multiple of intensity_quantum. Cached results are copied for each caller,
+        so they are always eager StaffingData and lazy is not supported.
+
+        Returns
+        -------
+        StaffingData
+            Copy of cached result, so it can be modified by caller.
+        """
+        if self.intensity_quantum and aht:
+            t_intensity = self.quantize(calc_traffic_intensity(calls_per_hour, aht, time_unit))
+            calls_per_hour = t_intensity / (aht / time_unit.value)
+        arguments = (
+            calls_per_hour,
+            aht,
+            agents,
+            max_occupancy,
+            target_answer_time,
+            target_service_level,
+            shrinkage,
+            time_unit,
+            search,
+        )
+        result = self._lookup(
+            ("calc_staffing",) + arguments + (sources,),
+            lambda: calc_staffing(*arguments, sources=sources),
+        )
+        return result.copy()
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Get cache statistics.
+
+        Returns
+        -------
+        CacheInfo
+            Number of hits and misses, maximal and current size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._results))
+
+    def cache_clear(self) -> None:
+        """
+        Remove all cached results and reset statistics.
+        """
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+class PersistentStaffingCache:
+    """
+    On-disk cache of calc_staffing() results in SQLite database.
+
+    Key of the result is SHA-256 hash of normalized inputs and version of the package,
+    so results of older versions are never returned. Database is opened in WAL mode,
+    so several processes can read and write it at the same time. Lookup of the result is
+    one search by primary key, cached results are not modified by reads.
+    When cache has more than maxsize results, the oldest results are removed.
+
+    Parameters
+    ----------
+    path : str
+        Path to the database file, created if doesn't exist.
+    maxsize : int, default=1000000
+        The highest number of stored results.
+    timeout : float, default=30
+        How long to wait for lock of the database held by other process, in seconds.
+
+    Examples
+    --------
+    >>> with PersistentStaffingCache("staffing.sqlite") as cache:
+    ...     results = cache.calc_staffing_many(
+    ...         [{"calls_per_hour": 1000, "aht": 120}, {"calls_per_hour": 1200, "aht": 120}]
+    ...     )
+    >>> [result.agents for result in results]
+    [40, 48]
+    """
+
+    # Variables in one SQL statement, the lowest limit of old SQLite versions is 999.
+    BULK_SIZE = 500
+
+    def __init__(self, path: str, maxsize: int = 1_000_000, timeout: float = 30):
+        if maxsize <= 0:
+            raise ValueError(f"Cache size should be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS staffing ("
+                "key BLOB PRIMARY KEY, created REAL NOT NULL, "
+                "traffic_intensity REAL, wait_probability REAL, immediate_answer REAL, "
+                "service_level REAL, average_speed_of_answer REAL, occupancy REAL, "
+                "agents INTEGER, agents_with_shrinkage INTEGER) WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS staffing_created ON staffing (created)"
+            )
+            # Number of stored results is kept in one row, so puts don't count the table.
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS staffing_size ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO staffing_size (id, size) "
+                "SELECT 0, (SELECT count(*) FROM staffing) "
+                "WHERE NOT EXISTS (SELECT 1 FROM staffing_size)"
+            )
+
+    @staticmethod
+    def make_key(
+        calls_per_hour: float,
+        aht: float,
+        agents: Optional[int] = None,
+        max_occupancy: float = 0.85,
+        target_answer_time: float = 20,
+        target_service_level: float = 0.80,
+        shrinkage: Optional[float] = None,
+        time_unit: TimeUnit = TimeUnit.SEC,
+        sources: Optional[int] = None,
+    ) -> bytes:
+        """
+        Calculate key of calc_staffing() result, parameters are the same.
+
+        Numbers are converted to float, agents 0 is the same as None and
+        search method is not used, because all methods give the same result.
+
+        Returns
+        -------
+        bytes
+            SHA-256 hash of normalized inputs and version of the package.
+        """
+        inputs = [
+            __version__,
+            float(calls_per_hour),
+            float(aht),
+            int(agents) if agents else None,
+            float(max_occupancy),
+            float(target_answer_time),
+            float(target_service_level),
+            float(shrinkage) if shrinkage else None,
+            time_unit.name,
+            int(sources) if sources is not None else None,
+        ]
+        return hashlib.sha256(json.dumps(inputs).encode()).digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, StaffingData]:
+        """
+        Get stored results for many keys in one read transaction.
+
+        Parameters
+        ----------
+        keys : Iterable[bytes]
+            Keys from make_key().
+
+        Returns
+        -------
+        Dict[bytes, StaffingData]
+            Stored results by key, missing keys are skipped.
+        """
+        keys = list(keys)
+        results = {}
+        with self._lock, self._connection:
+            # sqlite3 doesn't open transaction for SELECT, so chunks would see different
+            # states of the database written by other processes.
+            self._connection.execute("BEGIN")
+            for start in range(0, len(keys), self.BULK_SIZE):
+                end = start + self.BULK_SIZE
+                chunk = keys[start:end]
+                rows = self._connection.execute(
+                    f"SELECT key, {', '.join(PERSISTENT_FIELDS)} FROM staffing "
+                    f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for key, *values in rows:
+                    results[key] = StaffingData(*values)
+        return results
+
+    def put_many(self, items: Iterable[Tuple[bytes, StaffingData]]) -> None:
+        """
+        Store many results in one transaction and remove the oldest ones over maxsize.
+
+        Results which are already stored are kept, as the same key gives the same result.
+
+        Parameters
+        ----------
+        items : Iterable[Tuple[bytes, StaffingData]]
+            Pairs of key from make_key() and result.
+        """
+        created = time.time()
+        rows = [
+            (key, created) + tuple(getattr(result, name) for name in PERSISTENT_FIELDS)
+            for key, result in items
+        ]
+        with self._lock, self._connection:
+            added = self._connection.executemany(
+                f"INSERT OR IGNORE INTO staffing VALUES ({', '.join('?' * 10)})", rows
+            ).rowcount
+            if added <= 0:
+                return
+            self._connection.execute("UPDATE staffing_size SET size = size + ?", (added,))
+            (size,) = self._connection.execute("SELECT size FROM staffing_size").fetchone()
+            if size > self.maxsize:
+                removed = self._connection.execute(
+                    "DELETE FROM staffing WHERE key IN "
+                    "(SELECT key FROM staffing ORDER BY created LIMIT ?)",
+                    (size - self.maxsize,),
+                ).rowcount
+                self._connection.execute("UPDATE staffing_size SET size = size - ?", (removed,))
+
+    def calc_staffing_many(self, requests: Iterable[Dict[str, Any]]) -> List[StaffingData]:
+        """
+        Cached version of calc_staffing() for many requests.
+
+        Stored results are read in one transaction, missing results are calculated
+        and stored in one transaction. Results are stored with all metrics,
+        so they are always eager StaffingData and lazy=True raises ValueError.
+
+        Parameters
+        ----------
+        requests : Iterable[Dict[str, Any]]
+            Keyword arguments of calc_staffing() for each request.
+
+        Returns
+        -------
+        List[StaffingData]
+            Results in the same order as requests.
+        """
+        requests = list(requests)
+        if any(request.get("lazy") for request in requests):
+            raise ValueError("PersistentStaffingCache stores eager results, lazy is not supported")
+        keys = [
+            self.make_key(
+                **{name: value for name, value in request.items() if name not in ("search", "lazy")}
+            )
+            for request in requests
+        ]
+        results = self.get_many(keys)
+        calculated = {}
+        for key, request in zip(keys, requests):
+            if key not in results and key not in calculated:
+                calculated[key] = calc_staffing(**request)
+        if calculated:
+            self.put_many(calculated.items())
+        with self._lock:
+            self._misses += len(calculated)
+            self._hits += len(requests) - len(calculated)
+        results.update(calculated)
+        return [results[key].copy() for key in keys]
+
+    def calc_staffing(self, calls_per_hour: float, aht: float, **kwargs) -> StaffingData:
+        """
+        Cached version of calc_staffing(), parameters are the same, lazy=True raises ValueError.
+
+        Returns
+        -------
+        StaffingData
+            Stored or calculated result, always eager.
+        """
+        return self.calc_staffing_many([dict(kwargs, calls_per_hour=calls_per_hour, aht=aht)])[0]
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Get cache statistics. Hits and misses are counted for this instance only.
+
+        Returns
+        -------
+        CacheInfo
+            Number of hits and misses, maximal and current size of the cache.
+        """
+        with self._lock:
+            (size,) = self._connection.execute("SELECT size FROM staffing_size").fetchone()
+            return CacheInfo(self._hits, self._misses, self.maxsize, size)
+
+    def cache_clear(self) -> None:
+        """
+        Remove all stored results and reset statistics.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM staffing")
+            self._connection.execute("UPDATE staffing_size SET size = 0")
+            self._hits = 0
+            self._misses = 0
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        self._connection.close()
+
+    def __enter__(self) -> "PersistentStaffingCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
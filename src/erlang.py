@@ -2,6 +2,19 @@
 Module contains implementation of Erlang B, C formulas.
 """
 
+import math
+import sys
+from typing import Tuple
+
+# Relative precision of the series and continued fraction in stable formulas.
+STABLE_EPSILON = 1e-16
+# Natural logarithm of the smallest positive float, exp() of anything below is 0.
+MIN_LOG = math.log(sys.float_info.min * sys.float_info.epsilon)
+# Coefficients of Stirling series for log(n!) error term.
+STIRLING_SERIES = (1 / 12, 1 / 360, 1 / 1260, 1 / 1680, 1 / 1188)
+# Sums over queue states are scaled down when weight of the state grows above this value.
+SCALE_LIMIT = 1e200
+
 
 def erlang_b(t_intensity: float, agents: int) -> float:
     """
@@ -67,3 +80,828 @@ def erlang_c(t_intensity: float, agents: int) -> float:
         result += product
     result = 1 / (result * (agents - t_intensity) / agents + 1)
     return result if result <= 1 else 1
+
+
+def __stirling_error(agents: float) -> float:
+    """
+    Calculates error of Stirling approximation log(n!) - log(sqrt(2 * pi * n) * (n / e) ** n).
+
+    Parameters
+    ----------
+    agents : float
+        Positive number n.
+
+    Returns
+    -------
+    float
+        Stirling approximation error.
+    """
+    if agents <= 15:
+        return (
+            math.lgamma(agents + 1)
+            - (agents + 0.5) * math.log(agents)
+            + agents
+            - math.log(math.sqrt(2 * math.pi))
+        )
+    inverse_square = 1 / (agents * agents)
+    # Less terms are needed for bigger numbers.
+    terms = 2 if agents > 500 else 3 if agents > 80 else 4 if agents > 35 else 5
+    result = 0.0
+    for coefficient in reversed(STIRLING_SERIES[:terms]):
+        result = coefficient - result * inverse_square
+    return result / agents
+
+
+def __deviance(agents: float, t_intensity: float) -> float:
+    """
+    Calculates agents * log(agents / t_intensity) + t_intensity - agents without cancellation.
+
+    Parameters
+    ----------
+    agents : float
+        Positive number of agents.
+    t_intensity : float
+        Positive traffic intensity in Erlangs.
+
+    Returns
+    -------
+    float
+        Deviance part of Poisson probability.
+    """
+    difference = agents - t_intensity
+    if abs(difference) >= 0.1 * (agents + t_intensity):
+        return agents * math.log(agents / t_intensity) - difference
+    ratio = difference / (agents + t_intensity)
+    result = difference * ratio
+    term = 2 * agents * ratio
+    ratio *= ratio
+    for j in range(1, 1000):
+        term *= ratio
+        previous, result = result, result + term / (2 * j + 1)
+        if result == previous:
+            break
+    return result
+
+
+def log_poisson_probability(t_intensity: float, agents: float) -> float:
+    """
+    Calculates logarithm of t_intensity ** agents * exp(-t_intensity) / agents!.
+
+    This is a probability of exactly `agents` busy agents when there are infinitely many
+    agents. Uses Loader's saddle point algorithm, so there is no overflow and no loss of
+    precision for big numbers. Agents can be non integer, agents! is gamma(agents + 1).
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : float
+        Number of agents.
+
+    Returns
+    -------
+    float
+        Natural logarithm of Poisson probability.
+
+    Examples
+    --------
+    >>> log_poisson_probability(123, 132)
+    -3.682489678663288
+    """
+    if t_intensity == 0:
+        return 0 if agents == 0 else -math.inf
+    if agents == 0:
+        return -t_intensity
+    return (
+        -__stirling_error(agents)
+        - __deviance(agents, t_intensity)
+        - 0.5 * math.log(2 * math.pi * agents)
+    )
+
+
+def __inverse_blocking_series(t_intensity: float, agents: float, probability: float) -> float:
+    """
+    Calculates 1 / B using series for incomplete gamma function. Should be used if A <= N + 1.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : float
+        Number of agents.
+    probability : float
+        Poisson probability from log_poisson_probability().
+
+    Returns
+    -------
+    float
+        Inverse of blocking probability.
+    """
+    term = total = t_intensity / (agents + 1)
+    denominator = agents + 1
+    while term > total * STABLE_EPSILON:
+        denominator += 1
+        term *= t_intensity / denominator
+        total += term
+    # Probability that more than N agents are busy.
+    overflow = probability * total
+    return (1 - overflow) / probability
+
+
+def __inverse_blocking_fraction(t_intensity: float, agents: float) -> float:
+    """
+    Calculates 1 / B using continued fraction for incomplete gamma function.
+    Should be used if A > N + 1.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : float
+        Number of agents.
+
+    Returns
+    -------
+    float
+        Inverse of blocking probability.
+    """
+    tiny = 1e-300
+    shape = agents + 1
+    denominator = t_intensity + 1 - shape
+    fraction = 1 / tiny
+    value = 1 / denominator
+    result = value
+    for i in range(1, 1000000):
+        numerator = -i * (i - shape)
+        denominator += 2
+        value = numerator * value + denominator
+        value = 1 / (value if abs(value) >= tiny else tiny)
+        fraction = denominator + numerator / fraction
+        fraction = fraction if abs(fraction) >= tiny else tiny
+        delta = value * fraction
+        result *= delta
+        if abs(delta - 1) < STABLE_EPSILON:
+            break
+    return t_intensity * result
+
+
+def erlang_b_stable(t_intensity: float, agents: float) -> float:
+    """
+    Calculates blocking probability using Erlang B formula without overflow.
+
+    Erlang B is a ratio of Poisson probability and Poisson distribution function,
+    which is calculated in O(sqrt(N)) with series or continued fraction of incomplete
+    gamma function. Obviously zero and one results are returned in O(1).
+    Works for intensities 1e-6 - 1e6 and up to 1e6 agents, relative error is below 1e-12.
+    Agents can be non integer, then result is continuous extension of Erlang B
+    A ** N * exp(-A) / upper_incomplete_gamma(N + 1, A).
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : float
+        Number of agents. Can be non integer.
+
+    Returns
+    -------
+    float
+        Probability of blocking. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> erlang_b_stable(123, 132)
+    0.031242821046996376
+    >>> erlang_b_stable(1e-6, 1000000)
+    0.0
+    """
+    if agents == 0:
+        return 1.0
+    if t_intensity == 0:
+        return 0.0
+    # 1 - B < N / A, so result is 1 with float precision.
+    if agents < t_intensity * STABLE_EPSILON:
+        return 1.0
+    if t_intensity > agents + 1:
+        return 1 / __inverse_blocking_fraction(t_intensity, agents)
+    log_probability = log_poisson_probability(t_intensity, agents)
+    # B < 2 * Poisson probability here, so result underflows to 0.
+    if log_probability < MIN_LOG:
+        return 0.0
+    probability = math.exp(log_probability)
+    return 1 / __inverse_blocking_series(t_intensity, agents, probability)
+
+
+def erlang_c_stable(t_intensity: float, agents: float) -> float:
+    """
+    Calculates wait probability using Erlang C formula without overflow.
+
+    Uses erlang_b_stable() and identity C = N * B / (N - A * (1 - B)).
+    Works for intensities 1e-6 - 1e6 and up to 1e6 agents, relative error is below 1e-12.
+    Agents can be non integer, then result is continuous extension of Erlang C.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : float
+        Number of agents. Can be non integer.
+
+    Returns
+    -------
+    float
+        Probability that there is no available agents to answer the call. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> erlang_c_stable(123, 132)
+    0.3211161792617074
+    """
+    if agents <= t_intensity:
+        return 1.0
+    blocking = erlang_b_stable(t_intensity, agents)
+    result = agents * blocking / (agents - t_intensity * (1 - blocking))
+    return result if result <= 1 else 1.0
+
+
+def erlang_b_derivative(t_intensity: float, agents: float) -> float:
+    """
+    Calculates derivative of continuous Erlang B with respect to number of agents.
+
+    Derivative of incomplete gamma function by its parameter has no closed form, so
+    central difference of log(B) is used. Log of Erlang B is smooth, relative error
+    of the result is below 1e-9.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : float
+        Number of agents. Can be non integer, should be positive.
+
+    Returns
+    -------
+    float
+        Derivative dB/dN. Always negative or zero.
+
+    Examples
+    --------
+    >>> erlang_b_derivative(123, 132)
+    -0.0032641251751063887
+    """
+    blocking = erlang_b_stable(t_intensity, agents)
+    if blocking == 0 or blocking == 1:
+        return 0.0
+    step = 1e-4 * math.sqrt(max(agents, 1))
+    step = min(step, agents / 2)
+    upper = erlang_b_stable(t_intensity, agents + step)
+    lower = erlang_b_stable(t_intensity, agents - step)
+    if upper == 0 or lower == 0:
+        return 0.0
+    return blocking * (math.log(upper) - math.log(lower)) / (2 * step)
+
+
+def erlang_c_derivative(t_intensity: float, agents: float) -> float:
+    """
+    Calculates derivative of continuous Erlang C with respect to number of agents.
+
+    Uses erlang_b_derivative() and derivative of identity C = N * B / (N - A * (1 - B)):
+    dC/dN = (N * (N - A) * dB/dN - A * B * (1 - B)) / (N - A * (1 - B)) ** 2.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : float
+        Number of agents. Can be non integer, should be positive.
+
+    Returns
+    -------
+    float
+        Derivative dC/dN. Always negative or zero, zero if agents <= t_intensity.
+
+    Examples
+    --------
+    >>> erlang_c_derivative(123, 132)
+    -0.04608112682687742
+    """
+    if agents <= t_intensity:
+        return 0.0
+    blocking = erlang_b_stable(t_intensity, agents)
+    derivative = erlang_b_derivative(t_intensity, agents)
+    denominator = agents - t_intensity * (1 - blocking)
+    numerator = agents * (agents - t_intensity) * derivative - t_intensity * blocking * (
+        1 - blocking
+    )
+    return numerator / (denominator * denominator)
+
+
+class ErlangIterator:
+    """
+    Incremental Erlang B/C calculator for fixed traffic intensity.
+
+    Keeps blocking probability for current number of agents, so moving from N to N + 1
+    agents costs O(1) instead of evaluating whole formula again.
+    Uses Erlang B recurrence B(N) = A * B(N - 1) / (N + A * B(N - 1))
+    and identity C(N) = N * B(N) / (N - A * (1 - B(N))).
+    Blocking probabilities of all passed numbers of agents are kept, so moving back
+    to any of them costs O(1) too.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : int, default=0
+        Initial number of agents.
+
+    Attributes
+    ----------
+    steps : int
+        Number of recurrence steps calculated. Moves to already passed agents are free.
+
+    Examples
+    --------
+    >>> iterator = ErlangIterator(123, 131)
+    >>> iterator.step()
+    132
+    >>> iterator.wait_probability
+    0.3211161792617073
+    """
+
+    def __init__(self, t_intensity: float, agents: int = 0):
+        self.t_intensity = t_intensity
+        self.agents = 0
+        self.blocking_probability = 1.0
+        self.steps = 0
+        # Blocking probabilities for first, first + 1, ... agents.
+        self.__first = 0
+        self.__history = [1.0]
+        self.advance(agents)
+
+    def _next_blocking(self, agents: int, blocking: float) -> float:
+        """
+        Calculate blocking probability for agents from blocking probability for agents - 1.
+
+        Parameters
+        ----------
+        agents : int
+            Number of agents.
+        blocking : float
+            Blocking probability for agents - 1.
+
+        Returns
+        -------
+        float
+            Blocking probability for agents.
+        """
+        load = self.t_intensity * blocking
+        return load / (agents + load)
+
+    def _previous_blocking(self, agents: int, blocking: float) -> float:
+        """
+        Calculate blocking probability for agents - 1 from blocking probability for agents.
+
+        Uses backward recurrence B(N - 1) = N * B(N) / (A * (1 - B(N))).
+
+        Parameters
+        ----------
+        agents : int
+            Number of agents.
+        blocking : float
+            Blocking probability for agents.
+
+        Returns
+        -------
+        float
+            Blocking probability for agents - 1.
+        """
+        load = self.t_intensity * (1 - blocking)
+        # Zero and one can't be inverted.
+        if blocking == 0 or load == 0:
+            return self._stable_blocking(agents - 1)
+        return min(agents * blocking / load, 1.0)
+
+    def _stable_blocking(self, agents: int) -> float:
+        """
+        Calculate blocking probability for agents without recurrence.
+
+        Parameters
+        ----------
+        agents : int
+            Number of agents.
+
+        Returns
+        -------
+        float
+            Blocking probability for agents.
+        """
+        return erlang_b_stable(self.t_intensity, agents)
+
+    def step(self) -> int:
+        """
+        Add one agent.
+
+        Returns
+        -------
+        int
+            New number of agents.
+        """
+        self.agents += 1
+        index = self.agents - self.__first
+        if index == len(self.__history):
+            self.steps += 1
+            self.__history.append(self._next_blocking(self.agents, self.blocking_probability))
+        self.blocking_probability = self.__history[index]
+        return self.agents
+
+    def step_back(self) -> int:
+        """
+        Remove one agent.
+
+        Backward recurrence costs O(1), but loses precision below traffic intensity,
+        so it is used only for short walks down.
+
+        Returns
+        -------
+        int
+            New number of agents.
+        """
+        if self.agents == 0:
+            raise ValueError("Number of agents can't be negative")
+        if self.agents == self.__first:
+            self.steps += 1
+            blocking = self._previous_blocking(self.agents, self.blocking_probability)
+            self.__history.insert(0, blocking)
+            self.__first -= 1
+        self.agents -= 1
+        self.blocking_probability = self.__history[self.agents - self.__first]
+        return self.agents
+
+    def seek(self, agents: int) -> None:
+        """
+        Move to specified number of agents without walking from zero.
+
+        Unknown blocking probability is calculated with erlang_b_stable() in O(sqrt(N)),
+        then passed agents are forgotten and next steps start from the new number of agents.
+
+        Parameters
+        ----------
+        agents : int
+            Target number of agents.
+        """
+        if not self.__first <= agents < self.__first + len(self.__history):
+            self.__first = agents
+            self.__history = [self._stable_blocking(agents)]
+        self.agents = agents
+        self.blocking_probability = self.__history[agents - self.__first]
+
+    def advance(self, agents: int) -> None:
+        """
+        Move to specified number of agents.
+
+        Already passed agents are taken from memory, others are reached by adding agents
+        one by one. Below all passed agents blocking probability is calculated with
+        backward recurrence if walk is short and stays above traffic intensity, otherwise
+        with seek(). Result is the same for any path.
+
+        Parameters
+        ----------
+        agents : int
+            Target number of agents.
+        """
+        first = self.__first
+        if agents < first:
+            if agents < self.t_intensity or first - agents > math.sqrt(first):
+                self.seek(agents)
+                return
+            self.seek(first)
+            while self.agents > agents:
+                self.step_back()
+            return
+        self.seek(min(agents, first + len(self.__history) - 1))
+        while self.agents < agents:
+            self.step()
+
+    @property
+    def wait_probability(self) -> float:
+        """
+        Erlang C wait probability for current number of agents.
+
+        Returns
+        -------
+        float
+            Probability that there is no available agents to answer the call. Range 0-1(0%-100%).
+        """
+        if self.agents <= self.t_intensity:
+            return 1
+        blocking = self.blocking_probability
+        result = self.agents * blocking / (self.agents - self.t_intensity * (1 - blocking))
+        return result if result <= 1 else 1
+
+
+def agents_for_blocking(t_intensity: float, target_blocking: float) -> int:
+    """
+    Calculates the lowest number of agents (lines, ports) with blocking not more than target.
+
+    Erlang B recurrence runs once and stops as soon as target is met, so solve costs
+    the same as one erlang_b() call.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    target_blocking : float
+        The highest allowed probability of blocking. Should be more than 0.
+
+    Returns
+    -------
+    int
+        Number of agents.
+
+    Examples
+    --------
+    >>> agents_for_blocking(340, 0.005)
+    373
+    """
+    if target_blocking <= 0:
+        raise ValueError(f"Target blocking should be more than 0, got {target_blocking}")
+    iterator = ErlangIterator(t_intensity)
+    while iterator.blocking_probability > target_blocking:
+        iterator.step()
+    return iterator.agents
+
+
+def engset_b(t_intensity: float, agents: int, sources: int) -> float:
+    """
+    Calculates blocking probability using Engset formula for finite number of sources.
+
+    t_intensity is traffic offered when all sources are idle: sources * calls per hour of
+    one idle source * aht. Caller sees other sources - 1, so result is Engset call congestion.
+    With infinitely many sources result is the same as erlang_b().
+    Uses stable recurrence E(N) = (S - N) * a * E(N - 1) / (N + (S - N) * a * E(N - 1)),
+    where a = t_intensity / sources.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs when all sources are idle.
+    agents : int
+        Number of agents.
+    sources : int
+        Number of sources (for example employees who call the help desk).
+
+    Returns
+    -------
+    float
+        Probability of blocking. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> engset_b(30, 35, 300)
+    0.0240570132601889
+    """
+    return EngsetIterator(t_intensity, sources, agents).blocking_probability
+
+
+def engset_c(t_intensity: float, agents: int, sources: int) -> float:
+    """
+    Calculates wait probability of finite source delay model (machine repair model).
+
+    Sources which wait or talk don't call, so queue can't be longer than sources - agents
+    and the model is stable for any number of agents.
+    With infinitely many sources result is the same as erlang_c().
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs when all sources are idle.
+    agents : int
+        Number of agents.
+    sources : int
+        Number of sources (for example employees who call the help desk).
+
+    Returns
+    -------
+    float
+        Probability that there is no available agents to answer the call. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> engset_c(30, 35, 300)
+    0.08852849256137146
+    """
+    return EngsetIterator(t_intensity, sources, agents).wait_probability
+
+
+class EngsetIterator(ErlangIterator):
+    """
+    Incremental Engset calculator for fixed traffic intensity and number of sources.
+
+    Moving from N to N + 1 agents costs O(1) for blocking probability. Metrics of
+    finite source delay model sum over queue states, which costs O(sources - N).
+    Can be used everywhere ErlangIterator is used, for example in agent search of
+    calc_staffing().
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs when all sources are idle.
+    sources : int
+        Number of sources.
+    agents : int, default=0
+        Initial number of agents.
+
+    Examples
+    --------
+    >>> iterator = EngsetIterator(30, 300, 34)
+    >>> iterator.step()
+    35
+    >>> iterator.wait_probability
+    0.08852849256137146
+    """
+
+    def __init__(self, t_intensity: float, sources: int, agents: int = 0):
+        if sources <= 0:
+            raise ValueError(f"Number of sources should be positive, got {sources}")
+        self.sources = sources
+        super().__init__(t_intensity, agents)
+
+    def _next_blocking(self, agents: int, blocking: float) -> float:
+        """
+        Calculate blocking probability for agents from blocking probability for agents - 1.
+
+        Parameters
+        ----------
+        agents : int
+            Number of agents.
+        blocking : float
+            Blocking probability for agents - 1.
+
+        Returns
+        -------
+        float
+            Blocking probability for agents.
+        """
+        idle = max(self.sources - agents, 0)
+        load = idle * self.t_intensity / self.sources * blocking
+        return load / (agents + load)
+
+    def _previous_blocking(self, agents: int, blocking: float) -> float:
+        """
+        Calculate blocking probability for agents - 1 from blocking probability for agents.
+
+        Uses backward recurrence E(N - 1) = N * E(N) / ((S - N) * a * (1 - E(N))).
+
+        Parameters
+        ----------
+        agents : int
+            Number of agents.
+        blocking : float
+            Blocking probability for agents.
+
+        Returns
+        -------
+        float
+            Blocking probability for agents - 1.
+        """
+        idle = max(self.sources - agents, 0)
+        load = idle * self.t_intensity / self.sources * (1 - blocking)
+        # Zero and one can't be inverted.
+        if blocking == 0 or load == 0:
+            return self._stable_blocking(agents - 1)
+        return min(agents * blocking / load, 1.0)
+
+    def _stable_blocking(self, agents: int) -> float:
+        """
+        Calculate blocking probability for agents with engset_b(), which costs O(N).
+
+        Parameters
+        ----------
+        agents : int
+            Number of agents.
+
+        Returns
+        -------
+        float
+            Blocking probability for agents.
+        """
+        return engset_b(self.t_intensity, agents, self.sources)
+
+    def __queue_sums(self, answers: float) -> Tuple[float, float, float, float]:
+        """
+        Sum weights of states seen by caller for current number of agents.
+
+        Parameters
+        ----------
+        answers : float
+            Expected number of answers of busy agents in target time.
+
+        Returns
+        -------
+        Tuple[float, float, float, float]
+            Weights of all states, of states with wait, of states with wait longer than
+            target time, and average wait in units of aht multiplied by weight of all states.
+        """
+        agents, blocking = self.agents, self.blocking_probability
+        per_source = self.t_intensity / self.sources
+        free = 1 - blocking
+        queued = late = wait = 0.0
+        # Caller who finds j callers in queue waits for j + 1 answers.
+        log_answers = math.log(answers) if answers > 0 else -math.inf
+        log_poisson = -answers
+        cumulative = 0.0
+        weight = blocking
+        for j in range(max(self.sources - agents, 0)):
+            cumulative += math.exp(log_poisson) if log_poisson > MIN_LOG else 0.0
+            queued += weight
+            late += weight * min(cumulative, 1.0)
+            wait += weight * (j + 1) / agents
+            ratio = (self.sources - agents - j - 1) * per_source / agents
+            weight *= ratio
+            # Ratios only decrease, so the rest of the tail is less than weight / (1 - ratio).
+            if ratio < 1 and weight < (1 - ratio) * (free + queued) * STABLE_EPSILON:
+                break
+            log_poisson += log_answers - math.log(j + 1)
+            if weight > SCALE_LIMIT:
+                weight, free, queued = (
+                    weight / SCALE_LIMIT,
+                    free / SCALE_LIMIT,
+                    queued / SCALE_LIMIT,
+                )
+                late, wait = late / SCALE_LIMIT, wait / SCALE_LIMIT
+        return free + queued, queued, late, wait
+
+    @property
+    def wait_probability(self) -> float:
+        """
+        Wait probability of finite source delay model for current number of agents.
+
+        Returns
+        -------
+        float
+            Probability that there is no available agents to answer the call. Range 0-1(0%-100%).
+        """
+        if self.agents == 0:
+            return 1
+        total, queued, _, _ = self.__queue_sums(0)
+        return queued / total
+
+    def service_level(self, target_answer_time: float, aht: float) -> float:
+        """
+        Part of calls answered in target time for current number of agents.
+
+        Parameters
+        ----------
+        target_answer_time : float
+            Target time of answer to incoming call. Should have same unit as aht.
+        aht : float
+            Average Handling Time.
+
+        Returns
+        -------
+        float
+            Service level. Range 0-1(0%-100%).
+        """
+        if self.agents == 0:
+            return 0
+        total, _, late, _ = self.__queue_sums(self.agents * target_answer_time / aht)
+        return 1 - late / total
+
+    def average_speed_of_answer(self, aht: float) -> float:
+        """
+        Average wait of all calls for current number of agents.
+
+        Parameters
+        ----------
+        aht : float
+            Average Handling Time.
+
+        Returns
+        -------
+        float
+            Average time in which call is answered. Unit is the same as for AHT.
+        """
+        if self.agents == 0:
+            return math.inf
+        total, _, _, wait = self.__queue_sums(0)
+        return wait / total * aht
+
+    @property
+    def occupancy(self) -> float:
+        """
+        Occupancy for current number of agents.
+
+        Each source cycles through idle time, wait and talk, so carried traffic is
+        t_intensity / (1 + a * (1 + W / aht)), where a = t_intensity / sources.
+
+        Returns
+        -------
+        float
+            Occupancy. Range 0-1(0%-100%).
+        """
+        if self.agents == 0:
+            return 1
+        total, _, _, wait = self.__queue_sums(0)
+        per_source = self.t_intensity / self.sources
+        carried = self.t_intensity / (1 + per_source * (1 + wait / total))
+        return min(carried / self.agents, 1.0)
@@ -0,0 +1,297 @@
+"""
+Module contains Erlang A (M/M/N+M) model, where callers abandon the queue after
+exponentially distributed patience, and staffing solver for it.
+
+Time is measured in units of aht inside the module: service rate is 1,
+abandonment rate of one waiting caller is gamma = aht / patience.
+Probabilities of states with N + j callers are calculated relative to state with N callers:
+r(j) = A^j / ((N + gamma) * (N + 2 * gamma) * ... * (N + j * gamma)).
+States below N are summed with Erlang B: sum of their probabilities is 1 / B - 1.
+Caller who finds j callers in queue is answered with probability N / (N + (j + 1) * gamma),
+and given it's answered, exp(-gamma * wait) has Beta(N / gamma + 1, j + 1) distribution,
+so probability to be answered in target time is a finite sum.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .erlang import MIN_LOG, SCALE_LIMIT, STABLE_EPSILON, ErlangIterator, erlang_b_stable
+from .staffing import TimeUnit, calc_traffic_intensity, estimate_agents
+
+
+@dataclass
+class ErlangAData:
+    """
+    Metrics of Erlang A model for one number of agents.
+
+    service_level and abandonment_probability are parts of all offered calls.
+    average_speed_of_answer is average wait of answered calls, including immediately answered.
+    occupancy is calculated from answered calls only.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    traffic_intensity: float
+    agents: int
+    wait_probability: float
+    abandonment_probability: float
+    service_level: float
+    average_speed_of_answer: float
+    occupancy: float
+
+
+def __calc_erlang_a(
+    t_intensity: float,
+    agents: int,
+    blocking_probability: float,
+    aht: float,
+    patience: float,
+    target_answer_time: float,
+) -> ErlangAData:
+    """
+    Calculate Erlang A metrics from Erlang B blocking probability for the same agents.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : int
+        Number of agents. Should be positive.
+    blocking_probability : float
+        Erlang B for the same intensity and number of agents.
+    aht : float
+        Average Handling Time.
+    patience : float
+        Average time caller waits before abandonment. Should have same unit as aht.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+
+    Returns
+    -------
+    ErlangAData
+        Metrics of the model.
+    """
+    # pylint: disable=too-many-locals
+    gamma = aht / patience
+    # Caller answered after j + 1 stages: exp(-gamma * wait) ~ Beta(shape, j + 1).
+    shape = agents / gamma + 1
+    log_x = -gamma * target_answer_time / aht
+    log_step = math.log(-math.expm1(log_x)) if log_x < 0 else -math.inf
+    log_term = shape * log_x
+    cumulative = 0.0
+    stages = 0.0
+
+    # Weights of states relative to the state with N callers.
+    free = 1 / blocking_probability - 1
+    waiting = answered = in_target = answered_wait = 0.0
+    term = 1.0
+    j = 0
+    while True:
+        answer = agents / (agents + (j + 1) * gamma)
+        stages += 1 / (agents + (j + 1) * gamma)
+        cumulative += math.exp(log_term) if log_term > MIN_LOG else 0.0
+        waiting += term
+        answered += term * answer
+        in_target += term * answer * max(0.0, 1 - cumulative)
+        answered_wait += term * answer * stages
+        ratio = t_intensity / (agents + (j + 1) * gamma)
+        if ratio < 1 and term * ratio < STABLE_EPSILON * waiting:
+            break
+        j += 1
+        term *= ratio
+        log_term += math.log((shape + j - 1) / j) + log_step
+        if term > SCALE_LIMIT:
+            term /= SCALE_LIMIT
+            free, waiting, answered = (
+                free / SCALE_LIMIT,
+                waiting / SCALE_LIMIT,
+                answered / SCALE_LIMIT,
+            )
+            in_target, answered_wait = in_target / SCALE_LIMIT, answered_wait / SCALE_LIMIT
+
+    total = free + waiting
+    served = free + answered
+    return ErlangAData(
+        traffic_intensity=t_intensity,
+        agents=agents,
+        wait_probability=waiting / total,
+        abandonment_probability=(waiting - answered) / total,
+        service_level=(free + in_target) / total,
+        average_speed_of_answer=answered_wait / served * aht if served else math.inf,
+        occupancy=min(t_intensity * served / total / agents, 1.0),
+    )
+
+
+def erlang_a(
+    t_intensity: float,
+    agents: int,
+    aht: float,
+    patience: float,
+    target_answer_time: float = 20,
+) -> ErlangAData:
+    """
+    Calculates metrics of Erlang A model (M/M/N+M) with abandonment.
+
+    Unlike Erlang C, the queue is stable for any number of agents, because waiting callers
+    abandon after patience time on average.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : int
+        Number of agents. Should be positive.
+    aht : float
+        Average Handling Time.
+    patience : float
+        Average time caller waits before abandonment. Should have same unit as aht.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same unit as aht.
+
+    Returns
+    -------
+    ErlangAData
+        Wait probability, abandonment probability, service level, average speed of answer
+        and occupancy.
+
+    Examples
+    --------
+    >>> erlang_a(100, 100, 300, 120).abandonment_probability
+    0.04881092143900909
+    """
+    if agents <= 0:
+        raise ValueError(f"Number of agents should be positive, got {agents}")
+    if patience <= 0:
+        raise ValueError(f"Patience should be positive, got {patience}")
+    blocking = erlang_b_stable(t_intensity, agents)
+    return __calc_erlang_a(t_intensity, agents, blocking, aht, patience, target_answer_time)
+
+
+def __search_agents(
+    evaluate: Callable[[int], ErlangAData],
+    meets_targets: Callable[[ErlangAData], bool],
+    low: int,
+    high: int,
+) -> ErlangAData:
+    """
+    Find the lowest number of agents not below low which meets targets.
+
+    Parameters
+    ----------
+    evaluate : Callable[[int], ErlangAData]
+        Calculates metrics for number of agents.
+    meets_targets : Callable[[ErlangAData], bool]
+        Checks targets, should be monotonic in number of agents.
+    low : int
+        Lower bound of the result.
+    high : int
+        Starting point of the search, not below low.
+
+    Returns
+    -------
+    ErlangAData
+        Metrics for the found number of agents.
+    """
+    result = evaluate(high)
+    if meets_targets(result):
+        # Walk down from the estimate by 1, 2, 4, ... agents.
+        step = 1
+        while high - step >= low:
+            lower_result = evaluate(high - step)
+            if not meets_targets(lower_result):
+                low = high - step + 1
+                break
+            high, result, step = high - step, lower_result, step * 2
+    else:
+        # Walk up from the estimate by 1, 2, 4, ... agents.
+        step = 1
+        while not meets_targets(result):
+            low, high, step = high + 1, high + step, step * 2
+            result = evaluate(high)
+    while low < high:
+        middle = (low + high) // 2
+        middle_result = evaluate(middle)
+        if meets_targets(middle_result):
+            high, result = middle, middle_result
+        else:
+            low = middle + 1
+    return result
+
+
+def calc_staffing_erlang_a(
+    calls_per_hour: float,
+    aht: float,
+    patience: float,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    max_abandonment: Optional[float] = None,
+    max_occupancy: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> ErlangAData:
+    """
+    Finds the lowest number of agents which meets targets in Erlang A model.
+
+    Search starts from square-root estimate of Erlang C staffing and walks down or up
+    by 1, 2, 4, ... agents until the result is bracketed, then bisection is used.
+    Answered calls can't be more than agents can handle, so service level is not more than
+    N / A and search never goes below target_service_level * A agents.
+    Erlang B values are calculated once for all numbers of agents with ErlangIterator,
+    so each evaluation costs only the sum over queue states.
+
+    Parameters
+    ----------
+    calls_per_hour : float
+        Number of calls offered per hour.
+    aht : float
+        Average Handling Time. Default unit is seconds.
+    patience : float
+        Average time caller waits before abandonment. Should have same time unit as aht.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same time unit as aht.
+    target_service_level : float, default=0.80 (80%).
+        Percentage of offered calls that should be answered in target_answer_time.
+    max_abandonment : float, optional
+        The highest allowed part of abandoned calls.
+    max_occupancy : float, optional
+        The highest allowed occupancy.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time, patience and target_answer_time.
+
+    Returns
+    -------
+    ErlangAData
+        Metrics for the found number of agents.
+
+    Examples
+    --------
+    >>> calc_staffing_erlang_a(1000, 120, patience=60).agents
+    32
+    """
+    if target_service_level >= 1:
+        raise ValueError("Service level target 1 (100%) can't be reached")
+    if max_abandonment is not None and max_abandonment <= 0:
+        raise ValueError("Abandonment target 0 can't be reached")
+    t_intensity = calc_traffic_intensity(calls_per_hour, aht, time_unit)
+    if t_intensity <= 0:
+        return ErlangAData(t_intensity, 0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    iterator = ErlangIterator(t_intensity)
+    blocking: List[float] = [iterator.blocking_probability]
+
+    def evaluate(agents: int) -> ErlangAData:
+        while len(blocking) <= agents:
+            iterator.step()
+            blocking.append(iterator.blocking_probability)
+        return __calc_erlang_a(
+            t_intensity, agents, blocking[agents], aht, patience, target_answer_time
+        )
+
+    def meets_targets(result: ErlangAData) -> bool:
+        return (
+            result.service_level >= target_service_level
+            and (max_abandonment is None or result.abandonment_probability <= max_abandonment)
+            and (max_occupancy is None or result.occupancy <= max_occupancy)
+        )
+
+    low = max(1, math.ceil(target_service_level * t_intensity))
+    start = estimate_agents(t_intensity, aht, target_answer_time, target_service_level)
+    return __search_agents(evaluate, meets_targets, low, max(low, start))
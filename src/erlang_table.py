@@ -0,0 +1,366 @@
+"""
+Module contains precalculated Erlang C table, stored in binary file and memory-mapped at runtime.
+
+Table is built once with build_erlang_c_table(). ErlangCTable maps the file read-only,
+so several processes which open the same file share its memory pages.
+
+Wait probability changes on the scale of sqrt(intensity), so table rows are placed
+uniformly by square root of intensity: intensity of row k is (k * root_step) ** 2.
+This gives the same interpolation error for small and big intensities.
+"""
+
+import math
+import mmap
+import struct
+from array import array
+from math import sqrt
+from typing import BinaryIO, Tuple
+
+from .erlang import ErlangIterator, erlang_c, erlang_c_stable
+
+MAGIC = b"ERLCTAB1"
+VERSION = 1
+# Magic, version, number of rows, root step, width, max interpolation error.
+HEADER = struct.Struct("<8sIIddd")
+
+
+def __row_agents(t_intensity: float, width: float) -> Tuple[int, int]:
+    """
+    Calculate range of agents stored in the table row.
+
+    Wait probability is 1 when agents <= t_intensity and negligible when agents are
+    more than t_intensity + width * sqrt(t_intensity), so only agents between are stored.
+    Values beyond stored agents are read as 0.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity of the row in Erlangs.
+    width : float
+        Number of square roots of intensity stored above intensity.
+
+    Returns
+    -------
+    Tuple[int, int]
+        The first stored number of agents and number of stored values.
+    """
+    return int(t_intensity) + 1, math.ceil(width * math.sqrt(t_intensity)) + 16
+
+
+def __calc_row(t_intensity: float, width: float) -> array:
+    """
+    Calculate wait probabilities for one table row.
+
+    Erlang B for the first number of agents is calculated with erlang_b_stable() in
+    O(sqrt(N)), next values are calculated with ErlangIterator in O(1).
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity of the row in Erlangs.
+    width : float
+        Number of square roots of intensity stored above intensity.
+
+    Returns
+    -------
+    array
+        Wait probabilities for agents from __row_agents().
+    """
+    first, count = __row_agents(t_intensity, width)
+    iterator = ErlangIterator(t_intensity)
+    iterator.seek(first)
+    row = array("d")
+    for _ in range(count):
+        row.append(iterator.wait_probability)
+        iterator.step()
+    return row
+
+
+def __interpolation_error(
+    t_intensity: float, upper_intensity: float, width: float, lower: array, upper: array
+) -> float:
+    """
+    Calculate the highest interpolation error between two rows at the middle intensity.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Intensity of the lower row.
+    upper_intensity : float
+        Intensity of the upper row.
+    width : float
+        Number of square roots of intensity stored above intensity.
+    lower : array
+        Values of the lower row.
+    upper : array
+        Values of the upper row.
+
+    Returns
+    -------
+    float
+        The highest absolute error of linear interpolation.
+    """
+    middle_intensity = (t_intensity + upper_intensity) / 2
+    lower_first, _ = __row_agents(t_intensity, width)
+    upper_first, _ = __row_agents(upper_intensity, width)
+    middle_first, _ = __row_agents(middle_intensity, width)
+    middle = __calc_row(middle_intensity, width)
+    error = 0.0
+    for i, exact in enumerate(middle):
+        agents = middle_first + i
+        lower_index, upper_index = agents - lower_first, agents - upper_first
+        if upper_index < 0 or lower_index >= len(lower) or upper_index >= len(upper):
+            continue
+        interpolated = (lower[lower_index] + upper[upper_index]) / 2
+        error = max(error, abs(interpolated - exact))
+    return error
+
+
+def build_erlang_c_table(
+    file: BinaryIO, max_intensity: float = 5000, root_step: float = 0.01, width: float = 8
+) -> float:
+    """
+    Build Erlang C table and write it to binary file.
+
+    Rows of the table are intensities (k * root_step) ** 2 up to max_intensity.
+    Each row contains wait probabilities for agents from int(intensity) + 1 to
+    intensity + width * sqrt(intensity) + 16. Interpolation error is measured in the middle
+    between every pair of rows, the last value of every row bounds error of reading values
+    beyond stored agents as 0. The highest of them is stored in the file.
+    Default table has 7073 rows, takes about 17 MB, interpolation error is below 6e-5.
+
+    Parameters
+    ----------
+    file : BinaryIO
+        File opened for binary writing, should be seekable.
+    max_intensity : float, default=5000
+        The highest intensity in the table in Erlangs.
+    root_step : float, default=0.01
+        Step between square roots of intensities of table rows.
+    width : float, default=8
+        Number of square roots of intensity stored above intensity in every row.
+
+    Returns
+    -------
+    float
+        The highest observed absolute error.
+
+    Examples
+    --------
+    >>> with open("erlang_c.bin", "wb") as file:
+    ...     build_erlang_c_table(file, max_intensity=100, root_step=0.05)
+    0.0011827161933678498
+    """
+    rows = math.ceil(math.sqrt(max_intensity) / root_step) + 1
+    offsets = array("Q", [0])
+    for row in range(rows):
+        offsets.append(offsets[-1] + __row_agents((row * root_step) ** 2, width)[1])
+    start = file.tell()
+    file.write(HEADER.pack(MAGIC, VERSION, rows, root_step, width, 0.0))
+    offsets.tofile(file)
+
+    error = 0.0
+    previous = None
+    for row in range(rows):
+        t_intensity = (row * root_step) ** 2
+        values = __calc_row(t_intensity, width)
+        # Wait probability decreases with agents, so values beyond the row are lower.
+        error = max(error, values[-1])
+        if previous is not None:
+            lower_intensity = ((row - 1) * root_step) ** 2
+            error = max(
+                error,
+                __interpolation_error(lower_intensity, t_intensity, width, previous, values),
+            )
+        values.tofile(file)
+        previous = values
+
+    end = file.tell()
+    file.seek(start)
+    file.write(HEADER.pack(MAGIC, VERSION, rows, root_step, width, error))
+    file.seek(end)
+    return error
+
+
+class ErlangCTable:
+    """
+    Read-only memory-mapped Erlang C table built with build_erlang_c_table().
+
+    Lookups are exact at grid intensities (within 1e-12 of erlang_c()), between grid
+    intensities values are interpolated linearly. max_error is the highest error observed
+    when the table was built: in the middle between rows and beyond stored agents, where
+    wait probability is returned as 0. erlang_c_stable() is used outside of the table (with
+    the same band of agents) and when agents are between intensities of two rows, where wait
+    probability is not smooth.
+    Lookup inside the table takes about 0.5 µs on CPython 3.11.
+
+    Parameters
+    ----------
+    path : str
+        Path to the table file.
+
+    Examples
+    --------
+    >>> with ErlangCTable("erlang_c.bin") as table:
+    ...     table.lookup(12.5, 15)
+    0.4019293653676076
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rows, root_step, width, error = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"File {path} is not an Erlang C table of version {VERSION}")
+        self.rows = rows
+        self.root_step = root_step
+        self.width = width
+        self.max_error = error
+        self.max_intensity = ((rows - 1) * root_step) ** 2
+        self._view = memoryview(self._mmap)
+        offsets_start = HEADER.size
+        values_start = offsets_start + (rows + 1) * 8
+        # Lookup reads only lists and the values view, lists are faster than memoryview.
+        with self._view[offsets_start:values_start] as raw, raw.cast("Q") as offsets:
+            self._offsets = offsets.tolist()
+        self._values = self._view[values_start:].cast("d")
+        # Cell between rows k and k + 1: intensity, start and end of values for both rows,
+        # index of value in _values is start + agents. One tuple per lookup is the fastest.
+        bounds = [
+            (self.row_intensity(row), offset - int(self.row_intensity(row)) - 1, end)
+            for row, (offset, end) in enumerate(zip(self._offsets, self._offsets[1:]))
+        ]
+        self._cells = [lower + upper for lower, upper in zip(bounds, bounds[1:])]
+        self._inverse_step = 1 / root_step
+
+    def _row_value(self, row: int, agents: int) -> float:
+        """
+        Get stored wait probability.
+
+        Parameters
+        ----------
+        row : int
+            Index of the row.
+        agents : int
+            Number of agents.
+
+        Returns
+        -------
+        float
+            Wait probability, 1 if agents <= intensity, 0 if agents are beyond stored values.
+        """
+        first = int(self.row_intensity(row)) + 1
+        if agents < first:
+            return 1.0
+        index = self._offsets[row] + agents - first
+        if index >= self._offsets[row + 1]:
+            return 0.0
+        return self._values[index]
+
+    def row_intensity(self, row: int) -> float:
+        """
+        Get traffic intensity of the table row.
+
+        Parameters
+        ----------
+        row : int
+            Index of the row.
+
+        Returns
+        -------
+        float
+            Traffic intensity in Erlangs.
+        """
+        return (row * self.root_step) ** 2
+
+    def lookup(self, t_intensity: float, agents: int) -> float:
+        """
+        Get wait probability from the table.
+
+        Row values are read inline instead of _row_value() calls, as lookup is the hot path.
+
+        Parameters
+        ----------
+        t_intensity : float
+            Traffic intensity in Erlangs.
+        agents : int
+            Number of agents.
+
+        Returns
+        -------
+        float
+            Probability that there is no available agents to answer the call.
+            Range 0-1(0%-100%).
+        """
+        if agents <= t_intensity:
+            return 1
+        if not 0 <= t_intensity < self.max_intensity:
+            return self.__lookup_outside(t_intensity, agents)
+        row = int(sqrt(t_intensity) * self._inverse_step)
+        (
+            lower_intensity,
+            lower_start,
+            lower_end,
+            upper_intensity,
+            upper_start,
+            upper_end,
+        ) = self._cells[row]
+        # Square root may be rounded down exactly at the row intensity.
+        if upper_intensity <= t_intensity:
+            (
+                lower_intensity,
+                lower_start,
+                lower_end,
+                upper_intensity,
+                upper_start,
+                upper_end,
+            ) = self._cells[row + 1]
+        values = self._values
+        index = lower_start + agents
+        lower = values[index] if index < lower_end else 0.0
+        if t_intensity == lower_intensity:
+            return lower
+        if agents <= upper_intensity:
+            return erlang_c_stable(t_intensity, agents)
+        index = upper_start + agents
+        upper = values[index] if index < upper_end else 0.0
+        fraction = (t_intensity - lower_intensity) / (upper_intensity - lower_intensity)
+        return lower + (upper - lower) * fraction
+
+    def __lookup_outside(self, t_intensity: float, agents: int) -> float:
+        """
+        Calculate wait probability for intensity outside of the table.
+
+        Parameters
+        ----------
+        t_intensity : float
+            Traffic intensity in Erlangs, negative or not less than max_intensity.
+        agents : int
+            Number of agents, more than t_intensity.
+
+        Returns
+        -------
+        float
+            Probability that there is no available agents to answer the call.
+        """
+        if t_intensity < 0:
+            return erlang_c(t_intensity, agents)
+        # The same band of agents as in table rows, wait probability beyond it is negligible.
+        if agents - t_intensity > self.width * sqrt(t_intensity) + 16:
+            return 0.0
+        return erlang_c_stable(t_intensity, agents)
+
+    def close(self) -> None:
+        """
+        Unmap the table file.
+        """
+        self._values.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "ErlangCTable":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
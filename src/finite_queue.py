@@ -0,0 +1,308 @@
+"""
+Module contains finite waiting room model (M/M/N/K) and staffing solver for it.
+
+Queue has K waiting positions, callers who come when all of them are taken get busy signal.
+K = 0 is Erlang B model, K = infinity is Erlang C model.
+
+Probabilities of states with N + j callers are proportional to B * (A / N) ^ j, where B is
+Erlang B for N agents, and sum of probabilities of states below N is proportional to 1 - B.
+States don't depend on K, so metrics for K = 0, 1, 2, ... are calculated with running sums.
+Caller who finds j callers in queue is answered after j + 1 answers of N agents, so probability
+to be answered in target time is a Poisson tail.
+"""
+
+import math
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator, List, Optional
+
+from .erlang import SCALE_LIMIT, ErlangIterator, erlang_b_stable, log_poisson_probability
+from .staffing import TimeUnit, calc_traffic_intensity
+
+
+@dataclass
+class FiniteQueueData:
+    """
+    Metrics of finite waiting room model for one number of agents and queue size.
+
+    blocking_probability, wait_probability and service_level are parts of all offered calls.
+    average_speed_of_answer is average wait of answered calls, including immediately answered.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    traffic_intensity: float
+    agents: int
+    queue_size: int
+    blocking_probability: float
+    wait_probability: float
+    service_level: float
+    average_speed_of_answer: float
+    occupancy: float
+
+
+def __iter_queue_sizes(
+    t_intensity: float,
+    agents: int,
+    blocking_probability: float,
+    aht: float,
+    target_answer_time: float,
+) -> Iterator[FiniteQueueData]:
+    """
+    Calculate metrics for queue sizes 0, 1, 2, ... from Erlang B for the same agents.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : int
+        Number of agents. Should be positive.
+    blocking_probability : float
+        Erlang B for the same intensity and number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+
+    Yields
+    ------
+    FiniteQueueData
+        Metrics for the next queue size.
+    """
+    load = t_intensity / agents
+    # Expected number of answers in target time when all agents are busy.
+    answers = agents * target_answer_time / aht
+    cumulative = 0.0
+
+    # Weights of states: below N callers, N..N+K-1 callers and N+K callers.
+    free = 1 - blocking_probability
+    queued = in_target = waits = 0.0
+    last = blocking_probability
+    queue_size = 0
+    while True:
+        total = free + queued + last
+        answered = free + queued
+        yield FiniteQueueData(
+            traffic_intensity=t_intensity,
+            agents=agents,
+            queue_size=queue_size,
+            blocking_probability=last / total,
+            wait_probability=queued / total,
+            service_level=(free + in_target) / total,
+            average_speed_of_answer=waits / answered / agents * aht if answered else 0.0,
+            occupancy=min(t_intensity * answered / total / agents, 1.0),
+        )
+        # New waiting position takes caller who finds queue_size callers in queue.
+        cumulative += math.exp(log_poisson_probability(answers, queue_size))
+        queued += last
+        in_target += last * max(0.0, 1 - cumulative)
+        waits += last * (queue_size + 1)
+        last *= load
+        queue_size += 1
+        if last > SCALE_LIMIT:
+            free, queued, last = free / SCALE_LIMIT, queued / SCALE_LIMIT, last / SCALE_LIMIT
+            in_target, waits = in_target / SCALE_LIMIT, waits / SCALE_LIMIT
+
+
+def finite_queue_sequence(
+    t_intensity: float,
+    agents: int,
+    aht: float,
+    target_answer_time: float = 20,
+) -> Iterator[FiniteQueueData]:
+    """
+    Calculates metrics of M/M/N/K model for queue sizes 0, 1, 2, ...
+
+    Each next queue size costs O(1), so all queue sizes up to K cost O(sqrt(N) + K).
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : int
+        Number of agents. Should be positive.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same unit as aht.
+
+    Yields
+    ------
+    FiniteQueueData
+        Metrics for the next queue size, the first one is for queue size 0.
+
+    Examples
+    --------
+    >>> sizes = finite_queue_sequence(100, 105, 300)
+    >>> [round(data.blocking_probability, 4) for data in islice(sizes, 3)]
+    [0.0483, 0.0439, 0.0402]
+    """
+    if agents <= 0:
+        raise ValueError(f"Number of agents should be positive, got {agents}")
+    blocking = erlang_b_stable(t_intensity, agents)
+    return __iter_queue_sizes(t_intensity, agents, blocking, aht, target_answer_time)
+
+
+def finite_queue(
+    t_intensity: float,
+    agents: int,
+    queue_size: int,
+    aht: float,
+    target_answer_time: float = 20,
+) -> FiniteQueueData:
+    """
+    Calculates metrics of M/M/N/K model with queue_size waiting positions.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : int
+        Number of agents. Should be positive.
+    queue_size : int
+        Number of waiting positions, callers beyond it get busy signal.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same unit as aht.
+
+    Returns
+    -------
+    FiniteQueueData
+        Blocking probability, wait probability, service level, average speed of answer
+        and occupancy.
+
+    Examples
+    --------
+    >>> finite_queue(100, 105, 10, 300).blocking_probability
+    0.021584364744435813
+    """
+    if queue_size < 0:
+        raise ValueError(f"Queue size can't be negative, got {queue_size}")
+    sizes = finite_queue_sequence(t_intensity, agents, aht, target_answer_time)
+    return next(islice(sizes, queue_size, None))
+
+
+def __min_queue_size(
+    sizes: Iterator[FiniteQueueData],
+    max_blocking: float,
+    target_service_level: float,
+    max_queue_size: Optional[int],
+) -> Optional[FiniteQueueData]:
+    """
+    Find the lowest queue size which meets both targets.
+
+    Blocking decreases with queue size. Service level increases while new waiting position
+    is answered in target time more often than service level, after that it only decreases.
+    So search stops as soon as service level is below target and doesn't grow.
+
+    Parameters
+    ----------
+    sizes : Iterator[FiniteQueueData]
+        Metrics for queue sizes 0, 1, 2, ...
+    max_blocking : float
+        The highest allowed blocking probability.
+    target_service_level : float
+        Percentage of offered calls that should be answered in target time.
+    max_queue_size : int, optional
+        The highest allowed queue size.
+
+    Returns
+    -------
+    FiniteQueueData, optional
+        Metrics for the found queue size or None if targets can't be met.
+    """
+    previous = -math.inf
+    for result in sizes:
+        meets_blocking = result.blocking_probability <= max_blocking
+        if meets_blocking and result.service_level >= target_service_level:
+            return result
+        if result.service_level < target_service_level and (
+            result.service_level < previous or meets_blocking and result.service_level <= previous
+        ):
+            return None
+        if max_queue_size is not None and result.queue_size >= max_queue_size:
+            return None
+        previous = result.service_level
+    return None
+
+
+def calc_staffing_finite_queue(
+    calls_per_hour: float,
+    aht: float,
+    max_blocking: float = 0.01,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    max_queue_size: Optional[int] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> FiniteQueueData:
+    """
+    Finds the lowest number of agents and then the lowest queue size which meet targets.
+
+    If targets are met for some queue size, they are met for the same queue size with
+    more agents, so number of agents is found by bisection. For each number of agents
+    queue sizes are checked one by one with running sums, and Erlang B values for all
+    numbers of agents are calculated once with ErlangIterator.
+
+    Parameters
+    ----------
+    calls_per_hour : float
+        Number of calls offered per hour.
+    aht : float
+        Average Handling Time. Default unit is seconds.
+    max_blocking : float, default=0.01 (1%)
+        The highest allowed part of calls which get busy signal.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same time unit as aht.
+    target_service_level : float, default=0.80 (80%).
+        Percentage of offered calls that should be answered in target_answer_time.
+    max_queue_size : int, optional
+        The highest queue size ACD supports.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Returns
+    -------
+    FiniteQueueData
+        Metrics for the found number of agents and queue size.
+
+    Examples
+    --------
+    >>> result = calc_staffing_finite_queue(1000, 120, max_blocking=0.01)
+    >>> result.agents, result.queue_size
+    (37, 15)
+    """
+    if target_service_level >= 1:
+        raise ValueError("Service level target 1 (100%) can't be reached")
+    if max_blocking <= 0:
+        raise ValueError("Blocking target 0 can't be reached")
+    t_intensity = calc_traffic_intensity(calls_per_hour, aht, time_unit)
+    if t_intensity <= 0:
+        return FiniteQueueData(t_intensity, 0, 0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    iterator = ErlangIterator(t_intensity)
+    blocking: List[float] = [iterator.blocking_probability]
+
+    def evaluate(agents: int) -> Optional[FiniteQueueData]:
+        while len(blocking) <= agents:
+            iterator.step()
+            blocking.append(iterator.blocking_probability)
+        # Blocking can't be below 1 - N / A, as agents can't answer more than N / aht calls.
+        if max_blocking <= 1 - agents / t_intensity:
+            return None
+        sizes = __iter_queue_sizes(t_intensity, agents, blocking[agents], aht, target_answer_time)
+        return __min_queue_size(sizes, max_blocking, target_service_level, max_queue_size)
+
+    # Answered calls can't be more than agents can handle.
+    low = max(1, math.ceil(max(target_service_level, 1 - max_blocking) * t_intensity))
+    high, step = low, 1
+    result = evaluate(high)
+    while result is None:
+        low, high, step = high + 1, high + step, step * 2
+        result = evaluate(high)
+    while low < high:
+        middle = (low + high) // 2
+        middle_result = evaluate(middle)
+        if middle_result is None:
+            low = middle + 1
+        else:
+            high, result = middle, middle_result
+    return result
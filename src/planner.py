@@ -0,0 +1,422 @@
+"""
+Module contains streaming planner which turns interval forecast into staffing plan.
+
+Forecast is read, solved and written row by row, so memory use doesn't depend on the file size.
+plan_parallel() solves chunks of rows in a process pool, results keep the order of forecast.
+"""
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .cache import StaffingCache
+from .staffing import StaffingData, TimeUnit, calc_calls_per_hour, calc_staffing
+
+FORECAST_FIELDS = ("queue", "interval_start", "calls", "aht")
+PLAN_FIELDS = FORECAST_FIELDS + (
+    "calls_per_hour",
+    "traffic_intensity",
+    "wait_probability",
+    "service_level",
+    "average_speed_of_answer",
+    "occupancy",
+    "agents",
+    "agents_with_shrinkage",
+    "error",
+)
+# How many times chunk is submitted again after it was in flight when worker process died.
+MAX_CHUNK_RETRIES = 2
+# Cache of the worker process, created by __init_worker().
+_worker_cache: Optional[StaffingCache] = None
+
+
+@dataclass
+class IntervalForecast:
+    """
+    Forecast for one interval of one queue.
+    """
+
+    queue: str
+    interval_start: str
+    calls: float
+    aht: float
+
+
+@dataclass
+class IntervalPlan:
+    """
+    Staffing result for one interval of one queue.
+
+    staffing is None and error contains the message if the interval can't be solved.
+    Only plan_parallel() reports errors this way, plan_intervals() raises them.
+    """
+
+    forecast: IntervalForecast
+    calls_per_hour: float
+    staffing: Optional[StaffingData]
+    error: Optional[str] = None
+
+
+@dataclass
+class PlannerStats:
+    """
+    Statistics of the planner run.
+    """
+
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Number of processed rows per second of run time.
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_forecast(file: TextIO) -> Iterator[IntervalForecast]:
+    """
+    Read forecast rows lazily from CSV file.
+
+    File should have header with columns queue, interval_start, calls and aht,
+    other columns are ignored.
+
+    Parameters
+    ----------
+    file : TextIO
+        File opened for reading with newline="".
+
+    Yields
+    ------
+    IntervalForecast
+        Forecast for one interval.
+    """
+    for row in csv.DictReader(file):
+        yield IntervalForecast(
+            queue=row["queue"],
+            interval_start=row["interval_start"],
+            calls=float(row["calls"]),
+            aht=float(row["aht"]),
+        )
+
+
+def plan_intervals(
+    forecast: Iterable[IntervalForecast],
+    interval: float = 15,
+    interval_unit: TimeUnit = TimeUnit.MIN,
+    cache: Optional[StaffingCache] = None,
+    **kwargs,
+) -> Iterator[IntervalPlan]:
+    """
+    Solve staffing for each forecast interval lazily.
+
+    Parameters
+    ----------
+    forecast : Iterable[IntervalForecast]
+        Forecast rows, for example from read_forecast().
+    interval : float, default=15
+        Length of the forecast interval.
+    interval_unit : TimeUnit, default = TimeUnit.MIN
+        Unit for interval length.
+    cache : StaffingCache, optional
+        If specified - results are taken from the cache, so repeated intervals are solved once.
+        Cache is bounded, so memory use stays flat.
+    **kwargs
+        Other parameters of calc_staffing(), for example target_service_level or shrinkage.
+
+    Yields
+    ------
+    IntervalPlan
+        Staffing result for one interval.
+
+    Examples
+    --------
+    >>> rows = [IntervalForecast("sales", "2024-01-01 09:00", 250, 120)]
+    >>> next(plan_intervals(rows)).staffing.agents
+    40
+    """
+    solve = cache.calc_staffing if cache else calc_staffing
+    for row in forecast:
+        calls_per_hour = calc_calls_per_hour(row.calls, interval, interval_unit)
+        yield IntervalPlan(row, calls_per_hour, solve(calls_per_hour, row.aht, **kwargs))
+
+
+def __init_worker(cache_size: Optional[int]) -> None:
+    """
+    Create cache of the worker process.
+
+    Parameters
+    ----------
+    cache_size : int, optional
+        Size of the cache. If not specified - worker doesn't use cache.
+    """
+    global _worker_cache  # pylint: disable=global-statement
+    _worker_cache = StaffingCache(cache_size) if cache_size else None
+
+
+def __plan_chunk(
+    chunk: List[IntervalForecast],
+    interval: float,
+    interval_unit: TimeUnit,
+    kwargs: Dict[str, Any],
+) -> List[IntervalPlan]:
+    """
+    Solve chunk of forecast rows, errors are stored in results instead of raising.
+
+    Parameters
+    ----------
+    chunk : List[IntervalForecast]
+        Forecast rows.
+    interval : float
+        Length of the forecast interval.
+    interval_unit : TimeUnit
+        Unit for interval length.
+    kwargs : Dict[str, Any]
+        Other parameters of calc_staffing().
+
+    Returns
+    -------
+    List[IntervalPlan]
+        Staffing results in the same order as chunk.
+    """
+    solve = _worker_cache.calc_staffing if _worker_cache else calc_staffing
+    plan = []
+    for row in chunk:
+        calls_per_hour = calc_calls_per_hour(row.calls, interval, interval_unit)
+        try:
+            plan.append(IntervalPlan(row, calls_per_hour, solve(calls_per_hour, row.aht, **kwargs)))
+        except (ArithmeticError, ValueError) as error:
+            plan.append(IntervalPlan(row, calls_per_hour, None, f"{type(error).__name__}: {error}"))
+    return plan
+
+
+def __resubmit(
+    pool: ProcessPoolExecutor,
+    in_flight: Deque[List[Any]],
+    interval: float,
+    interval_unit: TimeUnit,
+    kwargs: Dict[str, Any],
+) -> None:
+    """
+    Submit chunks which were lost with broken pool to the new pool.
+
+    Parameters
+    ----------
+    pool : ProcessPoolExecutor
+        New pool.
+    in_flight : Deque[List[Any]]
+        Chunks in flight with their futures and numbers of retries, updated in place.
+        Future is None if chunk wasn't submitted.
+    interval : float
+        Length of the forecast interval.
+    interval_unit : TimeUnit
+        Unit for interval length.
+    kwargs : Dict[str, Any]
+        Other parameters of calc_staffing().
+    """
+    for entry in in_flight:
+        chunk, future, retries = entry
+        if future is not None and future.done() and future.exception() is None:
+            continue
+        if retries >= MAX_CHUNK_RETRIES:
+            raise BrokenProcessPool(
+                f"Worker process died {retries + 1} times with chunk of {len(chunk)} rows"
+            )
+        entry[1] = pool.submit(__plan_chunk, chunk, interval, interval_unit, kwargs)
+        entry[2] = retries + 1
+
+
+def plan_parallel(
+    forecast: Iterable[IntervalForecast],
+    interval: float = 15,
+    interval_unit: TimeUnit = TimeUnit.MIN,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 2000,
+    cache_size: Optional[int] = 4096,
+    **kwargs,
+) -> Iterator[IntervalPlan]:
+    """
+    Solve staffing for forecast intervals in a process pool.
+
+    Forecast is split into chunks of consecutive rows, so forecast sorted by queue or date
+    is sharded by queue or date range. One chunk is one task of the pool, so inter-process
+    communication is amortized over chunk_size rows. Only 2 * max_workers chunks are in flight,
+    so memory use stays flat for any forecast size. Results are yielded in forecast order.
+
+    Intervals which can't be solved are returned with error instead of stopping the run.
+    If worker process dies, pool is created again and chunks which were in flight are
+    submitted again. Chunk which breaks the pool more than MAX_CHUNK_RETRIES times
+    stops the run with BrokenProcessPool. Other exceptions of the pool are raised as is.
+
+    Parameters
+    ----------
+    forecast : Iterable[IntervalForecast]
+        Forecast rows, for example from read_forecast().
+    interval : float, default=15
+        Length of the forecast interval.
+    interval_unit : TimeUnit, default = TimeUnit.MIN
+        Unit for interval length.
+    max_workers : int, optional
+        Number of worker processes, default is number of CPUs.
+    chunk_size : int, default=2000
+        Number of rows in one task.
+    cache_size : int, optional, default=4096
+        Size of StaffingCache in each worker. None disables cache.
+    **kwargs
+        Other parameters of calc_staffing(), for example target_service_level or shrinkage.
+
+    Yields
+    ------
+    IntervalPlan
+        Staffing result for one interval.
+
+    Examples
+    --------
+    >>> with open("forecast.csv", newline="") as source, open("plan.csv", "w") as target:
+    ...     stats = write_plan(plan_parallel(read_forecast(source), max_workers=32), target)
+    """
+    rows = iter(forecast)
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers, initializer=__init_worker, initargs=(cache_size,))
+    # Chunk, its future or None and number of retries.
+    in_flight: Deque[List[Any]] = deque()
+    try:
+        while True:
+            try:
+                while len(in_flight) < window:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    # Chunk is kept even if pool is already broken and submit fails.
+                    in_flight.append([chunk, None, 0])
+                    in_flight[-1][1] = pool.submit(
+                        __plan_chunk, chunk, interval, interval_unit, kwargs
+                    )
+                if not in_flight:
+                    break
+                plan = in_flight[0][1].result()
+            except BrokenProcessPool:
+                pool.shutdown(wait=True)
+                pool = ProcessPoolExecutor(
+                    max_workers, initializer=__init_worker, initargs=(cache_size,)
+                )
+                __resubmit(pool, in_flight, interval, interval_unit, kwargs)
+                continue
+            in_flight.popleft()
+            yield from plan
+    finally:
+        pool.shutdown(wait=True)
+
+
+def write_plan(
+    plan: Iterable[IntervalPlan],
+    file: TextIO,
+    progress: Optional[Callable[[PlannerStats], None]] = None,
+    report_every: int = 10000,
+) -> PlannerStats:
+    """
+    Write staffing plan to CSV file as soon as each row is solved.
+
+    Parameters
+    ----------
+    plan : Iterable[IntervalPlan]
+        Solved intervals, for example from plan_intervals().
+    file : TextIO
+        File opened for writing with newline="".
+    progress : Callable[[PlannerStats], None], optional
+        If specified - called with current statistics every report_every rows.
+    report_every : int, default=10000
+        Number of rows between progress reports.
+
+    Returns
+    -------
+    PlannerStats
+        Number of written rows and run time.
+    """
+    writer = csv.writer(file)
+    writer.writerow(PLAN_FIELDS)
+    stats = PlannerStats()
+    start = time.perf_counter()
+    for row in plan:
+        forecast, staffing = row.forecast, row.staffing
+        values = [forecast.queue, forecast.interval_start, forecast.calls, forecast.aht]
+        values.append(row.calls_per_hour)
+        if staffing is None:
+            values.extend([""] * 7)
+        else:
+            # Empty cell if shrinkage is not specified, as None in StaffingData.
+            agents_with_shrinkage = staffing.agents_with_shrinkage
+            values.extend(
+                (
+                    staffing.traffic_intensity,
+                    staffing.wait_probability,
+                    staffing.service_level,
+                    staffing.average_speed_of_answer,
+                    staffing.occupancy,
+                    staffing.agents,
+                    "" if agents_with_shrinkage is None else agents_with_shrinkage,
+                )
+            )
+        values.append(row.error or "")
+        writer.writerow(values)
+        stats.rows += 1
+        if progress and stats.rows % report_every == 0:
+            stats.seconds = time.perf_counter() - start
+            progress(stats)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def plan_csv(
+    forecast_path: str,
+    plan_path: str,
+    interval: float = 15,
+    interval_unit: TimeUnit = TimeUnit.MIN,
+    cache: Optional[StaffingCache] = None,
+    progress: Optional[Callable[[PlannerStats], None]] = None,
+    report_every: int = 10000,
+    **kwargs,
+) -> PlannerStats:
+    """
+    Turn forecast CSV file into staffing plan CSV file with bounded memory.
+
+    Parameters
+    ----------
+    forecast_path : str
+        Path to forecast file with columns queue, interval_start, calls and aht.
+    plan_path : str
+        Path to the plan file, columns are listed in PLAN_FIELDS.
+    interval : float, default=15
+        Length of the forecast interval.
+    interval_unit : TimeUnit, default = TimeUnit.MIN
+        Unit for interval length.
+    cache : StaffingCache, optional
+        If specified - results are taken from the cache.
+    progress : Callable[[PlannerStats], None], optional
+        If specified - called with current statistics every report_every rows.
+    report_every : int, default=10000
+        Number of rows between progress reports.
+    **kwargs
+        Other parameters of calc_staffing(), for example target_service_level or shrinkage.
+
+    Returns
+    -------
+    PlannerStats
+        Number of written rows and run time.
+
+    Examples
+    --------
+    >>> stats = plan_csv("forecast.csv", "plan.csv", target_service_level=0.9)
+    >>> print(f"{stats.rows} rows, {stats.rows_per_second:.0f} rows/s")
+    """
+    with open(forecast_path, newline="", encoding="utf-8") as source, open(
+        plan_path, "w", newline="", encoding="utf-8"
+    ) as target:
+        plan = plan_intervals(read_forecast(source), interval, interval_unit, cache, **kwargs)
+        return write_plan(plan, target, progress, report_every)
@@ -3,11 +3,20 @@ Module contains methods for call center staffing calculation.
 """
 
 import math
-from dataclasses import dataclass
+import sys
+from array import array
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
-from typing import Optional, Tuple
+from itertools import repeat
+from numbers import Number
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from . import erlang_c
+from .erlang import EngsetIterator, ErlangIterator, erlang_c_derivative, erlang_c_stable
+
+# Relative precision of continuous number of agents.
+CONTINUOUS_TOLERANCE = 1e-9
+# Value of StaffingTable.agents_with_shrinkage for rows without shrinkage.
+NO_SHRINKAGE = -1
 
 
 class TimeUnit(Enum):
@@ -28,10 +37,44 @@ class TimeUnit(Enum):
         return super().value
 
 
+class SearchMethod(Enum):
+    """
+    Algorithms for searching the lowest number of agents which meets service level target.
+    """
+
+    LINEAR = "linear"
+    BISECTION = "bisection"
+    SEED = "seed"
+    NEWTON = "newton"
+
+
+@dataclass
+class SearchStats:
+    """
+    Statistics of the search for number of agents.
+
+    seed and seed_error are set only for SearchMethod.SEED and SearchMethod.NEWTON.
+    seed is the first checked number of agents: square-root estimate or rounded up result
+    of Newton method, but not less than number of agents required by occupancy.
+    seed_error is found number of agents minus the seed, positive if seed was too low.
+    steps is number of Erlang B recurrence steps, each evaluation costs from zero
+    to many steps depending on how far it is from already passed numbers of agents.
+    """
+
+    method: SearchMethod
+    evaluations: int = 0
+    steps: int = 0
+    seed: Optional[int] = None
+    seed_error: Optional[int] = None
+
+
 @dataclass
 class StaffingData:
     """
     Container for calculated results.
+
+    search_stats is set only when number of agents was calculated, not given.
+    It's not compared, so results of different search methods are equal.
     """
 
     # pylint: disable=too-many-instance-attributes
@@ -43,6 +86,412 @@ class StaffingData:
     occupancy: float
     agents: int
     agents_with_shrinkage: int
+    search_stats: Optional[SearchStats] = field(default=None, compare=False)
+
+    def copy(self) -> "StaffingData":
+        """
+        Copy the result together with search_stats, so the copy can be modified by caller.
+
+        Returns
+        -------
+        StaffingData
+            Result of the same type which doesn't share mutable fields with this one.
+        """
+        stats = self.search_stats
+        return replace(self, search_stats=None if stats is None else replace(stats))
+
+
+@dataclass
+class ChatStaffingData(StaffingData):
+    """
+    Result of chat staffing calculations.
+
+    Each agent handles `concurrency` chats at once, so there are slots = agents * concurrency
+    Erlang C servers. traffic_intensity, wait_probability and occupancy are for slots,
+    average_speed_of_answer is calculated with effective_aht of one chat.
+    """
+
+    concurrency: int = 1
+    slots: int = 0
+    effective_aht: float = 0.0
+
+
+class LazyStaffingData:
+    """
+    Slotted result with the same attributes as StaffingData, metrics are calculated on access.
+
+    Only traffic intensity, number of agents and inputs are stored. Wait probability is
+    calculated on the first access to any metric which needs it, other metrics are
+    calculated from it and cached, so unused metrics cost nothing.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    agents : int
+        Number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    shrinkage : float, optional
+        Percentage of time agents are paid for but don't answer for calls.
+    wait_probability : float, optional
+        Already calculated Erlang C wait probability for this number of agents.
+    search_stats : SearchStats, optional
+        Statistics of the search for number of agents.
+
+    Examples
+    --------
+    >>> result = calc_staffing(calls_per_hour=1000, aht=120, agents=35, lazy=True)
+    >>> result.occupancy
+    0.9523809523809524
+    """
+
+    __slots__ = (
+        "traffic_intensity",
+        "agents",
+        "aht",
+        "target_answer_time",
+        "shrinkage",
+        "search_stats",
+        "_wait_probability",
+        "_service_level",
+        "_average_speed_of_answer",
+    )
+
+    def __init__(
+        self,
+        t_intensity: float,
+        agents: int,
+        aht: float,
+        target_answer_time: float,
+        shrinkage: Optional[float] = None,
+        wait_probability: Optional[float] = None,
+        search_stats: Optional[SearchStats] = None,
+    ):
+        # pylint: disable=too-many-arguments
+        self.traffic_intensity = t_intensity
+        self.agents = agents
+        self.aht = aht
+        self.target_answer_time = target_answer_time
+        self.shrinkage = shrinkage
+        self.search_stats = search_stats
+        self._wait_probability = wait_probability
+        self._service_level: Optional[float] = None
+        self._average_speed_of_answer: Optional[float] = None
+
+    @property
+    def wait_probability(self) -> float:
+        """
+        Probability that there are no available agents to answer the call.
+        """
+        if self._wait_probability is None:
+            iterator = ErlangIterator(self.traffic_intensity, self.agents)
+            self._wait_probability = iterator.wait_probability
+        return self._wait_probability
+
+    @property
+    def immediate_answer(self) -> float:
+        """
+        Amount of calls answered immediately.
+        """
+        return calc_immediate_answer(self.wait_probability)
+
+    @property
+    def service_level(self) -> float:
+        """
+        Amount of calls answered in target time.
+        """
+        if self._service_level is None:
+            self._service_level = calc_service_level(
+                self.traffic_intensity,
+                self.agents,
+                self.wait_probability,
+                self.target_answer_time,
+                self.aht,
+            )
+        return self._service_level
+
+    @property
+    def average_speed_of_answer(self) -> float:
+        """
+        Average time in which call is answered.
+        """
+        if self._average_speed_of_answer is None:
+            self._average_speed_of_answer = calc_average_speed_of_answer(
+                self.traffic_intensity, self.agents, self.wait_probability, self.aht
+            )
+        return self._average_speed_of_answer
+
+    @property
+    def occupancy(self) -> float:
+        """
+        How much time agents spend talking with customers.
+        """
+        return calc_occupancy(self.traffic_intensity, self.agents)
+
+    @property
+    def agents_with_shrinkage(self) -> Optional[int]:
+        """
+        Number of agents with shrinkage, None if shrinkage is not specified.
+        """
+        return add_shrinkage(self.agents, self.shrinkage) if self.shrinkage else None
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyStaffingData):
+            other = other.to_staffing_data()
+        return self.to_staffing_data() == other
+
+    def __repr__(self) -> str:
+        return f"Lazy{self.to_staffing_data()!r}"
+
+    def to_staffing_data(self) -> StaffingData:
+        """
+        Calculate all metrics and copy them to StaffingData.
+
+        Returns
+        -------
+        StaffingData
+            Result of calculations.
+        """
+        return StaffingData(
+            traffic_intensity=self.traffic_intensity,
+            wait_probability=self.wait_probability,
+            immediate_answer=self.immediate_answer,
+            service_level=self.service_level,
+            average_speed_of_answer=self.average_speed_of_answer,
+            occupancy=self.occupancy,
+            agents=self.agents,
+            agents_with_shrinkage=self.agents_with_shrinkage,
+            search_stats=self.search_stats,
+        )
+
+
+class StaffingRow:
+    """
+    Read-only view of one row of StaffingTable with the same attributes as StaffingData.
+
+    Values are read from the table columns on access, view doesn't copy them.
+
+    Parameters
+    ----------
+    table : StaffingTable
+        Table of the row.
+    index : int
+        Index of the row.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "StaffingTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in STAFFING_TABLE_FIELDS:
+            raise AttributeError(f"'StaffingRow' object has no attribute '{name}'")
+        value = getattr(self._table, name)[self._index]
+        if name == "agents_with_shrinkage" and value == NO_SHRINKAGE:
+            return None
+        return value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StaffingRow):
+            other = other.to_staffing_data()
+        return self.to_staffing_data() == other
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in STAFFING_TABLE_FIELDS)
+        return f"StaffingRow({values})"
+
+    def to_staffing_data(self) -> StaffingData:
+        """
+        Copy the row to StaffingData.
+
+        Returns
+        -------
+        StaffingData
+            Values of the row.
+        """
+        return StaffingData(**{name: getattr(self, name) for name in STAFFING_TABLE_FIELDS})
+
+
+@dataclass
+class StaffingTable:
+    """
+    Compact container for calculated results of many rows, each field is stored as typed array.
+
+    Fields are the same as in StaffingData. If shrinkage is not specified,
+    agents_with_shrinkage column holds NO_SHRINKAGE (-1) and row returns None as
+    StaffingData does. One row takes 64 bytes instead of several hundred bytes
+    of StaffingData instance. Numbers of agents are stored as 64-bit integers.
+
+    Integer index returns StaffingRow view, slice returns new table.
+    Columns are available as attributes, to_numpy(copy=False) gives them without copying.
+
+    Examples
+    --------
+    >>> table = calc_staffing_curve(1000, 120, range(30, 45))
+    >>> table[10].service_level
+    0.9372106214887137
+    >>> len(table[::2])
+    8
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    traffic_intensity: array = field(default_factory=lambda: array("d"))
+    wait_probability: array = field(default_factory=lambda: array("d"))
+    immediate_answer: array = field(default_factory=lambda: array("d"))
+    service_level: array = field(default_factory=lambda: array("d"))
+    average_speed_of_answer: array = field(default_factory=lambda: array("d"))
+    occupancy: array = field(default_factory=lambda: array("d"))
+    agents: array = field(default_factory=lambda: array("q"))
+    agents_with_shrinkage: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[StaffingRow, "StaffingTable"]:
+        if isinstance(index, slice):
+            return StaffingTable(
+                **{name: getattr(self, name)[index] for name in STAFFING_TABLE_FIELDS}
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StaffingTable index out of range")
+        return StaffingRow(self, index)
+
+    def __iter__(self) -> Iterator[StaffingRow]:
+        return (StaffingRow(self, index) for index in range(len(self)))
+
+    @classmethod
+    def from_results(cls, results: Iterable[StaffingData]) -> "StaffingTable":
+        """
+        Create table from results of calc_staffing().
+
+        Parameters
+        ----------
+        results : Iterable[StaffingData]
+            Results of calculations.
+
+        Returns
+        -------
+        StaffingTable
+            Table with one row for each result.
+        """
+        table = cls()
+        for result in results:
+            for name in STAFFING_TABLE_FIELDS:
+                value = getattr(result, name)
+                if name == "agents_with_shrinkage" and value is None:
+                    value = NO_SHRINKAGE
+                getattr(table, name).append(value)
+        return table
+
+    def column(self, name: str) -> array:
+        """
+        Get column by name.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field, for example "agents".
+
+        Returns
+        -------
+        array
+            Column values.
+        """
+        if name not in STAFFING_TABLE_FIELDS:
+            raise KeyError(f"StaffingTable has no column {name!r}")
+        return getattr(self, name)
+
+    def to_numpy(self, copy: bool = True) -> Dict[str, Any]:
+        """
+        Get columns as NumPy arrays. Requires NumPy.
+
+        Parameters
+        ----------
+        copy : bool, default True
+            If False, arrays share memory with the table columns. While any of them
+            is alive, append() to the table raises BufferError, because Python arrays
+            can't be resized while their buffer is exported.
+
+        Returns
+        -------
+        Dict[str, ndarray]
+            Arrays of float64 and int64 by name of the field.
+        """
+        try:
+            import numpy as np  # pylint: disable=import-outside-toplevel
+        except ImportError as error:  # pragma: no cover
+            raise ImportError(
+                "NumPy is required for to_numpy(), "
+                "install it with `pip install call_center_tools[numpy]`"
+            ) from error
+        columns = {name: self.column(name) for name in STAFFING_TABLE_FIELDS}
+        arrays = {name: np.frombuffer(column, column.typecode) for name, column in columns.items()}
+        if copy:
+            return {name: values.copy() for name, values in arrays.items()}
+        return arrays
+
+    def to_pandas(self) -> Any:
+        """
+        Get table as pandas DataFrame. Requires pandas.
+
+        Returns
+        -------
+        DataFrame
+            One column for each field of the table.
+        """
+        try:
+            import pandas as pd  # pylint: disable=import-outside-toplevel
+        except ImportError as error:  # pragma: no cover
+            raise ImportError("pandas is required for to_pandas()") from error
+        return pd.DataFrame(self.to_numpy(), copy=False)
+
+    def append(
+        self,
+        t_intensity: float,
+        agents: int,
+        wait_probability: float,
+        service_level: float,
+        average_speed_of_answer: float,
+        shrinkage: Optional[float] = None,
+    ) -> None:
+        """
+        Add row of results. Immediate answer, occupancy and agents with shrinkage are calculated.
+
+        Parameters
+        ----------
+        t_intensity : float
+            Traffic intensity in Erlangs.
+        agents : int
+            Number of agents.
+        wait_probability : float
+            Probability that there are no available agents to answer the call.
+        service_level : float
+            Amount of calls answered in target time.
+        average_speed_of_answer : float
+            Average time in which call is answered.
+        shrinkage : float, optional
+            Percentage of time agents are paid for but don't answer for calls.
+        """
+        self.traffic_intensity.append(t_intensity)
+        self.wait_probability.append(wait_probability)
+        self.immediate_answer.append(calc_immediate_answer(wait_probability))
+        self.service_level.append(service_level)
+        self.average_speed_of_answer.append(average_speed_of_answer)
+        self.occupancy.append(calc_occupancy(t_intensity, agents) if agents else 1.0)
+        self.agents.append(agents)
+        self.agents_with_shrinkage.append(
+            add_shrinkage(agents, shrinkage) if shrinkage else NO_SHRINKAGE
+        )
+
+
+STAFFING_TABLE_FIELDS = tuple(table_field.name for table_field in fields(StaffingTable))
 
 
 def calc_calls_per_hour(calls: int, period: float, time_unit: TimeUnit) -> float:
@@ -241,6 +690,107 @@ def calc_average_speed_of_answer(
     return (wait_probability * aht) / (agents - t_intensity)
 
 
+def calc_wait_time_cdf(
+    t_intensity: float,
+    agents: int,
+    aht: float,
+    times: Iterable[float],
+    wait_probability: Optional[float] = None,
+) -> List[float]:
+    """
+    Calculates distribution of waiting time: probability to be answered in each of times.
+
+    Erlang C is calculated once, then P(wait <= t) = 1 - C * exp(-(N - A) * t / aht)
+    for every time. Service level is the same as calc_service_level() for each time.
+    Times are iterated in Python, use wait_time_cdf_array() for NumPy arrays.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
+    agents : int
+        Number of agents.
+    aht : float
+        Average Handling Time.
+    times : Iterable[float]
+        Answer times. Should have same unit as aht.
+    wait_probability : float, optional
+        Already calculated Erlang C wait probability for this number of agents.
+        If not specified - calculated with ErlangIterator.
+
+    Returns
+    -------
+    List[float]
+        Probabilities to be answered in each time. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> calc_wait_time_cdf(123, 130, 300, [0, 20, 60])
+    [0.5756192466646983, 0.7338754615834752, 0.8953489946722628]
+    """
+    if wait_probability is None:
+        wait_probability = ErlangIterator(t_intensity, agents).wait_probability
+    return [calc_service_level(t_intensity, agents, wait_probability, time, aht) for time in times]
+
+
+def calc_wait_time_quantiles(
+    t_intensity: float,
+    agents: int,
+    aht: float,
+    probabilities: Iterable[float],
+    wait_probability: Optional[float] = None,
+) -> List[float]:
+    """
+    Calculates answer times in which given parts of calls are answered (P50, P90, P99, ...).
+
+    Inverse of calc_wait_time_cdf(): t = aht * ln(C / (1 - p)) / (N - A) if p > 1 - C,
+    otherwise the call is answered immediately and t = 0. If agents can't handle the traffic,
+    every call waits (C = 1) and waits grow without limit, so all quantiles except p = 0
+    are infinite, the same is for p = 1.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
+    agents : int
+        Number of agents.
+    aht : float
+        Average Handling Time.
+    probabilities : Iterable[float]
+        Parts of calls which should be answered. Should be 0-1 (0-100%).
+    wait_probability : float, optional
+        Already calculated Erlang C wait probability for this number of agents.
+        If not specified - calculated with ErlangIterator.
+
+    Returns
+    -------
+    List[float]
+        Answer times for each probability. Unit is the same as for AHT.
+
+    Examples
+    --------
+    >>> calc_wait_time_quantiles(123, 130, 300, [0.5, 0.9, 0.99])
+    [0.0, 61.948322975552514, 160.63054124672584]
+    """
+    probabilities = list(probabilities)
+    if any(not 0 <= probability <= 1 for probability in probabilities):
+        raise ValueError(f"Probabilities should be 0-1, got {probabilities}")
+    if agents <= t_intensity:
+        return [0.0 if probability == 0 else math.inf for probability in probabilities]
+    if wait_probability is None:
+        wait_probability = ErlangIterator(t_intensity, agents).wait_probability
+    rate = (agents - t_intensity) / aht
+
+    def quantile(probability: float) -> float:
+        if probability <= 1 - wait_probability:
+            return 0.0
+        if probability == 1:
+            return math.inf
+        return math.log(wait_probability / (1 - probability)) / rate
+
+    return [quantile(probability) for probability in probabilities]
+
+
 def add_shrinkage(agents: int, shrinkage: float) -> int:
     """
     Calculates amount of agents with shrinkage applied.
@@ -265,18 +815,22 @@ def add_shrinkage(agents: int, shrinkage: float) -> int:
     return math.ceil(agents / (1 - shrinkage))
 
 
-def __find_min_max_agents(
+def max_agents_for_service_level(
     t_intensity: float, aht: float, target_answer_time: float, target_service_level: float
-) -> Tuple[int, int]:
+) -> Optional[int]:
     """
-    Find min and max number of agents for binary search.
+    Calculates number of agents which always meets service level target.
+
+    Wait probability can't be more than 1, so service level is at least
+    1 - exp(-(agents - t_intensity) * target_answer_time / aht).
+    Upper bound is found from this inequality without any Erlang C evaluation.
 
     Parameters
     ----------
     t_intensity : float
         Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
     aht : float
-        Average Handling Time. Default unit is seconds.
+        Average Handling Time.
     target_answer_time : float
         Target time of answer to incoming call. Should have same unit as aht.
     target_service_level : float
@@ -284,97 +838,1336 @@ def __find_min_max_agents(
 
     Returns
     -------
-    Tuple[int, int]
-        Tuple of min and max number of agents.
+    int, optional
+        Number of agents which meets target service level.
+        None if bound doesn't exist (target_answer_time is 0 or target_service_level is 1).
 
     Examples
     --------
-    >>> __find_min_max_agents(100, 300, 20, 0.8)
-    (8, 16)
+    >>> max_agents_for_service_level(100, 300, 20, 0.8)
+    126
     """
-    for i in range(int(math.log(t_intensity, 2)), 65):
-        agents = 2**i
-        wait_probability = erlang_c(t_intensity, agents)
-        service_level = calc_service_level(
-            t_intensity, agents, wait_probability, target_answer_time, aht
-        )
-
-        if service_level >= target_service_level:
-            return 2 ** (i - 1) if i > 0 else 0, agents
-    return 0, 0
+    if target_answer_time <= 0 or target_service_level >= 1:
+        return None
+    if target_service_level <= 0:
+        return int(t_intensity) + 1
+    reserve = aht * math.log(1 / (1 - target_service_level)) / target_answer_time
+    return int(t_intensity) + 1 + math.ceil(reserve)
 
 
-def __calc_all(
-    agents: int,
-    t_intensity: float,
-    aht: float,
-    target_answer_time: float,
-    shrinkage: Optional[float] = None,
-) -> StaffingData:
+def estimate_agents(
+    t_intensity: float, aht: float, target_answer_time: float, target_service_level: float
+) -> int:
     """
-    Calculate all parameters for specified number of agents.
+    Estimate number of agents with square-root (Halfin-Whitt) staffing rule.
+
+    Number of agents is t_intensity + beta * sqrt(t_intensity), where beta is found from
+    Halfin-Whitt approximation of service level:
+    1 - exp(-beta * sqrt(A) * target_answer_time / aht) / (1 + beta * Phi(beta) / phi(beta)).
+    No Erlang C evaluations are made, result is usually within one or two agents from exact one.
 
     Parameters
     ----------
-    agents : int
-        Number of agents.
     t_intensity : float
-        Number of calls offered per hour.
+        Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
     aht : float
-        Average Handling Time. Default unit is seconds.
+        Average Handling Time.
     target_answer_time : float
         Target time of answer to incoming call. Should have same unit as aht.
-    shrinkage : float, optional
-        Percentage of time agents are paid for but don't answer for calls.
-        For example meetings, trainings, etc.. Should be 0-1 (0-100%).
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
 
     Returns
     -------
-    StaffingData
-        Result of calculations for specified number of agents.
-    """
-    wait_probability = erlang_c(t_intensity, agents)
-    immediate_answer = calc_immediate_answer(wait_probability)
-    asa = calc_average_speed_of_answer(t_intensity, agents, wait_probability, aht)
-    service_level = calc_service_level(
-        t_intensity, agents, wait_probability, target_answer_time, aht
-    )
-    occupancy = calc_occupancy(t_intensity, agents)
-    agents_with_shrinkage = add_shrinkage(agents, shrinkage) if shrinkage else None
-
-    return StaffingData(
-        traffic_intensity=t_intensity,
-        wait_probability=wait_probability,
-        immediate_answer=immediate_answer,
-        average_speed_of_answer=asa,
-        service_level=service_level,
-        occupancy=occupancy,
-        agents=agents,
-        agents_with_shrinkage=agents_with_shrinkage,
-    )
-
+    int
+        Estimated number of agents.
 
-def calc_staffing(
-    calls_per_hour: float,
-    aht: float,
-    agents: Optional[int] = None,
-    max_occupancy: float = 0.85,
-    target_answer_time: float = 20,
-    target_service_level: float = 0.80,
-    shrinkage: Optional[float] = None,
-    time_unit: TimeUnit = TimeUnit.SEC,
-) -> StaffingData:
+    Examples
+    --------
+    >>> estimate_agents(100, 300, 20, 0.8)
+    108
     """
-    Automatic staffing calculations.
+    if t_intensity <= 0:
+        return 0
+    root = math.sqrt(t_intensity)
+
+    def service_level(beta: float) -> float:
+        density = math.exp(-beta * beta / 2) / math.sqrt(2 * math.pi)
+        distribution = (1 + math.erf(beta / math.sqrt(2))) / 2
+        wait_probability = 1 / (1 + beta * distribution / density)
+        return 1 - wait_probability * math.exp(-beta * root * target_answer_time / aht)
+
+    low, high = 0.0, 1.0
+    while service_level(high) < target_service_level and high < 64:
+        low, high = high, high * 2
+    # 50 halvings are more than enough for integer number of agents.
+    for _ in range(50):
+        middle = (low + high) / 2
+        if service_level(middle) >= target_service_level:
+            high = middle
+        else:
+            low = middle
+    return math.ceil(t_intensity + high * root)
+
+
+def calc_service_level_continuous(
+    t_intensity: float, agents: float, aht: float, target_answer_time: float
+) -> Tuple[float, float]:
+    """
+    Calculates service level and its derivative for non integer number of agents.
 
-    If agents number specified - calculates only for this number of agents.
-    else - automatic adjusting of number of agents to achieve the best parameters.
+    Uses continuous extension of Erlang C, see erlang_c_stable() and erlang_c_derivative().
 
     Parameters
     ----------
-    calls_per_hour : float
-        Number of calls offered per hour.
-    aht : float
+    t_intensity : float
+        Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
+    agents : float
+        Number of agents. Can be non integer.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+
+    Returns
+    -------
+    Tuple[float, float]
+        Service level and its derivative with respect to number of agents.
+
+    Examples
+    --------
+    >>> calc_service_level_continuous(123, 130.5, 300, 20)
+    (0.759567875520059, 0.04905998387182623)
+    """
+    if agents <= t_intensity:
+        return 0.0, 0.0
+    wait_probability = erlang_c_stable(t_intensity, agents)
+    decay = math.exp(-(agents - t_intensity) * target_answer_time / aht)
+    service_level = 1 - wait_probability * decay
+    derivative = -decay * (
+        erlang_c_derivative(t_intensity, agents) - wait_probability * target_answer_time / aht
+    )
+    return service_level, derivative
+
+
+def calc_average_speed_of_answer_continuous(
+    t_intensity: float, agents: float, aht: float
+) -> Tuple[float, float]:
+    """
+    Calculates average speed of answer and its derivative for non integer number of agents.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
+    agents : float
+        Number of agents. Can be non integer, should be more than t_intensity.
+    aht : float
+        Average Handling Time.
+
+    Returns
+    -------
+    Tuple[float, float]
+        Average speed of answer and its derivative with respect to number of agents.
+        Unit is the same as for AHT.
+
+    Examples
+    --------
+    >>> calc_average_speed_of_answer_continuous(123, 130.5, 300)
+    (15.85622231158799, -4.292531045426605)
+    """
+    wait_probability = erlang_c_stable(t_intensity, agents)
+    reserve = agents - t_intensity
+    asa = wait_probability * aht / reserve
+    derivative = aht * (erlang_c_derivative(t_intensity, agents) * reserve - wait_probability)
+    return asa, derivative / (reserve * reserve)
+
+
+def __solve_continuous(
+    function: Callable[[float], Tuple[float, float]], low: float, high: float, start: float
+) -> float:
+    """
+    Find root of increasing function with Newton method, safeguarded by bisection.
+
+    Parameters
+    ----------
+    function : Callable[[float], Tuple[float, float]]
+        Function which returns value and derivative. Negative at low, not negative at high.
+    low : float
+        Lower end of the root bracket.
+    high : float
+        Upper end of the root bracket.
+    start : float
+        Initial guess.
+
+    Returns
+    -------
+    float
+        Root of the function.
+    """
+    agents = start if low < start < high else (low + high) / 2
+    for _ in range(200):
+        value, derivative = function(agents)
+        if value >= 0:
+            high = agents
+        else:
+            low = agents
+        step = value / derivative if derivative > 0 else math.inf
+        if abs(step) <= CONTINUOUS_TOLERANCE * agents or high - low <= CONTINUOUS_TOLERANCE * high:
+            break
+        agents = agents - step if low < agents - step < high else (low + high) / 2
+    return agents
+
+
+def calc_agents_continuous(
+    t_intensity: float,
+    aht: float,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    target_asa: Optional[float] = None,
+    max_occupancy: Optional[float] = None,
+) -> float:
+    """
+    Calculates non integer number of agents which exactly meets targets.
+
+    Uses Newton method on continuous extension of Erlang C, so it converges in a few
+    iterations. Round result up to get number of agents.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
+    aht : float
+        Average Handling Time.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float, default=0.80 (80%).
+        Percentage of calls that should be answered in target_answer_time. Should be less than 1.
+    target_asa : float, optional
+        The highest allowed average speed of answer. Should have same unit as aht.
+    max_occupancy : float, optional
+        The highest allowed occupancy. Should be 0-1 (0-100%).
+
+    Returns
+    -------
+    float
+        Number of agents which meets all targets.
+
+    Examples
+    --------
+    >>> calc_agents_continuous(100, 300, 20, 0.8)
+    107.83206496505444
+    """
+    if target_service_level >= 1:
+        raise ValueError("Service level target 1 (100%) can't be reached")
+    if t_intensity <= 0:
+        return 0.0
+    high = max_agents_for_service_level(
+        t_intensity, aht, target_answer_time, target_service_level
+    ) or (t_intensity + math.sqrt(t_intensity) + 1)
+    while calc_service_level_continuous(t_intensity, high, aht, target_answer_time)[0] < (
+        target_service_level
+    ):
+        high = t_intensity + 2 * (high - t_intensity)
+
+    def function(agents: float) -> Tuple[float, float]:
+        service_level, derivative = calc_service_level_continuous(
+            t_intensity, agents, aht, target_answer_time
+        )
+        return service_level - target_service_level, derivative
+
+    start = estimate_agents(t_intensity, aht, target_answer_time, target_service_level)
+    agents = __solve_continuous(function, t_intensity, high, start)
+    if target_asa:
+        agents = max(agents, __agents_for_asa(t_intensity, aht, target_asa))
+    if max_occupancy:
+        agents = max(agents, t_intensity / max_occupancy)
+    return agents
+
+
+def __agents_for_asa(t_intensity: float, aht: float, target_asa: float) -> float:
+    """
+    Calculates non integer number of agents with average speed of answer equal to target.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs.
+    aht : float
+        Average Handling Time.
+    target_asa : float
+        The highest allowed average speed of answer. Should have same unit as aht.
+
+    Returns
+    -------
+    float
+        Number of agents.
+    """
+
+    def function(agents: float) -> Tuple[float, float]:
+        asa, derivative = calc_average_speed_of_answer_continuous(t_intensity, agents, aht)
+        return target_asa - asa, -derivative
+
+    # Wait probability is not more than 1, so ASA is not more than aht / (agents - A).
+    high = t_intensity + aht / target_asa
+    return __solve_continuous(function, t_intensity, high, (t_intensity + high) / 2)
+
+
+def max_calls_for_agents(
+    agents: int,
+    aht: float,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    max_occupancy: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> float:
+    """
+    Calculates the highest number of calls per hour which fixed team handles at targets.
+
+    For fixed number of agents service level only goes down when traffic intensity grows,
+    so intensity is found by bisection between 0 and number of agents.
+    Each probe is one erlang_c_stable() call in O(sqrt(N)).
+
+    Parameters
+    ----------
+    agents : int
+        Number of agents.
+    aht : float
+        Average Handling Time. Default unit is seconds.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same time unit as aht.
+    target_service_level : float, default=0.80 (80%).
+        Percentage of calls that should be answered in target_answer_time.
+    max_occupancy : float, optional
+        If specified - number of calls is also limited by occupancy.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Returns
+    -------
+    float
+        Number of calls per hour, relative precision is CONTINUOUS_TOLERANCE.
+        0 if there are no agents or target service level is 1.
+
+    Examples
+    --------
+    >>> max_calls_for_agents(45, 120)
+    1221.6420485638082
+    """
+    if agents <= 0 or target_service_level >= 1:
+        return 0.0
+
+    def meets_target(t_intensity: float) -> bool:
+        wait_probability = erlang_c_stable(t_intensity, agents)
+        service_level = calc_service_level(
+            t_intensity, agents, wait_probability, target_answer_time, aht
+        )
+        return service_level >= target_service_level
+
+    t_intensity = __bisect_highest(meets_target, agents * min(max_occupancy or 1, 1))
+    calls_per_hour = t_intensity / (aht / time_unit.value)
+    # Rounding of intensity may need one more agent for occupancy.
+    while (
+        max_occupancy
+        and agents_to_meet_occupancy(
+            calc_traffic_intensity(calls_per_hour, aht, time_unit), max_occupancy
+        )
+        > agents
+    ):
+        calls_per_hour -= calls_per_hour * sys.float_info.epsilon
+    return calls_per_hour
+
+
+def max_aht_for_agents(
+    calls_per_hour: float,
+    agents: int,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    max_occupancy: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> float:
+    """
+    Calculates the highest average handling time which staffed interval absorbs at targets.
+
+    Longer handling time increases traffic intensity and wait probability and
+    shortens target answer time relative to aht, so service level only goes down.
+    Occupancy can't be more than max_occupancy (or 1), so intensity is below
+    agents * max_occupancy and aht is found by bisection below this bound.
+
+    Parameters
+    ----------
+    calls_per_hour : float
+        Number of calls offered per hour.
+    agents : int
+        Number of scheduled agents.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same time unit as aht.
+    target_service_level : float, default=0.80 (80%).
+        Percentage of calls that should be answered in target_answer_time.
+    max_occupancy : float, optional
+        If specified - handling time is also limited by occupancy.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Returns
+    -------
+    float
+        Average handling time, relative precision is CONTINUOUS_TOLERANCE.
+        Infinite if there are no calls, 0 if there are no agents or target service level is 1.
+
+    Examples
+    --------
+    >>> max_aht_for_agents(1000, 45)
+    145.4278238201514
+    """
+    if calls_per_hour <= 0:
+        return math.inf
+    if agents <= 0 or target_service_level >= 1:
+        return 0.0
+
+    def meets_target(aht: float) -> bool:
+        t_intensity = calc_traffic_intensity(calls_per_hour, aht, time_unit)
+        wait_probability = erlang_c_stable(t_intensity, agents)
+        service_level = calc_service_level(
+            t_intensity, agents, wait_probability, target_answer_time, aht
+        )
+        return service_level >= target_service_level
+
+    high = agents * min(max_occupancy or 1, 1) / calls_per_hour * time_unit.value
+    # Rounding of intensity may need one more agent for occupancy.
+    while (
+        max_occupancy
+        and agents_to_meet_occupancy(
+            calc_traffic_intensity(calls_per_hour, high, time_unit), max_occupancy
+        )
+        > agents
+    ):
+        high -= high * sys.float_info.epsilon
+    return __bisect_highest(meets_target, high)
+
+
+def __bisect_highest(meets_target: Callable[[float], bool], high: float) -> float:
+    """
+    Find the highest value between 0 and high which meets target.
+
+    Parameters
+    ----------
+    meets_target : Callable[[float], bool]
+        True for values which meet target, should be monotonic: True below some value
+        and False above it.
+    high : float
+        Upper bound, returned if it meets target.
+
+    Returns
+    -------
+    float
+        The highest value which meets target, relative precision is CONTINUOUS_TOLERANCE.
+    """
+    if meets_target(high):
+        return high
+    low = 0.0
+    while high - low > CONTINUOUS_TOLERANCE * high:
+        middle = (low + high) / 2
+        if meets_target(middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def __calc_service_level(
+    iterator: ErlangIterator,
+    agents: int,
+    aht: float,
+    target_answer_time: float,
+    stats: Optional[SearchStats] = None,
+) -> float:
+    """
+    Calculate service level for specified number of agents using Erlang iterator.
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity. Is moved to specified number of agents.
+    agents : int
+        Number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    stats : SearchStats, optional
+        If specified - number of evaluations and recurrence steps is increased.
+
+    Returns
+    -------
+    float
+        Service level. Range 0-1(0%-100%).
+    """
+    steps = iterator.steps
+    iterator.advance(agents)
+    if stats:
+        stats.evaluations += 1
+        stats.steps += iterator.steps - steps
+    if isinstance(iterator, EngsetIterator):
+        return iterator.service_level(target_answer_time, aht)
+    return calc_service_level(
+        iterator.t_intensity, agents, iterator.wait_probability, target_answer_time, aht
+    )
+
+
+def __find_min_max_agents(
+    t_intensity: float,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+    stats: Optional[SearchStats] = None,
+    iterator: Optional[ErlangIterator] = None,
+) -> Tuple[int, int]:
+    """
+    Find min and max number of agents for binary search.
+
+    Upper bound is limited by max_agents_for_service_level(), so search never goes
+    through huge powers of two. The bound holds for finite sources too, as their
+    queue is never longer than with infinitely many sources.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs. Can be calculated using method calc_traffic_intensity().
+    aht : float
+        Average Handling Time. Default unit is seconds.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+    stats : SearchStats, optional
+        If specified - number of evaluations is increased.
+    iterator : ErlangIterator, optional
+        Iterator used for service level, new ErlangIterator if not specified.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Tuple of min and max number of agents.
+
+    Examples
+    --------
+    >>> __find_min_max_agents(8, 300, 20, 0.8)
+    (8, 16)
+    """
+    iterator = iterator or ErlangIterator(t_intensity)
+    max_agents = max_agents_for_service_level(
+        t_intensity, aht, target_answer_time, target_service_level
+    )
+    start = int(math.log(t_intensity, 2)) if t_intensity >= 1 else 0
+    for i in range(start, 65):
+        agents = 2**i
+        # Below the first power of two nothing is checked.
+        low = 2 ** (i - 1) if i > start else 0
+        if max_agents is not None and agents >= max_agents:
+            return low, max_agents
+        service_level = __calc_service_level(iterator, agents, aht, target_answer_time, stats)
+        if service_level >= target_service_level:
+            return low, agents
+    return 0, 0
+
+
+def __calc_all(
+    agents: int,
+    t_intensity: float,
+    aht: float,
+    target_answer_time: float,
+    shrinkage: Optional[float] = None,
+    wait_probability: Optional[float] = None,
+) -> StaffingData:
+    """
+    Calculate all parameters for specified number of agents.
+
+    Parameters
+    ----------
+    agents : int
+        Number of agents.
+    t_intensity : float
+        Number of calls offered per hour.
+    aht : float
+        Average Handling Time. Default unit is seconds.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    shrinkage : float, optional
+        Percentage of time agents are paid for but don't answer for calls.
+        For example meetings, trainings, etc.. Should be 0-1 (0-100%).
+    wait_probability : float, optional
+        Already calculated Erlang C wait probability for this number of agents.
+        If not specified - calculated with ErlangIterator.
+
+    Returns
+    -------
+    StaffingData
+        Result of calculations for specified number of agents.
+    """
+    if wait_probability is None:
+        wait_probability = ErlangIterator(t_intensity, agents).wait_probability
+    immediate_answer = calc_immediate_answer(wait_probability)
+    asa = calc_average_speed_of_answer(t_intensity, agents, wait_probability, aht)
+    service_level = calc_service_level(
+        t_intensity, agents, wait_probability, target_answer_time, aht
+    )
+    occupancy = calc_occupancy(t_intensity, agents)
+    agents_with_shrinkage = add_shrinkage(agents, shrinkage) if shrinkage else None
+
+    return StaffingData(
+        traffic_intensity=t_intensity,
+        wait_probability=wait_probability,
+        immediate_answer=immediate_answer,
+        average_speed_of_answer=asa,
+        service_level=service_level,
+        occupancy=occupancy,
+        agents=agents,
+        agents_with_shrinkage=agents_with_shrinkage,
+    )
+
+
+def __calc_finite_source(
+    iterator: EngsetIterator,
+    agents: int,
+    aht: float,
+    target_answer_time: float,
+    shrinkage: Optional[float] = None,
+) -> StaffingData:
+    """
+    Calculate all parameters of finite source delay model for specified number of agents.
+
+    Parameters
+    ----------
+    iterator : EngsetIterator
+        Iterator for the traffic intensity and number of sources. Is moved to agents.
+    agents : int
+        Number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    shrinkage : float, optional
+        Percentage of time agents are paid for but don't answer for calls.
+
+    Returns
+    -------
+    StaffingData
+        Result of calculations for specified number of agents.
+    """
+    iterator.advance(agents)
+    wait_probability = iterator.wait_probability
+    return StaffingData(
+        traffic_intensity=iterator.t_intensity,
+        wait_probability=wait_probability,
+        immediate_answer=calc_immediate_answer(wait_probability),
+        average_speed_of_answer=iterator.average_speed_of_answer(aht),
+        service_level=iterator.service_level(target_answer_time, aht),
+        occupancy=iterator.occupancy,
+        agents=agents,
+        agents_with_shrinkage=add_shrinkage(agents, shrinkage) if shrinkage else None,
+    )
+
+
+def __finite_source_occupancy_agents(iterator: EngsetIterator, max_occupancy: float) -> int:
+    """
+    Find the lowest number of agents which meets occupancy target for finite sources.
+
+    Occupancy only goes down when agents are added, so bisection is used. Carried traffic
+    is never above t_intensity, so agents_to_meet_occupancy() is the upper bound.
+
+    Parameters
+    ----------
+    iterator : EngsetIterator
+        Iterator for the traffic intensity and number of sources.
+    max_occupancy : float
+        The highest allowed occupancy.
+
+    Returns
+    -------
+    int
+        Number of agents to meet occupancy.
+    """
+    low = 1
+    high = max(low, agents_to_meet_occupancy(iterator.t_intensity, max_occupancy))
+    while low < high:
+        middle = (low + high) // 2
+        iterator.advance(middle)
+        if iterator.occupancy <= max_occupancy:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def __staffing_finite_source(
+    t_intensity: float,
+    sources: int,
+    agents: Optional[int],
+    max_occupancy: float,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+    shrinkage: Optional[float],
+    search: SearchMethod,
+) -> StaffingData:
+    """
+    Find number of agents for finite source delay model with the same searches as calc_staffing().
+
+    Occupancy depends on waits, so number of agents to meet it is found with bisection
+    and used as the lowest number of agents for the search.
+
+    Parameters
+    ----------
+    t_intensity : float
+        Traffic intensity in Erlangs when all sources are idle.
+    sources : int
+        Number of sources.
+    agents : int, optional
+        Number of agents. If specified - only calculated for this number of agents.
+    max_occupancy : float
+        The highest allowed occupancy.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+    shrinkage : float, optional
+        Percentage of time agents are paid for but don't answer for calls.
+    search : SearchMethod
+        Algorithm used to find number of agents.
+
+    Returns
+    -------
+    StaffingData
+        Result of calculations.
+    """
+    iterator = EngsetIterator(t_intensity, sources)
+    if agents:
+        return __calc_finite_source(iterator, agents, aht, target_answer_time, shrinkage)
+    min_agents = __finite_source_occupancy_agents(iterator, max_occupancy)
+    stats = SearchStats(search)
+    agents = __SEARCHES[search](
+        iterator, min_agents, aht, target_answer_time, target_service_level, stats
+    )
+    if stats.seed is not None:
+        stats.seed_error = agents - stats.seed
+    result = __calc_finite_source(iterator, agents, aht, target_answer_time, shrinkage)
+    result.search_stats = stats
+    return result
+
+
+def __search_linear(
+    iterator: ErlangIterator,
+    min_agents: int,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+    stats: SearchStats,
+) -> int:
+    """
+    Find number of agents by checking min_agents, min_agents + 1, ... one by one.
+
+    Each step moves Erlang iterator by one agent, so whole search costs O(N).
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity.
+    min_agents : int
+        Number of agents to start search from.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+    stats : SearchStats
+        Statistics of the search, updated in place.
+
+    Returns
+    -------
+    int
+        The lowest number of agents which meets target service level.
+    """
+    agents = min_agents
+    # 10000 just to avoid using while.
+    for _ in range(10000):
+        service_level = __calc_service_level(iterator, agents, aht, target_answer_time, stats)
+        if service_level >= target_service_level:
+            return agents
+        agents += 1
+    raise OverflowError(f"Staffing Error: reached maximum number of agents {agents}")
+
+
+def __search_bisection(
+    iterator: ErlangIterator,
+    min_agents: int,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+    stats: SearchStats,
+) -> int:
+    """
+    Find number of agents with binary search inside bracket from __find_min_max_agents().
+
+    Service level only goes up when agents are added, so result is the same as for
+    linear search, but only O(log N) service level evaluations are needed. Erlang iterator
+    keeps passed agents, so probes below already reached agents need no recurrence steps
+    and the whole search takes about as many steps as linear search.
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity.
+    min_agents : int
+        The lowest allowed number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+    stats : SearchStats
+        Statistics of the search, updated in place.
+
+    Returns
+    -------
+    int
+        The lowest number of agents which meets target service level.
+    """
+    low, high = __find_min_max_agents(
+        iterator.t_intensity, aht, target_answer_time, target_service_level, stats, iterator
+    )
+    if high == 0:
+        raise OverflowError("Staffing Error: can't find maximum number of agents")
+    low, high = max(low, min_agents), max(high, min_agents)
+    while low < high:
+        middle = (low + high) // 2
+        service_level = __calc_service_level(iterator, middle, aht, target_answer_time, stats)
+        if service_level >= target_service_level:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def __search_from_seed(
+    iterator: ErlangIterator,
+    seed: int,
+    min_agents: int,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+    stats: SearchStats,
+) -> int:
+    """
+    Find number of agents walking up or down from the seed.
+
+    Service level is checked for the seed and one agent below it. Blocking probability
+    for the seed is calculated with erlang_b_stable() in O(sqrt(N)), and Erlang iterator
+    walks to neighbours with forward and backward recurrences in O(1) per agent,
+    so good seed needs only 2-3 evaluations and a couple of recurrence steps.
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity.
+    seed : int
+        Estimated number of agents.
+    min_agents : int
+        The lowest allowed number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+    stats : SearchStats
+        Statistics of the search, updated in place.
+
+    Returns
+    -------
+    int
+        The lowest number of agents which meets target service level.
+    """
+    agents = max(seed, min_agents)
+    stats.seed = agents
+    iterator.seek(agents)
+    if agents > min_agents:
+        below = __calc_service_level(iterator, agents - 1, aht, target_answer_time, stats)
+        # Walk down, every step below costs O(1).
+        while below >= target_service_level:
+            agents -= 1
+            if agents == min_agents:
+                return agents
+            below = __calc_service_level(iterator, agents - 1, aht, target_answer_time, stats)
+    # Walk up, every step above costs O(1).
+    while __calc_service_level(iterator, agents, aht, target_answer_time, stats) < (
+        target_service_level
+    ):
+        agents += 1
+    return agents
+
+
+def __search_seed(
+    iterator: ErlangIterator,
+    min_agents: int,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+    stats: SearchStats,
+) -> int:
+    """
+    Find number of agents starting from square-root staffing estimate.
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity.
+    min_agents : int
+        The lowest allowed number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+    stats : SearchStats
+        Statistics of the search, updated in place.
+
+    Returns
+    -------
+    int
+        The lowest number of agents which meets target service level.
+    """
+    seed = estimate_agents(iterator.t_intensity, aht, target_answer_time, target_service_level)
+    return __search_from_seed(
+        iterator, seed, min_agents, aht, target_answer_time, target_service_level, stats
+    )
+
+
+def __search_newton(
+    iterator: ErlangIterator,
+    min_agents: int,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+    stats: SearchStats,
+) -> int:
+    """
+    Find number of agents starting from rounded up result of calc_agents_continuous().
+
+    Service level target 1 has no continuous solution, but float service level reaches 1
+    for some number of agents, so then search starts from square-root staffing estimate
+    as SearchMethod.SEED does.
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity.
+    min_agents : int
+        The lowest allowed number of agents.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+    stats : SearchStats
+        Statistics of the search, updated in place.
+
+    Returns
+    -------
+    int
+        The lowest number of agents which meets target service level.
+    """
+    if target_service_level >= 1:
+        return __search_seed(
+            iterator, min_agents, aht, target_answer_time, target_service_level, stats
+        )
+    agents = calc_agents_continuous(
+        iterator.t_intensity, aht, target_answer_time, target_service_level
+    )
+    seed = math.ceil(agents * (1 - CONTINUOUS_TOLERANCE))
+    return __search_from_seed(
+        iterator, seed, min_agents, aht, target_answer_time, target_service_level, stats
+    )
+
+
+__SEARCHES = {
+    SearchMethod.LINEAR: __search_linear,
+    SearchMethod.BISECTION: __search_bisection,
+    SearchMethod.SEED: __search_seed,
+    SearchMethod.NEWTON: __search_newton,
+}
+
+
+def calc_staffing_curve(
+    calls_per_hour: float,
+    aht: float,
+    agents_range: Iterable[int],
+    target_answer_time: float = 20,
+    shrinkage: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> StaffingTable:
+    """
+    Staffing calculations for each number of agents from the range in one pass.
+
+    Erlang iterator moves from one number of agents to the next one in O(1), so whole
+    curve costs about the same as one erlang_c() call for the highest number of agents.
+    Range should be increasing, otherwise calculation restarts for each decrease.
+
+    Parameters
+    ----------
+    calls_per_hour : float
+        Number of calls offered per hour.
+    aht : float
+        Average Handling Time. Default unit is seconds.
+    agents_range : Iterable[int]
+        Numbers of agents, for example range(0, 201).
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same time unit as aht.
+    shrinkage : float, optional
+        Percentage of time agents are paid for but don't answer for calls.
+        For example meetings, trainings, etc.. Should be 0-1 (0-100%).
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Returns
+    -------
+    StaffingTable
+        Result of calculations, one row for each number of agents.
+        If agents <= traffic intensity queue grows infinitely: service level is 0,
+        average speed of answer is infinite and occupancy is 1.
+
+    Examples
+    --------
+    >>> curve = calc_staffing_curve(1000, 120, range(30, 45))
+    >>> curve.service_level[10]
+    0.9372106214887137
+    """
+    t_intensity = calc_traffic_intensity(calls_per_hour, aht, time_unit)
+    iterator = ErlangIterator(t_intensity)
+    columns = StaffingTable()
+    for agents in agents_range:
+        iterator.advance(agents)
+        wait_probability = iterator.wait_probability
+        if agents > t_intensity:
+            service_level = calc_service_level(
+                t_intensity, agents, wait_probability, target_answer_time, aht
+            )
+            asa = calc_average_speed_of_answer(t_intensity, agents, wait_probability, aht)
+        else:
+            service_level, asa = 0, math.inf
+        columns.append(t_intensity, agents, wait_probability, service_level, asa, shrinkage)
+    return columns
+
+
+def __broadcast(value: Any, size: int, name: str) -> List[Any]:
+    """
+    Repeat scalar value for each row of the batch or check length of sequence.
+
+    Parameters
+    ----------
+    value : Any
+        Scalar, None or sequence of values.
+    size : int
+        Number of rows in the batch.
+    name : str
+        Name of the parameter for error message.
+
+    Returns
+    -------
+    List[Any]
+        One value for each row.
+    """
+    if value is None or isinstance(value, Number):
+        return [value] * size
+    values = list(value)
+    if len(values) != size:
+        raise ValueError(f"Length of {name} should be {size}, got {len(values)}")
+    return values
+
+
+def __batch_wait_probability(iterator: ErlangIterator, waits: List[float], agents: int) -> float:
+    """
+    Get wait probability from the list shared by rows with the same traffic intensity.
+
+    List contains wait probabilities for 0, 1, 2, ... agents and is extended
+    by Erlang iterator only when higher number of agents is needed.
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity of the list.
+    waits : List[float]
+        Already calculated wait probabilities, extended in place.
+    agents : int
+        Number of agents.
+
+    Returns
+    -------
+    float
+        Probability that there is no available agents to answer the call.
+    """
+    while len(waits) <= agents:
+        iterator.advance(len(waits))
+        waits.append(iterator.wait_probability)
+    return waits[agents]
+
+
+def __batch_search(
+    iterator: ErlangIterator,
+    waits: List[float],
+    min_agents: int,
+    aht: float,
+    target_answer_time: float,
+    target_service_level: float,
+) -> int:
+    """
+    Find number of agents by checking min_agents, min_agents + 1, ... one by one.
+
+    The same as __search_linear(), but wait probabilities are taken from the shared list.
+
+    Parameters
+    ----------
+    iterator : ErlangIterator
+        Iterator for the traffic intensity.
+    waits : List[float]
+        Wait probabilities shared by rows with the same traffic intensity.
+    min_agents : int
+        Number of agents to start search from.
+    aht : float
+        Average Handling Time.
+    target_answer_time : float
+        Target time of answer to incoming call. Should have same unit as aht.
+    target_service_level : float
+        Percentage of calls that should be answered in target_answer_time.
+
+    Returns
+    -------
+    int
+        The lowest number of agents which meets target service level.
+    """
+    agents = min_agents
+    # 10000 just to avoid using while.
+    for _ in range(10000):
+        wait_probability = __batch_wait_probability(iterator, waits, agents)
+        service_level = calc_service_level(
+            iterator.t_intensity, agents, wait_probability, target_answer_time, aht
+        )
+        if service_level >= target_service_level:
+            return agents
+        agents += 1
+    raise OverflowError(f"Staffing Error: reached maximum number of agents {agents}")
+
+
+def calc_staffing_batch(
+    calls_per_hour: Iterable[float],
+    aht: Union[float, Iterable[float]],
+    agents: Optional[Iterable[Optional[int]]] = None,
+    max_occupancy: Union[float, Iterable[float]] = 0.85,
+    target_answer_time: Union[float, Iterable[float]] = 20,
+    target_service_level: Union[float, Iterable[float]] = 0.80,
+    shrinkage: Union[None, float, Iterable[Optional[float]]] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> StaffingTable:
+    """
+    Staffing calculations for many intervals in one call.
+
+    Each row gives the same result as calc_staffing() with the same parameters, metrics
+    of solved rows are calculated with erlang_c_stable() as there. Scalar parameters are
+    used for all rows. Rows with the same traffic intensity share one Erlang iterator and
+    list of wait probabilities, so Erlang C is calculated once for each pair of intensity
+    and number of agents.
+
+    Parameters
+    ----------
+    calls_per_hour : Iterable[float]
+        Number of calls offered per hour for each row.
+    aht : float or Iterable[float]
+        Average Handling Time. Default unit is seconds.
+    agents : Iterable[int], optional
+        Number of agents for each row. Rows where it's None or 0 are solved for
+        the lowest number of agents which meets targets, as in calc_staffing().
+    max_occupancy : float or Iterable[float], default=0.85
+        The highest allowed occupancy for solved rows.
+    target_answer_time : float or Iterable[float], default=20
+        Target time of answer to incoming call. Should have same time unit as aht.
+    target_service_level : float or Iterable[float], default=0.80 (80%).
+        Percentage of calls that should be answered in target_answer_time.
+    shrinkage : float or Iterable[float], optional
+        Percentage of time agents are paid for but don't answer for calls.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Returns
+    -------
+    StaffingTable
+        Result of calculations, one row for each input row.
+        If given agents <= traffic intensity service level is 0 and
+        average speed of answer is infinite.
+
+    Examples
+    --------
+    >>> batch = calc_staffing_batch([1000, 1000, 500], 120, agents=[None, 35, None])
+    >>> list(batch.agents)
+    [40, 35, 20]
+    """
+    calls_per_hour = list(calls_per_hour)
+    size = len(calls_per_hour)
+    rows = zip(
+        calls_per_hour,
+        __broadcast(aht, size, "aht"),
+        __broadcast(agents, size, "agents"),
+        __broadcast(max_occupancy, size, "max_occupancy"),
+        __broadcast(target_answer_time, size, "target_answer_time"),
+        __broadcast(target_service_level, size, "target_service_level"),
+        __broadcast(shrinkage, size, "shrinkage"),
+    )
+    shared: Dict[float, Tuple[ErlangIterator, List[float]]] = {}
+    result = StaffingTable()
+    for calls, row_aht, row_agents, occupancy, answer_time, target, row_shrinkage in rows:
+        t_intensity = calc_traffic_intensity(calls, row_aht, time_unit)
+        if t_intensity not in shared:
+            shared[t_intensity] = (ErlangIterator(t_intensity), [])
+        iterator, waits = shared[t_intensity]
+        if row_agents:
+            wait_probability = __batch_wait_probability(iterator, waits, row_agents)
+        else:
+            min_agents = max(int(t_intensity), agents_to_meet_occupancy(t_intensity, occupancy))
+            row_agents = __batch_search(iterator, waits, min_agents, row_aht, answer_time, target)
+            # Same as in calc_staffing(), found number of agents is calculated once more.
+            wait_probability = erlang_c_stable(t_intensity, row_agents)
+        if row_agents > t_intensity:
+            row_service_level = calc_service_level(
+                t_intensity, row_agents, wait_probability, answer_time, row_aht
+            )
+            asa = calc_average_speed_of_answer(t_intensity, row_agents, wait_probability, row_aht)
+        else:
+            row_service_level, asa = 0, math.inf
+        result.append(
+            t_intensity, row_agents, wait_probability, row_service_level, asa, row_shrinkage
+        )
+    return result
+
+
+def calc_staffing_sequence(
+    calls_per_hour: Iterable[float],
+    aht: Union[float, Iterable[float]],
+    max_occupancy: float = 0.85,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    shrinkage: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> Iterator[StaffingData]:
+    """
+    Staffing calculations for ordered sequence of intervals with warm start.
+
+    Volumes of neighbouring intervals are close, so search for each interval starts from
+    the solution of the previous one and walks up or down, as SearchMethod.SEED does from
+    square-root estimate. Seed keeps safety staffing of the previous interval in units of
+    sqrt(intensity): A + (N_prev - A_prev) * sqrt(A / A_prev), so trend of volumes is followed
+    and most intervals need 1-3 service level evaluations. If the previous interval was
+    bound by max_occupancy, its agents say nothing about service level, so search starts
+    from the occupancy limit of the interval. The first interval starts from square-root
+    estimate. Results are the same as of independent calc_staffing() calls.
+
+    Parameters
+    ----------
+    calls_per_hour : Iterable[float]
+        Number of calls offered per hour for each interval, in interval order.
+    aht : float or Iterable[float]
+        Average Handling Time, one for all intervals or one for each. Default unit is seconds.
+    max_occupancy : float, default=0.85
+        If specified - algorithm may increase required number of agents to achieve lower occupancy.
+    target_answer_time : float, default=20
+        Target time of answer to incoming call. Should have same time unit as aht.
+    target_service_level : float, default=0.80 (80%).
+        Percentage of calls that should be answered in target_answer_time.
+    shrinkage : float, optional
+        Percentage of time agents are paid for but don't answer for calls.
+        For example meetings, trainings, etc.. Should be 0-1 (0-100%).
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Yields
+    ------
+    StaffingData
+        Result of calculations for each interval. search_stats.seed is the number of agents
+        predicted from the previous interval, search_stats.seed_error is the error of prediction.
+
+    Examples
+    --------
+    >>> [result.agents for result in calc_staffing_sequence([1000, 1100, 1050], 120)]
+    [40, 44, 42]
+    """
+    if isinstance(aht, Number):
+        aht = repeat(aht)
+    # Agents and intensity of the previous interval, None if it was bound by occupancy.
+    previous: Optional[Tuple[int, float]] = None
+    first = True
+    for calls, row_aht in zip(calls_per_hour, aht):
+        t_intensity = calc_traffic_intensity(calls, row_aht, time_unit)
+        min_agents = max(int(t_intensity), agents_to_meet_occupancy(t_intensity, max_occupancy))
+        if first:
+            seed = estimate_agents(t_intensity, row_aht, target_answer_time, target_service_level)
+        elif previous is None:
+            seed = min_agents
+        elif previous[1] > 0:
+            reserve = (previous[0] - previous[1]) * math.sqrt(t_intensity / previous[1])
+            seed = round(t_intensity + reserve)
+        else:
+            seed = previous[0]
+        iterator = ErlangIterator(t_intensity)
+        stats = SearchStats(SearchMethod.SEED)
+        agents = __search_from_seed(
+            iterator,
+            seed,
+            min_agents,
+            row_aht,
+            target_answer_time,
+            target_service_level,
+            stats,
+        )
+        stats.seed_error = agents - stats.seed
+        # Same as in calc_staffing(), results don't depend on the path of the search.
+        wait_probability = erlang_c_stable(t_intensity, agents)
+        result = __calc_all(
+            agents, t_intensity, row_aht, target_answer_time, shrinkage, wait_probability
+        )
+        result.search_stats = stats
+        first = False
+        previous = (agents, t_intensity) if agents > min_agents else None
+        yield result
+
+
+def calc_staffing(
+    calls_per_hour: float,
+    aht: float,
+    agents: Optional[int] = None,
+    max_occupancy: float = 0.85,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    shrinkage: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+    search: SearchMethod = SearchMethod.LINEAR,
+    lazy: bool = False,
+    sources: Optional[int] = None,
+) -> Union[StaffingData, LazyStaffingData]:
+    """
+    Automatic staffing calculations.
+
+    If agents number specified - calculates only for this number of agents.
+    else - automatic adjusting of number of agents to achieve the best parameters.
+
+    Parameters
+    ----------
+    calls_per_hour : float
+        Number of calls offered per hour.
+    aht : float
         Average Handling Time. Default unit is seconds.
     agents : int, optional.
         Number of agents. If not specified
@@ -389,23 +2182,160 @@ def calc_staffing(
         For example meetings, trainings, etc.. Should be 0-1 (0-100%).
     time_unit : TimeUnit, default = TimeUnit.SEC
         Unit for average handling time and target_answer_time.
+    search : SearchMethod, default = SearchMethod.LINEAR
+        Algorithm used to find number of agents. All methods give the same result.
+    lazy : bool, default=False
+        If True - LazyStaffingData is returned, its metrics are calculated on access.
+        With given agents even Erlang C is not calculated until it's needed.
+    sources : int, optional
+        If specified - finite source delay model (Engset) is used instead of Erlang C,
+        for example for internal help desk of `sources` employees. calls_per_hour is
+        then rate of calls when all sources are idle: sources * calls of one idle source.
+        Can't be used with lazy.
 
     Returns
     -------
-    StaffingData
+    StaffingData or LazyStaffingData
         Result of calculations.
     """
     t_intensity = calc_traffic_intensity(calls_per_hour, aht, time_unit)
+    if sources is not None:
+        if lazy:
+            raise ValueError("Lazy results are not supported for finite sources")
+        return __staffing_finite_source(
+            t_intensity,
+            sources,
+            agents,
+            max_occupancy,
+            aht,
+            target_answer_time,
+            target_service_level,
+            shrinkage,
+            search,
+        )
     agents_occupancy = agents_to_meet_occupancy(t_intensity, max_occupancy)
 
     if agents:
+        if lazy:
+            return LazyStaffingData(t_intensity, agents, aht, target_answer_time, shrinkage)
         return __calc_all(agents, t_intensity, aht, target_answer_time, shrinkage)
 
     min_agents = max(int(t_intensity), agents_occupancy)
-    # 10000 just to avoid using while.
-    for i in range(10000):
-        agents = i + min_agents
-        result = __calc_all(agents, t_intensity, aht, target_answer_time, shrinkage)
-        if result.service_level >= target_service_level:
-            return result
-    raise OverflowError(f"Staffing Error: reached maximum number of agents {agents}")
+    iterator = ErlangIterator(t_intensity)
+    stats = SearchStats(search)
+    agents = __SEARCHES[search](
+        iterator, min_agents, aht, target_answer_time, target_service_level, stats
+    )
+    if stats.seed is not None:
+        stats.seed_error = agents - stats.seed
+    # Iterator may hold recurrence or erlang_b_stable() value depending on the search,
+    # so result is calculated once more in O(sqrt(N)) to be the same for all methods.
+    wait_probability = erlang_c_stable(t_intensity, agents)
+    if lazy:
+        return LazyStaffingData(
+            t_intensity, agents, aht, target_answer_time, shrinkage, wait_probability, stats
+        )
+    result = __calc_all(agents, t_intensity, aht, target_answer_time, shrinkage, wait_probability)
+    result.search_stats = stats
+    return result
+
+
+def calc_staffing_chat(
+    chats_per_hour: float,
+    aht: float,
+    max_concurrency: int = 3,
+    aht_inflation: Optional[Iterable[float]] = None,
+    max_occupancy: float = 0.85,
+    target_answer_time: float = 20,
+    target_service_level: float = 0.80,
+    shrinkage: Optional[float] = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+    search: SearchMethod = SearchMethod.LINEAR,
+) -> ChatStaffingData:
+    """
+    Staffing calculations for chats, where each agent handles several chats at once.
+
+    Agent with concurrency c is a pool of c slots, and each chat takes longer when agent
+    handles more of them: effective AHT is aht * aht_inflation[c - 1]. For each concurrency
+    from 1 to max_concurrency the lowest number of slots is found by calc_staffing() with
+    effective AHT, so chat queues use the same incremental Erlang search as voice.
+    Concurrency which needs the fewest agents is returned, the lower one on ties.
+    All slots are assumed to work at the same concurrency.
+
+    Parameters
+    ----------
+    chats_per_hour : float
+        Number of chats offered per hour.
+    aht : float
+        Average Handling Time of one chat when agent handles only it. Default unit is seconds.
+    max_concurrency : int, default=3
+        The highest number of chats one agent can handle at once.
+    aht_inflation : Iterable[float], optional
+        Multipliers of AHT for concurrency 1, 2, ..., max_concurrency.
+        If not specified - AHT doesn't depend on concurrency.
+    max_occupancy : float, default=0.85
+        The highest allowed occupancy of slots.
+    target_answer_time : float, default=20
+        Target time of answer to incoming chat. Should have same time unit as aht.
+    target_service_level : float, default=0.80 (80%).
+        Percentage of chats that should be answered in target_answer_time.
+    shrinkage : float, optional
+        Percentage of time agents are paid for but don't answer for chats.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+    search : SearchMethod, default = SearchMethod.LINEAR
+        Algorithm used to find number of slots. All methods give the same result.
+
+    Returns
+    -------
+    ChatStaffingData
+        Result of calculations, agents are people, not slots.
+
+    Examples
+    --------
+    >>> result = calc_staffing_chat(1000, 300, aht_inflation=(1, 1.2, 1.5))
+    >>> result.agents, result.concurrency, result.slots
+    (50, 3, 150)
+    """
+    inflation = [1.0] * max_concurrency if aht_inflation is None else list(aht_inflation)
+    if max_concurrency < 1 or len(inflation) < max_concurrency:
+        raise ValueError(
+            f"AHT inflation should be specified for concurrency 1-{max_concurrency}, "
+            f"got {len(inflation)} values"
+        )
+    best: Optional[Tuple[int, int, StaffingData]] = None
+    for concurrency in range(1, max_concurrency + 1):
+        effective_aht = aht * inflation[concurrency - 1]
+        slots = calc_staffing(
+            chats_per_hour,
+            effective_aht,
+            max_occupancy=max_occupancy,
+            target_answer_time=target_answer_time,
+            target_service_level=target_service_level,
+            time_unit=time_unit,
+            search=search,
+        )
+        agents = math.ceil(slots.agents / concurrency)
+        if best is None or agents < best[0]:
+            best = (agents, concurrency, slots)
+
+    agents, concurrency, slots = best
+    effective_aht = aht * inflation[concurrency - 1]
+    # Agents are rounded up, so there may be more slots than the search found.
+    result = __calc_all(
+        agents * concurrency, slots.traffic_intensity, effective_aht, target_answer_time
+    )
+    return ChatStaffingData(
+        traffic_intensity=result.traffic_intensity,
+        wait_probability=result.wait_probability,
+        immediate_answer=result.immediate_answer,
+        service_level=result.service_level,
+        average_speed_of_answer=result.average_speed_of_answer,
+        occupancy=result.occupancy,
+        agents=agents,
+        agents_with_shrinkage=add_shrinkage(agents, shrinkage) if shrinkage else None,
+        search_stats=slots.search_stats,
+        concurrency=concurrency,
+        slots=agents * concurrency,
+        effective_aht=effective_aht,
+    )
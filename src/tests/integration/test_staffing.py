@@ -2,12 +2,34 @@
 Integration tests for staffing.py module.
 """
 
+import math
 
-from src.staffing import __find_min_max_agents, calc_staffing
+import pytest
+
+from src.erlang import EngsetIterator
+from src.staffing import (
+    NO_SHRINKAGE,
+    LazyStaffingData,
+    SearchMethod,
+    TimeUnit,
+    __find_min_max_agents,
+    calc_agents_continuous,
+    calc_service_level_continuous,
+    calc_staffing,
+    calc_staffing_batch,
+    calc_staffing_chat,
+    calc_staffing_curve,
+    calc_staffing_sequence,
+    max_aht_for_agents,
+    max_calls_for_agents,
+)
 
 
 def test___find_min_max_agents():
     assert __find_min_max_agents(8, 300, 20, 0.8) == (8, 16)
+    assert __find_min_max_agents(0.5, 300, 20, 0.8) == (1, 2)
+    assert __find_min_max_agents(2000, 300, 20, 0.8) == (1024, 2026)
+    assert __find_min_max_agents(2000, 300, 20, 0.99) == (1024, 2048)
 
 
 def test_calc_staffing():
@@ -49,3 +71,306 @@ def test_calc_staffing_with_agents():
     assert round(result.average_speed_of_answer, 2) == 50.15
     assert round(result.occupancy, 2) == 0.95
     assert result.agents_with_shrinkage == 50
+
+
+@pytest.mark.parametrize("calls_per_hour", [1, 10, 100, 1000, 5000, 24000])
+@pytest.mark.parametrize("target_service_level", [0.5, 0.8, 0.95, 0.999])
+@pytest.mark.parametrize("max_occupancy", [0.85, 1])
+def test_calc_staffing_search_methods(calls_per_hour, target_service_level, max_occupancy):
+    kwargs = {
+        "calls_per_hour": calls_per_hour,
+        "aht": 300,
+        "max_occupancy": max_occupancy,
+        "target_service_level": target_service_level,
+    }
+    linear = calc_staffing(**kwargs)
+    bisection = calc_staffing(**kwargs, search=SearchMethod.BISECTION)
+    seed = calc_staffing(**kwargs, search=SearchMethod.SEED)
+    newton = calc_staffing(**kwargs, search=SearchMethod.NEWTON)
+    assert bisection == linear
+    assert seed == linear
+    assert newton == linear
+    assert seed.search_stats.seed_error == seed.agents - seed.search_stats.seed
+
+
+def test_calc_staffing_search_methods_full_service_level():
+    results = [
+        calc_staffing(1000, 120, target_service_level=1, search=search) for search in SearchMethod
+    ]
+    assert [result.agents for result in results] == [84] * len(results)
+
+
+def test_calc_staffing_search_stats():
+    kwargs = {"calls_per_hour": 24000, "aht": 300, "max_occupancy": 1}
+    linear = calc_staffing(**kwargs)
+    bisection = calc_staffing(**kwargs, search=SearchMethod.BISECTION)
+    seed = calc_staffing(**kwargs, search=SearchMethod.SEED)
+
+    assert linear.agents == 2017
+    assert linear.search_stats.method == SearchMethod.LINEAR
+    assert linear.search_stats.evaluations == 18
+    assert bisection.search_stats.evaluations == 6
+    assert linear.search_stats.steps == 2017
+    assert bisection.search_stats.steps <= 2048
+    assert seed.search_stats.evaluations == 2
+    assert seed.search_stats.steps <= 2
+    assert seed.search_stats.seed_error == 0
+    assert calc_staffing(**kwargs, agents=2017).search_stats is None
+
+
+def test_staffing_data_copy():
+    result = calc_staffing(1000, 120, search=SearchMethod.SEED)
+    copy = result.copy()
+    assert copy == result and copy.search_stats == result.search_stats
+    copy.search_stats.evaluations += 1
+    assert copy.search_stats != result.search_stats
+    assert calc_staffing(1000, 120, agents=40).copy().search_stats is None
+
+
+@pytest.mark.parametrize("t_intensity", [0.5, 8, 100, 2000])
+@pytest.mark.parametrize("target_answer_time", [0, 20])
+def test_calc_agents_continuous(t_intensity, target_answer_time):
+    agents = calc_agents_continuous(t_intensity, 300, target_answer_time, 0.8)
+    service_level, _ = calc_service_level_continuous(t_intensity, agents, 300, target_answer_time)
+    assert service_level == pytest.approx(0.8, abs=1e-6)
+    exact = calc_staffing(
+        calls_per_hour=t_intensity * 12,
+        aht=300,
+        max_occupancy=1,
+        target_answer_time=target_answer_time,
+    )
+    assert math.ceil(agents) == exact.agents
+
+
+def test_calc_agents_continuous_targets():
+    agents = calc_agents_continuous(100, 300, 20, 0.8)
+    assert calc_agents_continuous(100, 300, 20, 0.8, max_occupancy=0.85) == 100 / 0.85
+    assert calc_agents_continuous(100, 300, 20, 0.8, target_asa=5) > agents
+    assert calc_agents_continuous(100, 300, 20, 0.8, target_asa=100) == agents
+    with pytest.raises(ValueError):
+        calc_agents_continuous(100, 300, 20, 1)
+
+
+def test_calc_staffing_curve():
+    curve = calc_staffing_curve(1000, 120, range(0, 201), shrinkage=0.3)
+
+    assert len(curve) == 201
+    assert list(curve.agents) == list(range(0, 201))
+    for agents in range(34, 201):
+        expected = calc_staffing(calls_per_hour=1000, aht=120, agents=agents, shrinkage=0.3)
+        assert curve.traffic_intensity[agents] == expected.traffic_intensity
+        assert curve.wait_probability[agents] == pytest.approx(expected.wait_probability)
+        assert curve.immediate_answer[agents] == pytest.approx(expected.immediate_answer)
+        assert curve.service_level[agents] == pytest.approx(expected.service_level)
+        assert curve.average_speed_of_answer[agents] == pytest.approx(
+            expected.average_speed_of_answer
+        )
+        assert curve.occupancy[agents] == expected.occupancy
+        assert curve.agents_with_shrinkage[agents] == expected.agents_with_shrinkage
+
+
+def test_calc_staffing_curve_unstable():
+    curve = calc_staffing_curve(1000, 120, [0, 33, 40])
+
+    assert list(curve.wait_probability[:2]) == [1, 1]
+    assert list(curve.service_level[:2]) == [0, 0]
+    assert list(curve.average_speed_of_answer[:2]) == [math.inf, math.inf]
+    assert list(curve.occupancy[:2]) == [1, 1]
+    assert list(curve.agents_with_shrinkage) == [NO_SHRINKAGE] * 3
+    assert curve[0].agents_with_shrinkage is None
+
+
+def test_calc_staffing_batch():
+    calls = [1, 100, 1000, 1000, 1000, 5000, 24000, 1000]
+    aht = [300, 300, 120, 120, 120, 180, 300, 2]
+    agents = [None, None, None, 35, 0, None, None, None]
+    targets = [0.8, 0.95, 0.8, 0.8, 0.5, 0.999, 0.8, 0.8]
+    batch = calc_staffing_batch(
+        calls, aht, agents, target_service_level=targets, shrinkage=0.3, time_unit=TimeUnit.SEC
+    )
+
+    assert len(batch) == len(calls)
+    for i, row in enumerate(zip(calls, aht, agents, targets)):
+        expected = calc_staffing(*row[:3], target_service_level=row[3], shrinkage=0.3)
+        assert batch.traffic_intensity[i] == expected.traffic_intensity
+        assert batch.agents[i] == expected.agents
+        assert batch.wait_probability[i] == pytest.approx(expected.wait_probability)
+        assert batch.service_level[i] == pytest.approx(expected.service_level)
+        assert batch.average_speed_of_answer[i] == pytest.approx(expected.average_speed_of_answer)
+        assert batch.occupancy[i] == expected.occupancy
+        assert batch.agents_with_shrinkage[i] == expected.agents_with_shrinkage
+
+
+def test_calc_staffing_batch_rows_match_calc_staffing():
+    calls = [10 + i * 37 % 3000 for i in range(200)]
+    aht = [60 + i * 13 % 300 for i in range(200)]
+    agents = [None if i % 4 else 400 + i for i in range(200)]
+    shrinkage = [None if i % 3 else 0.3 for i in range(200)]
+    batch = calc_staffing_batch(calls, aht, agents, shrinkage=shrinkage)
+
+    for i, row in enumerate(zip(calls, aht, agents, shrinkage)):
+        expected = calc_staffing(*row[:3], shrinkage=row[3])
+        assert batch[i].to_staffing_data() == expected
+
+
+def test_calc_staffing_batch_broadcast():
+    batch = calc_staffing_batch([1000, 1000], 2, agents=[None, 30], time_unit=TimeUnit.MIN)
+
+    assert list(batch.agents) == [40, 30]
+    assert list(batch.service_level)[1] == 0
+    assert list(batch.average_speed_of_answer)[1] == math.inf
+    with pytest.raises(ValueError):
+        calc_staffing_batch([1000, 1000], [120, 120, 120])
+
+
+@pytest.mark.parametrize("max_occupancy", [0.85, 1])
+def test_calc_staffing_sequence(max_occupancy):
+    calls = [200 + 800 * (1 - math.cos(i / 96 * 2 * math.pi)) + i * 37 % 23 for i in range(96)]
+    aht = [180 + i % 5 for i in range(96)]
+    sequence = list(calc_staffing_sequence(calls, aht, max_occupancy, shrinkage=0.3))
+    expected = [
+        calc_staffing(row_calls, row_aht, max_occupancy=max_occupancy, shrinkage=0.3)
+        for row_calls, row_aht in zip(calls, aht)
+    ]
+
+    assert sequence == expected
+    assert max(result.search_stats.evaluations for result in sequence[1:]) <= 4
+
+
+def test_calc_staffing_sequence_occupancy_bound():
+    calls = [20000 - 50 * i for i in range(101)]
+    sequence = list(calc_staffing_sequence(calls, 300))
+
+    assert sequence == [calc_staffing(row_calls, 300) for row_calls in calls]
+    assert [result.search_stats.evaluations for result in sequence[1:]] == [1] * 100
+
+
+def test_calc_staffing_sequence_scalar_aht():
+    sequence = calc_staffing_sequence(iter([1000, 1100, 1050]), 120)
+    assert [result.agents for result in sequence] == [40, 44, 42]
+
+
+@pytest.mark.parametrize("agents", [None, 35])
+@pytest.mark.parametrize("shrinkage", [None, 0.3])
+def test_calc_staffing_lazy(agents, shrinkage):
+    kwargs = {"calls_per_hour": 1000, "aht": 120, "agents": agents, "shrinkage": shrinkage}
+    lazy = calc_staffing(**kwargs, lazy=True)
+    expected = calc_staffing(**kwargs)
+
+    assert isinstance(lazy, LazyStaffingData)
+    assert lazy == expected
+    assert lazy.to_staffing_data().search_stats == expected.search_stats
+    for name in ("service_level", "average_speed_of_answer", "agents_with_shrinkage"):
+        assert getattr(lazy, name) == getattr(expected, name)
+    with pytest.raises(AttributeError):
+        lazy.comment = "no __dict__"  # pylint: disable=attribute-defined-outside-init
+
+
+def test_lazy_staffing_data_calculates_on_access():
+    lazy = LazyStaffingData(100, 110, 300, 20)
+    assert lazy.occupancy == pytest.approx(100 / 110)
+    assert lazy._wait_probability is None  # pylint: disable=protected-access
+    assert lazy.immediate_answer == pytest.approx(1 - lazy.wait_probability)
+    assert lazy._wait_probability is not None  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("agents", [1, 10, 45, 500])
+@pytest.mark.parametrize("target_service_level", [0.5, 0.8, 0.95])
+def test_max_calls_for_agents(agents, target_service_level):
+    calls = max_calls_for_agents(agents, 120, target_service_level=target_service_level)
+    assert calc_staffing(calls, 120, agents=agents).service_level >= target_service_level
+    above = calc_staffing(calls * (1 + 1e-8), 120, agents=agents)
+    assert above.service_level < target_service_level
+    assert (
+        calc_staffing(calls, 120, target_service_level=target_service_level, max_occupancy=1).agents
+        == agents
+    )
+
+
+def test_max_calls_for_agents_limits():
+    assert max_calls_for_agents(45, 120, max_occupancy=0.85) == pytest.approx(45 * 0.85 * 30)
+    assert max_calls_for_agents(0, 120) == 0
+    assert max_calls_for_agents(45, 120, target_service_level=1) == 0
+    assert max_calls_for_agents(45, 2, target_answer_time=1 / 3, time_unit=TimeUnit.MIN) == (
+        pytest.approx(max_calls_for_agents(45, 120))
+    )
+
+
+@pytest.mark.parametrize("calls_per_hour", [10, 1000, 20000])
+@pytest.mark.parametrize("max_occupancy", [None, 0.85])
+def test_max_aht_for_agents(calls_per_hour, max_occupancy):
+    agents = calc_staffing(calls_per_hour, 180).agents
+    aht = max_aht_for_agents(calls_per_hour, agents, max_occupancy=max_occupancy)
+    kwargs = {"max_occupancy": max_occupancy or 1, "target_service_level": 0.8}
+    assert calc_staffing(calls_per_hour, aht, **kwargs).agents == agents
+    assert calc_staffing(calls_per_hour, aht * (1 + 1e-8), **kwargs).agents > agents
+    assert aht >= 180
+
+
+def test_max_aht_for_agents_limits():
+    assert max_aht_for_agents(1000, 45, max_occupancy=0.85) == pytest.approx(137.7)
+    assert max_aht_for_agents(0, 45) == math.inf
+    assert max_aht_for_agents(1000, 0) == 0
+    assert max_aht_for_agents(1000, 45, target_service_level=1) == 0
+
+
+@pytest.mark.parametrize(
+    "calls_per_hour, aht, sources, max_occupancy",
+    [(360, 300, 300, 0.85), (1000, 120, 300, 1), (3600, 300, 60, 0.85), (50, 600, 40, 0.85)],
+)
+def test_calc_staffing_finite_sources(calls_per_hour, aht, sources, max_occupancy):
+    results = [
+        calc_staffing(
+            calls_per_hour, aht, max_occupancy=max_occupancy, sources=sources, search=search
+        )
+        for search in SearchMethod
+    ]
+    agents = results[0].agents
+    assert {result.agents for result in results} == {agents}
+    assert agents < calc_staffing(calls_per_hour, aht, max_occupancy=max_occupancy).agents
+
+    iterator = EngsetIterator(results[0].traffic_intensity, sources)
+    for number in (agents - 1, agents):
+        iterator.advance(number)
+        meets_targets = (
+            iterator.service_level(20, aht) >= 0.8 and iterator.occupancy <= max_occupancy
+        )
+        assert meets_targets == (number == agents)
+    assert results[0].service_level == iterator.service_level(20, aht)
+
+
+def test_calc_staffing_finite_sources_with_agents():
+    result = calc_staffing(360, 300, agents=30, shrinkage=0.3, sources=300)
+    iterator = EngsetIterator(30, 300, 30)
+    assert result.agents == 30 and result.agents_with_shrinkage == 43
+    assert result.wait_probability == iterator.wait_probability
+    assert result.average_speed_of_answer == iterator.average_speed_of_answer(300)
+    assert result.occupancy == iterator.occupancy
+    with pytest.raises(ValueError):
+        calc_staffing(360, 300, sources=300, lazy=True)
+
+
+@pytest.mark.parametrize(
+    "aht_inflation, expected_concurrency",
+    [(None, 3), ((1, 1.2, 1.5), 3), ((1, 1.9, 3.2), 2), ((1, 2.5, 4), 1)],
+)
+def test_calc_staffing_chat(aht_inflation, expected_concurrency):
+    result = calc_staffing_chat(1000, 300, aht_inflation=aht_inflation, shrinkage=0.3)
+    assert result.concurrency == expected_concurrency
+    assert result.slots == result.agents * result.concurrency
+    assert result.service_level >= 0.8 and result.occupancy <= 0.85
+    assert result.agents_with_shrinkage == math.ceil(result.agents / 0.7)
+
+    inflation = aht_inflation or (1, 1, 1)
+    for concurrency in (1, 2, 3):
+        effective_aht = 300 * inflation[concurrency - 1]
+        slots = calc_staffing(1000, effective_aht).agents
+        assert result.agents <= math.ceil(slots / concurrency)
+
+
+def test_calc_staffing_chat_single_concurrency():
+    result = calc_staffing_chat(1000, 300, max_concurrency=1)
+    voice = calc_staffing(1000, 300)
+    assert (result.agents, result.service_level) == (voice.agents, voice.service_level)
+    with pytest.raises(ValueError):
+        calc_staffing_chat(1000, 300, max_concurrency=3, aht_inflation=(1, 1.2))
@@ -0,0 +1,112 @@
+"""
+Unit tests for aio.py module.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import aio
+from src.aio import acalc_staffing, acalc_staffing_batch
+from src.staffing import calc_staffing, calc_staffing_batch
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    Thread pool which counts submitted calculations.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_acalc_staffing():
+    async def run():
+        return await acalc_staffing(1000, 120, shrinkage=0.3)
+
+    assert asyncio.run(run()) == calc_staffing(1000, 120, shrinkage=0.3)
+
+
+def test_acalc_staffing_sources():
+    async def run():
+        return await asyncio.gather(acalc_staffing(360, 300, sources=300), acalc_staffing(360, 300))
+
+    finite, infinite = asyncio.run(run())
+    assert finite == calc_staffing(360, 300, sources=300)
+    assert infinite == calc_staffing(360, 300)
+
+
+def test_acalc_staffing_merges_in_flight_requests():
+    executor = CountingExecutor()
+
+    async def run():
+        requests = [acalc_staffing(1000, 120, executor=executor) for _ in range(10)]
+        requests.append(acalc_staffing(1200, 120, executor=executor))
+        return await asyncio.gather(*requests)
+
+    results = asyncio.run(run())
+    executor.shutdown()
+    assert executor.submitted == 2
+    assert [result.agents for result in results] == [40] * 10 + [48]
+    assert results[0] is not results[1]
+    assert results[0].search_stats == results[1].search_stats
+    assert results[0].search_stats is not results[1].search_stats
+
+
+def test_acalc_staffing_batch():
+    executor = CountingExecutor()
+
+    async def run():
+        return await asyncio.gather(
+            acalc_staffing_batch([1000, 1200], 120, agents=[None, 35], executor=executor),
+            acalc_staffing_batch((1000, 1200), 120, agents=(None, 35), executor=executor),
+        )
+
+    first, second = asyncio.run(run())
+    executor.shutdown()
+    assert executor.submitted == 1
+    assert first == second == calc_staffing_batch([1000, 1200], 120, agents=[None, 35])
+    assert first.agents is not second.agents
+
+
+def test_acalc_staffing_batch_numpy_scalars():
+    np = pytest.importorskip("numpy")
+
+    async def run():
+        return await acalc_staffing_batch(np.array([1000, 1200]), np.int64(120))
+
+    assert asyncio.run(run()) == calc_staffing_batch([1000, 1200], 120)
+
+
+def test_acalc_staffing_timeout_and_cancel(monkeypatch):
+    release = threading.Event()
+
+    def slow_calc_staffing(*args, **kwargs):
+        release.wait(5)
+        return calc_staffing(*args, **kwargs)
+
+    monkeypatch.setattr(aio, "calc_staffing", slow_calc_staffing)
+
+    async def run():
+        waiting = asyncio.ensure_future(acalc_staffing(1000, 120))
+        cancelled = asyncio.ensure_future(acalc_staffing(1000, 120))
+        with pytest.raises(asyncio.TimeoutError):
+            await acalc_staffing(1000, 120, timeout=0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        start = time.perf_counter()
+        result = await waiting
+        assert time.perf_counter() - start < 5
+        assert cancelled.cancelled()
+        return result
+
+    assert asyncio.run(run()).agents == 40
@@ -0,0 +1,154 @@
+"""
+Unit tests for cache.py module.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from src.cache import CacheInfo, PersistentStaffingCache, StaffingCache
+from src.erlang import erlang_b, erlang_c
+from src.staffing import SearchMethod, TimeUnit, calc_staffing
+
+
+def test_erlang_cache():
+    cache = StaffingCache()
+    assert cache.erlang_c(123, 132) == erlang_c(123, 132)
+    assert cache.erlang_c(123, 132) == erlang_c(123, 132)
+    assert cache.erlang_b(123, 132) == erlang_b(123, 132)
+    assert cache.cache_info() == CacheInfo(hits=1, misses=2, maxsize=4096, currsize=2)
+    assert cache.cache_info().hit_rate == pytest.approx(1 / 3)
+
+
+def test_cache_eviction():
+    cache = StaffingCache(maxsize=2)
+    cache.erlang_c(10, 11)
+    cache.erlang_c(10, 12)
+    cache.erlang_c(10, 11)
+    cache.erlang_c(10, 13)
+    cache.erlang_c(10, 11)
+    assert cache.cache_info() == CacheInfo(hits=2, misses=3, maxsize=2, currsize=2)
+    cache.erlang_c(10, 12)
+    assert cache.cache_info().misses == 4
+
+
+def test_cache_clear():
+    cache = StaffingCache()
+    cache.erlang_c(10, 11)
+    cache.cache_clear()
+    assert cache.cache_info() == CacheInfo(hits=0, misses=0, maxsize=4096, currsize=0)
+    with pytest.raises(ValueError):
+        StaffingCache(maxsize=0)
+
+
+def test_cache_quantization():
+    cache = StaffingCache(intensity_quantum=0.5)
+    assert cache.quantize(10.3) == 10.5
+    assert cache.erlang_c(10.3, 12) == erlang_c(10.5, 12)
+    cache.erlang_c(10.6, 12)
+    assert cache.cache_info().hits == 1
+
+
+def test_calc_staffing_cache():
+    result = StaffingCache().calc_staffing(calls_per_hour=1000, aht=120, shrinkage=0.3)
+    assert result == calc_staffing(calls_per_hour=1000, aht=120, shrinkage=0.3)
+
+    cache = StaffingCache(intensity_quantum=0.01)
+    result = cache.calc_staffing(calls_per_hour=1000, aht=120, shrinkage=0.3)
+    assert result.traffic_intensity == pytest.approx(33.33)
+    result.agents = 0
+    result.search_stats.evaluations = 0
+    cached = cache.calc_staffing(calls_per_hour=1000.01, aht=120, shrinkage=0.3)
+    assert cached.agents == 40 and cached.search_stats.evaluations > 0
+    assert cache.cache_info().hits == 1
+
+
+def test_calc_staffing_cache_sources():
+    cache = StaffingCache(intensity_quantum=0.01)
+    result = cache.calc_staffing(calls_per_hour=360, aht=300, sources=300)
+    assert result == calc_staffing(calls_per_hour=360, aht=300, sources=300)
+    assert cache.calc_staffing(calls_per_hour=360, aht=300) != result
+    assert cache.cache_info().misses == 2
+
+
+def test_cache_threads():
+    cache = StaffingCache(maxsize=50)
+    inputs = [(100 + i % 100, 120) for i in range(2000)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda args: cache.calc_staffing(*args).agents, inputs))
+    assert results == [calc_staffing(*args).agents for args in inputs]
+    info = cache.cache_info()
+    assert info.hits + info.misses == 2000
+    assert info.currsize == 50
+
+
+def test_persistent_cache(tmp_path):
+    path = str(tmp_path / "staffing.sqlite")
+    requests = [
+        {"calls_per_hour": 100 + i % 700, "aht": 120, "shrinkage": 0.3} for i in range(1400)
+    ]
+    with PersistentStaffingCache(path) as cache:
+        results = cache.calc_staffing_many(requests)
+        assert cache.cache_info() == CacheInfo(hits=700, misses=700, maxsize=1000000, currsize=700)
+    assert results == [calc_staffing(**request) for request in requests]
+    assert results[700].search_stats is not results[0].search_stats
+
+    with PersistentStaffingCache(path) as cache:
+        result = cache.calc_staffing(150, 120, shrinkage=0.3, search=SearchMethod.SEED)
+        assert result == results[50]
+        assert cache.calc_staffing(150, 120, agents=0, shrinkage=0.3) == result
+        assert cache.cache_info().hits == 2
+        assert cache.calc_staffing(360, 300, sources=300) == calc_staffing(360, 300, sources=300)
+        assert (
+            cache.calc_staffing(360, 300).agents
+            != cache.calc_staffing(360, 300, sources=300).agents
+        )
+        cache.cache_clear()
+        assert cache.cache_info() == CacheInfo(hits=0, misses=0, maxsize=1000000, currsize=0)
+
+
+def test_persistent_cache_keys(tmp_path):
+    with PersistentStaffingCache(str(tmp_path / "staffing.sqlite")) as cache:
+        key = cache.make_key(1000, 120)
+        assert key == cache.make_key(1000.0, 120, agents=0, time_unit=TimeUnit.SEC)
+        assert key != cache.make_key(1000, 2, time_unit=TimeUnit.MIN)
+        assert key != cache.make_key(1000, 120, sources=300)
+        assert cache.get_many([key]) == {}
+        cache.put_many([(key, calc_staffing(1000, 120))])
+        assert cache.get_many([key, b"missing"]) == {key: calc_staffing(1000, 120)}
+        assert cache.calc_staffing(1000, 120, lazy=False) == calc_staffing(1000, 120)
+        with pytest.raises(ValueError, match="lazy"):
+            cache.calc_staffing(1000, 120, lazy=True)
+
+
+def test_persistent_cache_eviction(tmp_path):
+    with PersistentStaffingCache(str(tmp_path / "staffing.sqlite"), maxsize=10) as cache:
+        for calls in range(100, 130):
+            cache.calc_staffing(calls, 120)
+        assert cache.cache_info().currsize == 10
+        cache.calc_staffing(129, 120)
+        cache.calc_staffing(100, 120)
+        assert cache.cache_info().hits == 1
+        cache.put_many([(cache.make_key(129, 120), calc_staffing(129, 120))])
+        assert cache.cache_info().currsize == 10
+    with PersistentStaffingCache(str(tmp_path / "staffing.sqlite"), maxsize=5) as cache:
+        assert cache.cache_info().currsize == 10
+        cache.calc_staffing(200, 120)
+        assert cache.cache_info().currsize == 5
+    with pytest.raises(ValueError):
+        PersistentStaffingCache(str(tmp_path / "other.sqlite"), maxsize=0)
+
+
+def test_persistent_cache_processes(tmp_path):
+    path = str(tmp_path / "staffing.sqlite")
+    inputs = [[100 + i % 50 + j for i in range(200)] for j in range(4)]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(calc_agents_persistent, [path] * 4, inputs))
+    assert results == [[calc_staffing(calls, 120).agents for calls in row] for row in inputs]
+    with PersistentStaffingCache(path) as cache:
+        assert cache.cache_info().currsize == 53
+
+
+def calc_agents_persistent(path, calls_per_hour):
+    with PersistentStaffingCache(path) as cache:
+        return [cache.calc_staffing(calls, 120).agents for calls in calls_per_hour]
@@ -2,9 +2,24 @@
 Unit tests for erlang.py module.
 """
 
+import math
+
 import pytest
 
-from src.erlang import erlang_b, erlang_c
+from src.erlang import (
+    EngsetIterator,
+    ErlangIterator,
+    agents_for_blocking,
+    engset_b,
+    engset_c,
+    erlang_b,
+    erlang_b_derivative,
+    erlang_b_stable,
+    erlang_c,
+    erlang_c_derivative,
+    erlang_c_stable,
+    log_poisson_probability,
+)
 
 
 def test_erlang_b():
@@ -18,3 +33,210 @@ def test_erlang_b():
 def test_erlang_c(traffic_intensity, number_of_agents, expected):
     wait_probability = erlang_c(traffic_intensity, number_of_agents)
     assert round(wait_probability, 4) == expected
+
+
+@pytest.mark.parametrize(
+    "traffic_intensity, number_of_agents",
+    [(1, 1), (0.5, 3), (123, 132), (1000, 900), (12345, 12421)],
+)
+def test_erlang_iterator(traffic_intensity, number_of_agents):
+    iterator = ErlangIterator(traffic_intensity, number_of_agents)
+    assert iterator.agents == number_of_agents
+    assert iterator.wait_probability == pytest.approx(
+        erlang_c(traffic_intensity, number_of_agents), abs=1e-12
+    )
+    assert iterator.blocking_probability == pytest.approx(
+        erlang_b(traffic_intensity, number_of_agents), abs=1e-12
+    )
+
+
+def test_erlang_iterator_step():
+    iterator = ErlangIterator(123)
+    for agents in range(1, 140):
+        assert iterator.step() == agents
+        assert iterator.wait_probability == pytest.approx(erlang_c(123, agents), abs=1e-12)
+
+
+def test_erlang_iterator_advance_backwards():
+    iterator = ErlangIterator(123, 140)
+    iterator.advance(132)
+    assert iterator.agents == 132
+    assert iterator.wait_probability == ErlangIterator(123, 132).wait_probability
+    assert iterator.steps == 140
+    iterator.advance(141)
+    assert iterator.steps == 141
+
+
+def test_erlang_iterator_seek():
+    iterator = ErlangIterator(123)
+    iterator.seek(132)
+    assert iterator.steps == 0
+    assert iterator.blocking_probability == pytest.approx(erlang_b(123, 132), rel=1e-12)
+    assert iterator.step() == 133
+    assert iterator.wait_probability == pytest.approx(erlang_c(123, 133), rel=1e-12)
+    iterator.advance(128)
+    assert iterator.steps == 5
+    assert iterator.blocking_probability == pytest.approx(erlang_b(123, 128), rel=1e-12)
+    iterator.advance(100)
+    assert iterator.steps == 5
+    assert iterator.blocking_probability == pytest.approx(erlang_b(123, 100), rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    "traffic_intensity, number_of_agents", [(1, 1), (0.5, 3), (123, 132), (1000, 1100)]
+)
+def test_erlang_iterator_step_back(traffic_intensity, number_of_agents):
+    iterator = ErlangIterator(traffic_intensity)
+    iterator.seek(number_of_agents)
+    assert iterator.step_back() == number_of_agents - 1
+    assert iterator.blocking_probability == pytest.approx(
+        erlang_b(traffic_intensity, number_of_agents - 1), rel=1e-12
+    )
+    engset = EngsetIterator(30, 300)
+    engset.seek(40)
+    engset.step_back()
+    assert engset.blocking_probability == pytest.approx(engset_b(30, 39, 300), rel=1e-12)
+    with pytest.raises(ValueError):
+        ErlangIterator(1).step_back()
+
+
+def test_log_poisson_probability():
+    assert log_poisson_probability(123, 132) == pytest.approx(-3.682489678663288, rel=1e-14)
+    assert log_poisson_probability(2.5, 0) == -2.5
+    assert log_poisson_probability(0, 0) == 0
+
+
+@pytest.mark.parametrize(
+    "traffic_intensity, number_of_agents",
+    [(1, 1), (0.5, 3), (123, 132), (1000, 900), (12345, 12421), (30, 2)],
+)
+def test_erlang_stable_matches_recurrence(traffic_intensity, number_of_agents):
+    assert erlang_b_stable(traffic_intensity, number_of_agents) == pytest.approx(
+        erlang_b(traffic_intensity, number_of_agents), rel=1e-12
+    )
+    assert erlang_c_stable(traffic_intensity, number_of_agents) == pytest.approx(
+        erlang_c(traffic_intensity, number_of_agents), rel=1e-12
+    )
+
+
+@pytest.mark.parametrize(
+    "traffic_intensity, number_of_agents, expected",
+    [
+        (1e6, 1e6, 7.9746030685556101e-4),
+        (1e6, 999000, 1.52448076531365e-3),
+        (1e-6, 1, 9.9999900000099995e-7),
+        (1e-6, 1e6, 0),
+        (1e6, 1, 1e6 / (1e6 + 1)),
+        (1e20, 1, 1),
+        (0, 10, 0),
+        (10, 0, 1),
+    ],
+)
+def test_erlang_b_stable_extremes(traffic_intensity, number_of_agents, expected):
+    result = erlang_b_stable(traffic_intensity, number_of_agents)
+    assert result == pytest.approx(expected, rel=1e-12, abs=1e-300)
+
+
+def test_erlang_c_stable_extremes():
+    assert erlang_c_stable(1e6, 1e6) == 1
+    blocking = erlang_b_stable(1e6, 1001000)
+    expected = 1001000 * blocking / (1001000 - 1e6 * (1 - blocking))
+    assert erlang_c_stable(1e6, 1001000) == pytest.approx(expected, rel=1e-12)
+    assert erlang_c_stable(1e-6, 1e6) == 0
+
+
+@pytest.mark.parametrize(
+    "traffic_intensity, number_of_agents", [(0.5, 0.3), (2, 3.5), (123, 132), (1000, 1050.5)]
+)
+def test_erlang_derivatives(traffic_intensity, number_of_agents):
+    step = 1e-3
+    blocking = [erlang_b_stable(traffic_intensity, number_of_agents + s) for s in (-step, step)]
+    wait = [erlang_c_stable(traffic_intensity, number_of_agents + s) for s in (-step, step)]
+    assert erlang_b_derivative(traffic_intensity, number_of_agents) == pytest.approx(
+        (blocking[1] - blocking[0]) / (2 * step), rel=1e-5
+    )
+    if number_of_agents > traffic_intensity:
+        assert erlang_c_derivative(traffic_intensity, number_of_agents) == pytest.approx(
+            (wait[1] - wait[0]) / (2 * step), rel=1e-5
+        )
+
+
+def test_erlang_derivatives_limits():
+    assert erlang_c_derivative(123, 100) == 0
+    assert erlang_b_derivative(1e-6, 1e6) == 0
+    assert erlang_b_derivative(123, 132) == pytest.approx(-0.0032641251751063887, rel=1e-8)
+
+
+@pytest.mark.parametrize(
+    "traffic_intensity, target_blocking, expected",
+    [(340, 0.005, 373), (12.5, 0.005, 22), (12.5, 1, 0), (0.1, 0.01, 2)],
+)
+def test_agents_for_blocking(traffic_intensity, target_blocking, expected):
+    agents = agents_for_blocking(traffic_intensity, target_blocking)
+    assert agents == expected
+    assert erlang_b(traffic_intensity, agents) <= target_blocking
+    if agents:
+        assert erlang_b(traffic_intensity, agents - 1) > target_blocking
+
+
+def test_agents_for_blocking_wrong_target():
+    with pytest.raises(ValueError):
+        agents_for_blocking(10, 0)
+
+
+def finite_source_states(t_intensity, agents, sources):
+    """
+    Probabilities of states seen by caller, who sees sources - 1 other sources.
+    """
+    per_source = t_intensity / sources
+    weights = [1.0]
+    for n in range(1, sources):
+        weights.append(weights[-1] * (sources - n) * per_source / min(n, agents))
+    total = sum(weights)
+    return [weight / total for weight in weights]
+
+
+@pytest.mark.parametrize(
+    "traffic_intensity, number_of_agents, sources", [(30, 35, 300), (30, 28, 300), (5, 4, 20)]
+)
+def test_engset_brute_force(traffic_intensity, number_of_agents, sources):
+    per_source = traffic_intensity / sources
+    terms = [math.comb(sources - 1, i) * per_source**i for i in range(number_of_agents + 1)]
+    blocking = terms[-1] / sum(terms)
+    states = finite_source_states(traffic_intensity, number_of_agents, sources)
+    assert engset_b(traffic_intensity, number_of_agents, sources) == pytest.approx(blocking)
+    assert engset_c(traffic_intensity, number_of_agents, sources) == pytest.approx(
+        sum(states[number_of_agents:])
+    )
+
+    iterator = EngsetIterator(traffic_intensity, sources, number_of_agents)
+    queue = states[number_of_agents:]
+    wait = sum(p * (j + 1) / number_of_agents for j, p in enumerate(queue))
+    assert iterator.average_speed_of_answer(300) == pytest.approx(wait * 300)
+    answers = number_of_agents * 20 / 300
+    late, poisson, cumulative = 0.0, math.exp(-answers), 0.0
+    for j, probability in enumerate(queue):
+        cumulative += poisson
+        late += probability * cumulative
+        poisson *= answers / (j + 1)
+    assert iterator.service_level(20, 300) == pytest.approx(1 - late)
+
+
+def test_engset_limits():
+    assert engset_b(30, 35, 10**7) == pytest.approx(erlang_b(30, 35), rel=1e-4)
+    assert engset_c(30, 35, 10**7) == pytest.approx(erlang_c(30, 35), rel=1e-4)
+    assert engset_b(10, 20, 20) == engset_c(10, 20, 20) == 0
+    assert engset_c(2000, 1000, 100000) == pytest.approx(1)
+
+
+def test_engset_iterator():
+    iterator = EngsetIterator(30, 300)
+    iterator.advance(40)
+    blocking, wait_probability = iterator.blocking_probability, iterator.wait_probability
+    iterator.advance(35)
+    iterator.advance(40)
+    assert iterator.blocking_probability == blocking
+    assert iterator.wait_probability == wait_probability
+    assert 0 < iterator.occupancy < 30 / 40
+    with pytest.raises(ValueError):
+        EngsetIterator(30, 0)
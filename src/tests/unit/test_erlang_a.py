@@ -0,0 +1,84 @@
+"""
+Unit tests for erlang_a.py module.
+"""
+
+import pytest
+
+from src.erlang import erlang_c
+from src.erlang_a import calc_staffing_erlang_a, erlang_a
+from src.staffing import calc_staffing
+
+
+def brute_force(t_intensity, agents, gamma, states=2000):
+    """
+    Wait and abandonment probabilities from truncated birth-death chain.
+    """
+    weights = [1.0]
+    for n in range(1, states):
+        weights.append(weights[-1] * t_intensity / (min(n, agents) + max(0, n - agents) * gamma))
+    total = sum(weights)
+    waiting = sum(weights[agents:]) / total
+    abandoned = sum(w * (n - agents) * gamma for n, w in enumerate(weights) if n > agents)
+    return waiting, abandoned / total / t_intensity
+
+
+@pytest.mark.parametrize(
+    "t_intensity, agents, patience", [(10, 8, 60), (10, 12, 300), (100, 95, 120), (100, 110, 30)]
+)
+def test_erlang_a_brute_force(t_intensity, agents, patience):
+    result = erlang_a(t_intensity, agents, aht=120, patience=patience)
+    waiting, abandoned = brute_force(t_intensity, agents, 120 / patience)
+    assert result.wait_probability == pytest.approx(waiting, rel=1e-9)
+    assert result.abandonment_probability == pytest.approx(abandoned, rel=1e-9)
+    assert 0 < result.service_level < 1
+
+
+def test_erlang_a_long_patience():
+    result = erlang_a(100, 110, aht=120, patience=1e9)
+    assert result.wait_probability == pytest.approx(erlang_c(100, 110), rel=1e-6)
+    assert result.abandonment_probability < 1e-6
+
+
+def test_erlang_a_monotonic():
+    levels = [erlang_a(100, agents, 300, 120).service_level for agents in range(80, 120)]
+    assert levels == sorted(levels)
+
+
+def test_erlang_a_errors():
+    with pytest.raises(ValueError):
+        erlang_a(100, 0, 300, 120)
+    with pytest.raises(ValueError):
+        erlang_a(100, 100, 300, 0)
+
+
+@pytest.mark.parametrize(
+    "calls_per_hour, aht, patience", [(1000, 120, 60), (50, 300, 30), (24000, 300, 180)]
+)
+def test_calc_staffing_erlang_a(calls_per_hour, aht, patience):
+    result = calc_staffing_erlang_a(calls_per_hour, aht, patience)
+    assert result.service_level >= 0.8
+    previous = erlang_a(result.traffic_intensity, result.agents - 1, aht, patience)
+    assert previous.service_level < 0.8
+    assert result.agents < calc_staffing(calls_per_hour, aht, max_occupancy=1).agents
+
+
+def test_calc_staffing_erlang_a_targets():
+    result = calc_staffing_erlang_a(1000, 120, 60, target_service_level=0, max_abandonment=0.01)
+    assert result.abandonment_probability <= 0.01
+    previous = erlang_a(result.traffic_intensity, result.agents - 1, 120, 60)
+    assert previous.abandonment_probability > 0.01
+
+    result = calc_staffing_erlang_a(1000, 120, 60, max_occupancy=0.7)
+    assert result.occupancy <= 0.7
+    assert calc_staffing_erlang_a(0, 120, 60).agents == 0
+    assert (
+        calc_staffing_erlang_a(24000, 300, 1e6).agents
+        == calc_staffing(24000, 300, max_occupancy=1).agents
+    )
+
+
+def test_calc_staffing_erlang_a_errors():
+    with pytest.raises(ValueError):
+        calc_staffing_erlang_a(1000, 120, 60, target_service_level=1)
+    with pytest.raises(ValueError):
+        calc_staffing_erlang_a(1000, 120, 60, max_abandonment=0)
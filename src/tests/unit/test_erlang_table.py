@@ -0,0 +1,58 @@
+"""
+Unit tests for erlang_table.py module.
+"""
+
+import random
+
+import pytest
+
+from src.erlang import erlang_c
+from src.erlang_table import ErlangCTable, build_erlang_c_table
+
+
+@pytest.fixture(name="table_path", scope="module")
+def fixture_table_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("table") / "erlang_c.bin"
+    with open(path, "wb") as file:
+        build_erlang_c_table(file, max_intensity=100, root_step=0.05)
+    return str(path)
+
+
+def test_erlang_c_table_grid(table_path):
+    with ErlangCTable(table_path) as table:
+        assert table.rows == 201
+        assert table.max_intensity == pytest.approx(100)
+        for row in (1, 20, 150, 200):
+            intensity = table.row_intensity(row)
+            for agents in range(int(intensity) + 1, int(intensity) + 20):
+                assert table.lookup(intensity, agents) == pytest.approx(
+                    erlang_c(intensity, agents), abs=1e-12
+                )
+
+
+def test_erlang_c_table_interpolation(table_path):
+    random.seed(1)
+    with ErlangCTable(table_path) as table:
+        assert 0 < table.max_error < 0.002
+        for _ in range(1000):
+            intensity = random.uniform(0.1, 100)
+            agents = int(intensity) + random.randint(1, 30)
+            assert table.lookup(intensity, agents) == pytest.approx(
+                erlang_c(intensity, agents), abs=table.max_error
+            )
+
+
+def test_erlang_c_table_fallback(table_path):
+    with ErlangCTable(table_path) as table:
+        assert table.lookup(50, 40) == 1
+        assert table.lookup(150, 160) == pytest.approx(erlang_c(150, 160), rel=1e-12)
+        assert table.lookup(50.5, 51) == pytest.approx(erlang_c(50.5, 51), rel=1e-12)
+        assert table.lookup(50.5, 200) == table.lookup(150, 300) == 0
+        assert erlang_c(50.5, 200) < erlang_c(150, 300) < table.max_error
+
+
+def test_erlang_c_table_wrong_file(tmp_path):
+    path = tmp_path / "wrong.bin"
+    path.write_bytes(b"0" * 100)
+    with pytest.raises(ValueError):
+        ErlangCTable(str(path))
@@ -0,0 +1,110 @@
+"""
+Unit tests for finite_queue.py module.
+"""
+
+import math
+from itertools import islice
+
+import pytest
+
+from src.erlang import agents_for_blocking, erlang_b, erlang_c
+from src.finite_queue import calc_staffing_finite_queue, finite_queue, finite_queue_sequence
+from src.staffing import calc_service_level
+
+
+def brute_force(t_intensity, agents, queue_size):
+    """
+    Blocking and wait probabilities from all states of the model.
+    """
+    weights = [1.0]
+    for n in range(1, agents + queue_size + 1):
+        weights.append(weights[-1] * t_intensity / min(n, agents))
+    total = sum(weights)
+    return weights[-1] / total, sum(weights[agents:-1]) / total
+
+
+@pytest.mark.parametrize(
+    "t_intensity, agents, queue_size", [(10, 8, 5), (10, 12, 3), (50, 45, 20), (20, 25, 0)]
+)
+def test_finite_queue_brute_force(t_intensity, agents, queue_size):
+    result = finite_queue(t_intensity, agents, queue_size, aht=120)
+    blocking, waiting = brute_force(t_intensity, agents, queue_size)
+    assert result.blocking_probability == pytest.approx(blocking, rel=1e-12)
+    assert result.wait_probability == pytest.approx(waiting, rel=1e-12)
+    assert result.occupancy == pytest.approx(t_intensity * (1 - blocking) / agents)
+
+
+def test_finite_queue_limits():
+    assert finite_queue(100, 105, 0, 300).blocking_probability == pytest.approx(erlang_b(100, 105))
+    assert finite_queue(100, 105, 0, 300).service_level == pytest.approx(1 - erlang_b(100, 105))
+
+    result = finite_queue(100, 110, 2000, 300)
+    wait_probability = erlang_c(100, 110)
+    assert result.blocking_probability < 1e-15
+    assert result.wait_probability == pytest.approx(wait_probability, rel=1e-12)
+    expected = calc_service_level(100, 110, wait_probability, 20, 300)
+    assert result.service_level == pytest.approx(expected, rel=1e-12)
+
+
+def test_finite_queue_overloaded():
+    result = finite_queue(2000, 1000, 100000, 300)
+    assert result.blocking_probability == pytest.approx(0.5)
+    assert result.occupancy == pytest.approx(1)
+    assert all(not math.isnan(value) for value in vars(result).values())
+
+
+def test_finite_queue_sequence():
+    sizes = list(islice(finite_queue_sequence(100, 105, 300), 20))
+    assert [data.queue_size for data in sizes] == list(range(20))
+    assert sizes[7] == finite_queue(100, 105, 7, 300)
+    blocking = [data.blocking_probability for data in sizes]
+    assert blocking == sorted(blocking, reverse=True)
+
+
+def test_finite_queue_errors():
+    with pytest.raises(ValueError):
+        finite_queue(100, 0, 10, 300)
+    with pytest.raises(ValueError):
+        finite_queue(100, 105, -1, 300)
+
+
+def feasible(result, aht, max_blocking, target_service_level, queue_sizes):
+    sizes = finite_queue_sequence(result.traffic_intensity, result.agents, aht)
+    return any(
+        data.blocking_probability <= max_blocking and data.service_level >= target_service_level
+        for data in islice(sizes, queue_sizes)
+    )
+
+
+@pytest.mark.parametrize(
+    "calls_per_hour, aht, max_blocking, target_service_level",
+    [(1000, 120, 0.01, 0.8), (1000, 120, 0.05, 0.8), (24000, 300, 0.01, 0.8), (5, 300, 0.01, 0.8)],
+)
+def test_calc_staffing_finite_queue(calls_per_hour, aht, max_blocking, target_service_level):
+    result = calc_staffing_finite_queue(
+        calls_per_hour, aht, max_blocking, target_service_level=target_service_level
+    )
+    assert result.blocking_probability <= max_blocking
+    assert result.service_level >= target_service_level
+    assert not feasible(result, aht, max_blocking, target_service_level, result.queue_size)
+
+    fewer_agents = finite_queue(result.traffic_intensity, result.agents - 1, 0, aht)
+    assert not feasible(fewer_agents, aht, max_blocking, target_service_level, 5000)
+
+
+def test_calc_staffing_finite_queue_max_queue_size():
+    result = calc_staffing_finite_queue(100, 300, max_blocking=0.01, max_queue_size=0)
+    assert result.queue_size == 0
+    assert result.agents == agents_for_blocking(100 * 300 / 3600, 0.01)
+
+    result = calc_staffing_finite_queue(24000, 300, max_queue_size=3)
+    assert result.queue_size <= 3
+    assert result.agents > calc_staffing_finite_queue(24000, 300).agents
+
+
+def test_calc_staffing_finite_queue_errors():
+    assert calc_staffing_finite_queue(0, 120).agents == 0
+    with pytest.raises(ValueError):
+        calc_staffing_finite_queue(1000, 120, target_service_level=1)
+    with pytest.raises(ValueError):
+        calc_staffing_finite_queue(1000, 120, max_blocking=0)
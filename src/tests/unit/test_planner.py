@@ -0,0 +1,153 @@
+"""
+Unit tests for planner.py module.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+
+import pytest
+
+from src import planner
+from src.cache import StaffingCache
+from src.planner import (
+    PLAN_FIELDS,
+    IntervalForecast,
+    PlannerStats,
+    plan_csv,
+    plan_intervals,
+    plan_parallel,
+    read_forecast,
+    write_plan,
+)
+from src.staffing import TimeUnit, calc_staffing
+
+FORECAST = """queue,interval_start,calls,aht,comment
+sales,2024-01-01 09:00,250,120,
+sales,2024-01-01 09:15,300,120,peak
+support,2024-01-01 09:00,0,300,
+"""
+
+
+def test_read_forecast():
+    rows = list(read_forecast(io.StringIO(FORECAST)))
+    assert rows[1] == IntervalForecast("sales", "2024-01-01 09:15", 300.0, 120.0)
+    assert len(rows) == 3
+
+
+def test_plan_intervals():
+    forecast = read_forecast(io.StringIO(FORECAST))
+    plan = list(plan_intervals(forecast, interval=0.25, interval_unit=TimeUnit.HOUR, shrinkage=0.3))
+    assert [row.calls_per_hour for row in plan] == [1000, 1200, 0]
+    assert plan[0].staffing == calc_staffing(1000, 120, shrinkage=0.3)
+    assert plan[1].staffing == calc_staffing(1200, 120, shrinkage=0.3)
+
+
+def test_plan_intervals_cache():
+    cache = StaffingCache()
+    forecast = [IntervalForecast("sales", str(i), 250, 120) for i in range(10)]
+    plan = list(plan_intervals(forecast, cache=cache))
+    assert {row.staffing.agents for row in plan} == {40}
+    assert cache.cache_info().hits == 9
+
+
+def test_write_plan():
+    reports = []
+    plan = plan_intervals(read_forecast(io.StringIO(FORECAST)))
+    output = io.StringIO()
+    stats = write_plan(plan, output, progress=reports.append, report_every=2)
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+
+    assert stats.rows == 3
+    assert stats.rows_per_second > 0
+    assert len(reports) == 1
+    assert tuple(rows[0]) == PLAN_FIELDS
+    assert rows[0]["agents"] == "40"
+    assert rows[0]["agents_with_shrinkage"] == ""
+    assert rows[2]["queue"] == "support"
+
+
+def test_plan_csv(tmp_path):
+    forecast_path, plan_path = tmp_path / "forecast.csv", tmp_path / "plan.csv"
+    forecast_path.write_text(FORECAST, encoding="utf-8")
+    stats = plan_csv(str(forecast_path), str(plan_path), shrinkage=0.3)
+
+    with open(plan_path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert stats.rows == len(rows) == 3
+    assert [row["agents_with_shrinkage"] for row in rows[:2]] == ["58", "69"]
+
+
+def test_plan_parallel():
+    forecast = [
+        IntervalForecast(f"queue{i % 7}", str(i), 10 + i % 50 * 30, 60 + i % 11 * 30)
+        for i in range(300)
+    ]
+    plan = list(plan_parallel(forecast, max_workers=2, chunk_size=16, shrinkage=0.3))
+    expected = list(plan_intervals(forecast, shrinkage=0.3))
+    assert plan == expected
+
+
+def test_plan_parallel_errors():
+    forecast = [
+        IntervalForecast("sales", "09:00", 250, 120),
+        IntervalForecast("sales", "09:15", float("nan"), 120),
+        IntervalForecast("sales", "09:30", 300, 120),
+    ]
+    plan = list(plan_parallel(forecast, max_workers=1, chunk_size=2, cache_size=None))
+    assert [row.forecast.interval_start for row in plan] == ["09:00", "09:15", "09:30"]
+    assert plan[0].staffing.agents == 40 and plan[2].staffing.agents == 48
+    assert plan[1].staffing is None and plan[1].error.startswith("ValueError")
+
+    output = io.StringIO()
+    write_plan(plan, output)
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert rows[1]["agents"] == "" and rows[1]["error"] == plan[1].error
+
+
+PLAN_CHUNK = vars(planner)["__plan_chunk"]
+# Directory where crashing_plan_chunk() records workers, set by test.
+WORKER_LOG = ""
+
+
+def crashing_plan_chunk(chunk, *args):
+    """
+    Kill the first worker process which gets a chunk, solve chunks in the others.
+    """
+    try:
+        os.close(os.open(os.path.join(WORKER_LOG, "crashed"), os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        with open(os.path.join(WORKER_LOG, chunk[0].interval_start), "w", encoding="utf-8") as file:
+            file.write(str(os.getpid()))
+        return PLAN_CHUNK(chunk, *args)
+    os._exit(1)  # pylint: disable=protected-access
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="patched function is inherited by fork"
+)
+def test_plan_parallel_worker_crash(tmp_path, monkeypatch):
+    monkeypatch.setitem(globals(), "WORKER_LOG", str(tmp_path))
+    monkeypatch.setitem(vars(planner), "__plan_chunk", crashing_plan_chunk)
+    forecast = [IntervalForecast("sales", str(i), 100 + i, 120) for i in range(40)]
+
+    plan = list(plan_parallel(forecast, max_workers=2, chunk_size=4))
+    assert plan == list(plan_intervals(forecast))
+    assert (tmp_path / "crashed").exists()
+    pids = {}
+    for row in forecast[::4]:
+        with open(tmp_path / row.interval_start, encoding="utf-8") as file:
+            pids[row.interval_start] = int(file.read())
+    assert os.getpid() not in pids.values()
+
+
+def test_plan_parallel_raises_errors():
+    forecast = [IntervalForecast("sales", "09:00", 250, 120)]
+    with pytest.raises(TypeError):
+        list(plan_parallel(forecast, max_workers=1, unknown_parameter=1))
+
+
+def test_planner_stats():
+    assert PlannerStats().rows_per_second == 0
+    assert PlannerStats(rows=100, seconds=2).rows_per_second == 50
@@ -1,17 +1,30 @@
 """
 Unit tests for staffing.py module.
 """
+import math
+
 import pytest
 
+from src.erlang import erlang_c
 from src.staffing import (
+    NO_SHRINKAGE,
+    StaffingData,
+    StaffingRow,
+    StaffingTable,
     TimeUnit,
     add_shrinkage,
     agents_to_meet_occupancy,
     calc_average_speed_of_answer,
+    calc_average_speed_of_answer_continuous,
     calc_immediate_answer,
     calc_occupancy,
     calc_service_level,
+    calc_service_level_continuous,
     calc_traffic_intensity,
+    calc_wait_time_cdf,
+    calc_wait_time_quantiles,
+    estimate_agents,
+    max_agents_for_service_level,
 )
 
 
@@ -37,6 +50,25 @@ def test_calc_service_level():
     assert round(calc_service_level(123, 130, 0, 1, 300), 4) == 1
 
 
+def test_calc_wait_time_cdf():
+    cdf = calc_wait_time_cdf(123, 130, 300, [0, 20, 60], wait_probability=0.4244)
+    assert cdf == [calc_service_level(123, 130, 0.4244, time, 300) for time in (0, 20, 60)]
+    expected = calc_wait_time_cdf(123, 130, 300, [20], wait_probability=erlang_c(123, 130))
+    assert calc_wait_time_cdf(123, 130, 300, [20]) == pytest.approx(expected)
+    assert calc_wait_time_cdf(123, 120, 300, [0, 60]) == [0, 0]
+
+
+def test_calc_wait_time_quantiles():
+    probabilities = [0.5, 0.9, 0.99]
+    times = calc_wait_time_quantiles(123, 130, 300, probabilities, wait_probability=0.4244)
+    assert times[0] == 0
+    assert calc_wait_time_cdf(123, 130, 300, times[1:], 0.4244) == pytest.approx(probabilities[1:])
+    assert calc_wait_time_quantiles(123, 130, 300, [0, 1]) == [0, math.inf]
+    assert calc_wait_time_quantiles(123, 120, 300, [0, 0.5, 1]) == [0, math.inf, math.inf]
+    with pytest.raises(ValueError):
+        calc_wait_time_quantiles(123, 130, 300, [1.5])
+
+
 def test_occupancy():
     assert round(calc_occupancy(123, 130), 3) == 0.946
 
@@ -53,3 +85,101 @@ def test_calc_average_speed_of_answer():
 def test_add_shrinkage():
     assert add_shrinkage(10, 0.3) == 15
     assert add_shrinkage(11, 0.3) == 16
+
+
+def test_max_agents_for_service_level():
+    assert max_agents_for_service_level(100, 300, 20, 0.8) == 126
+    assert max_agents_for_service_level(100, 300, 20, 0) == 101
+    assert max_agents_for_service_level(100, 300, 0, 0.8) is None
+    assert max_agents_for_service_level(100, 300, 20, 1) is None
+
+
+@pytest.mark.parametrize(
+    "t_intensity, target_answer_time, target_service_level, expected",
+    [(0, 20, 0.8, 0), (100, 20, 0.8, 108), (100, 0, 0.8, 111), (2000, 20, 0.95, 2031)],
+)
+def test_estimate_agents(t_intensity, target_answer_time, target_service_level, expected):
+    assert estimate_agents(t_intensity, 300, target_answer_time, target_service_level) == expected
+
+
+def test_calc_service_level_continuous():
+    service_level, derivative = calc_service_level_continuous(123, 130, 300, 20)
+    assert service_level == pytest.approx(calc_service_level(123, 130, 0.42437, 20, 300), rel=1e-4)
+    assert derivative > 0
+    assert calc_service_level_continuous(123, 120.5, 300, 20) == (0, 0)
+
+
+def test_calc_average_speed_of_answer_continuous():
+    asa, derivative = calc_average_speed_of_answer_continuous(123, 130, 300)
+    assert asa == pytest.approx(calc_average_speed_of_answer(123, 130, 0.42437, 300), rel=1e-4)
+    assert derivative < 0
+
+
+def make_table():
+    table = StaffingTable()
+    table.append(10, 12, 0.45, 0.7, 15.1, shrinkage=0.3)
+    table.append(10, 13, 0.28, 0.85, 6.3)
+    table.append(10, 14, 0.16, 0.93, 2.9)
+    return table
+
+
+def test_staffing_table_rows():
+    table = make_table()
+    row = table[-2]
+
+    assert isinstance(row, StaffingRow)
+    assert row.agents == 13
+    assert row.immediate_answer == pytest.approx(0.72)
+    assert row.occupancy == pytest.approx(10 / 13)
+    assert table[0].agents_with_shrinkage == 18
+    assert [row.agents for row in table] == [12, 13, 14]
+    assert table[1] == table[-2]
+    assert row.to_staffing_data() == StaffingData(10, 0.28, 0.72, 0.85, 6.3, 10 / 13, 13, None)
+    with pytest.raises(IndexError):
+        table[3]  # pylint: disable=pointless-statement
+    with pytest.raises(AttributeError):
+        row.search_stats  # pylint: disable=pointless-statement
+
+
+def test_staffing_table_slice_and_columns():
+    table = make_table()
+    part = table[1:]
+
+    assert isinstance(part, StaffingTable)
+    assert list(part.agents) == [13, 14]
+    assert table.column("service_level") is table.service_level
+    with pytest.raises(KeyError):
+        table.column("search_stats")
+
+
+def test_staffing_table_from_results():
+    results = [
+        StaffingData(10, 0.28, 0.72, 0.85, 6.3, 10 / 13, 13, None),
+        StaffingData(10, 0.16, 0.84, 0.93, 2.9, 10 / 14, 14, 20),
+    ]
+    table = StaffingTable.from_results(results)
+    assert list(table.agents_with_shrinkage) == [NO_SHRINKAGE, 20]
+    for i, result in enumerate(results):
+        assert table[i].to_staffing_data() == result
+
+
+def test_staffing_table_to_numpy():
+    np = pytest.importorskip("numpy")
+    table = make_table()
+    columns = table.to_numpy()
+
+    assert columns["agents"].dtype == np.int64
+    assert columns["service_level"].tolist() == list(table.service_level)
+    table.service_level[0] = 0.5
+    assert columns["service_level"][0] != 0.5
+    table.append(10, 3_000_000_000, 0.0, 1.0, 0.0)
+    assert table.to_numpy()["agents"][-1] == 3_000_000_000
+
+    views = table.to_numpy(copy=False)
+    table.service_level[1] = 0.25
+    assert views["service_level"][1] == 0.25
+    with pytest.raises(BufferError):
+        table.append(10, 15, 0.09, 0.97, 1.2)
+    del views
+    table.append(10, 15, 0.09, 0.97, 1.2)
+    assert len(table) == 5
@@ -0,0 +1,125 @@
+"""
+Unit tests for vectorized.py module.
+"""
+
+import pytest
+
+from src.erlang import agents_for_blocking, engset_b, engset_c, erlang_b, erlang_c
+from src.staffing import (
+    calc_wait_time_cdf,
+    calc_wait_time_quantiles,
+    max_aht_for_agents,
+    max_calls_for_agents,
+)
+from src.vectorized import (
+    agents_for_blocking_array,
+    engset_b_array,
+    engset_c_array,
+    erlang_b_array,
+    erlang_c_array,
+    max_aht_for_agents_array,
+    max_calls_for_agents_array,
+    wait_time_cdf_array,
+    wait_time_quantiles_array,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def test_erlang_b_array():
+    intensities = np.array([0.5, 1, 123, 1000, 12345])
+    agents = np.array([3, 1, 132, 900, 12421])
+    expected = [erlang_b(a, n) for a, n in zip(intensities, agents)]
+    assert erlang_b_array(intensities, agents) == pytest.approx(expected, abs=1e-12)
+
+
+def test_erlang_c_array():
+    intensities = np.array([0.5, 1, 123, 1000, 12345])
+    agents = np.array([3, 1, 132, 900, 12421])
+    expected = [erlang_c(a, n) for a, n in zip(intensities, agents)]
+    assert erlang_c_array(intensities, agents) == pytest.approx(expected, abs=1e-12)
+
+
+def test_erlang_c_array_broadcasting():
+    result = erlang_c_array([[10], [20]], [5, 15, 25])
+    assert result.shape == (2, 3)
+    for i, intensity in enumerate([10, 20]):
+        for j, agents in enumerate([5, 15, 25]):
+            assert result[i, j] == pytest.approx(erlang_c(intensity, agents), abs=1e-12)
+
+
+def test_erlang_array_scalar_and_empty():
+    assert erlang_c_array(123, 132) == pytest.approx(erlang_c(123, 132), abs=1e-12)
+    assert erlang_b_array(123, 132) == pytest.approx(erlang_b(123, 132), abs=1e-12)
+    assert erlang_c_array([], []).shape == (0,)
+
+
+def test_agents_for_blocking_array():
+    intensities = np.array([[0.1, 12.5, 340], [1, 50, 1000]])
+    targets = np.array([0.001, 0.01, 0.05])
+    expected = [[agents_for_blocking(a, t) for a, t in zip(row, targets)] for row in intensities]
+    result = agents_for_blocking_array(intensities, targets)
+    assert result.shape == (2, 3)
+    assert result.tolist() == expected
+    assert agents_for_blocking_array(12.5, 1) == 0
+    with pytest.raises(ValueError):
+        agents_for_blocking_array([1, 2], [0.01, 0])
+
+
+def test_max_calls_for_agents_array():
+    agents = np.array([0, 1, 10, 45, 300])
+    targets = np.array([[0.8], [0.95]])
+    result = max_calls_for_agents_array(
+        agents, 180, target_service_level=targets, max_occupancy=0.9
+    )
+    expected = [
+        [max_calls_for_agents(n, 180, target_service_level=t, max_occupancy=0.9) for n in agents]
+        for t in targets[:, 0]
+    ]
+    assert result.shape == (2, 5)
+    assert result == pytest.approx(np.array(expected), rel=1e-8)
+    assert max_calls_for_agents_array(45, 120, target_service_level=1) == 0
+
+
+def test_max_aht_for_agents_array():
+    calls = np.array([0, 10, 1000, 1000, 6000])
+    agents = np.array([5, 2, 45, 0, 150])
+    result = max_aht_for_agents_array(calls, agents, max_occupancy=np.array([[1], [0.85]]))
+    expected = [
+        [max_aht_for_agents(c, n, max_occupancy=occupancy) for c, n in zip(calls, agents)]
+        for occupancy in (1, 0.85)
+    ]
+    assert result.shape == (2, 5)
+    assert result == pytest.approx(np.array(expected), rel=1e-8)
+    assert max_aht_for_agents_array(1000, 45, target_service_level=1) == 0
+
+
+def test_engset_arrays():
+    intensities = np.array([0.5, 5, 30, 30, 2000, 2000])
+    agents = np.array([3, 4, 28, 35, 1000, 2100])
+    sources = np.array([2, 20, 300, 300, 10000, 100000])
+    blocking = [engset_b(a, n, s) for a, n, s in zip(intensities, agents, sources)]
+    wait = [engset_c(a, n, s) for a, n, s in zip(intensities, agents, sources)]
+    assert engset_b_array(intensities, agents, sources) == pytest.approx(blocking, abs=1e-12)
+    assert engset_c_array(intensities, agents, sources) == pytest.approx(wait, abs=1e-12)
+
+    result = engset_c_array([[10], [20]], [5, 15, 25], 40)
+    assert result.shape == (2, 3)
+    assert result[1, 1] == pytest.approx(engset_c(20, 15, 40))
+    with pytest.raises(ValueError):
+        engset_b_array(10, 5, 0)
+
+
+def test_wait_time_arrays():
+    intensities, agents = np.array([123, 140, 0.5]), np.array([130, 120, 3])
+    times, probabilities = np.array([0, 20, 60]), np.array([0, 0.5, 0.9, 0.99, 1])
+    cdf = wait_time_cdf_array(intensities[:, None], agents[:, None], 300, times)
+    quantiles = wait_time_quantiles_array(intensities[:, None], agents[:, None], 300, probabilities)
+    assert cdf.shape == (3, 3) and quantiles.shape == (3, 5)
+    for i, (intensity, number) in enumerate(zip(intensities, agents)):
+        expected = calc_wait_time_quantiles(intensity, number, 300, probabilities)
+        assert cdf[i] == pytest.approx(calc_wait_time_cdf(intensity, number, 300, times))
+        assert quantiles[i] == pytest.approx(expected)
+    assert quantiles[1, 0] == 0 and np.isinf(quantiles[1, 1:]).all()
+    with pytest.raises(ValueError):
+        wait_time_quantiles_array(123, 130, 300, [-0.1])
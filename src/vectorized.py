@@ -0,0 +1,629 @@
+"""
+Module contains NumPy versions of Erlang formulas and solvers for arrays of inputs.
+
+NumPy is an optional dependency, install it with `pip install call_center_tools[numpy]`.
+"""
+
+from typing import Any, Callable, Tuple
+
+from .erlang import SCALE_LIMIT, STABLE_EPSILON
+from .staffing import TimeUnit
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def __require_numpy() -> None:
+    """
+    Raise ImportError if NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError(
+            "NumPy is required for vectorized calculations, "
+            "install it with `pip install call_center_tools[numpy]`"
+        )
+
+
+def __prepare(t_intensity: Any, agents: Any) -> Tuple[Any, Any, Any]:
+    """
+    Broadcast inputs and sort them by number of agents in descending order.
+
+    Recurrence for element with N agents needs N steps, so after sorting
+    elements which still need calculation are always at the beginning of array.
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs.
+    agents : array_like
+        Numbers of agents.
+
+    Returns
+    -------
+    Tuple[ndarray, ndarray, ndarray]
+        Sorted intensities, sorted agents and order of sorting.
+    """
+    intensity, agents = np.broadcast_arrays(
+        np.asarray(t_intensity, dtype=float), np.asarray(agents, dtype=np.int64)
+    )
+    order = np.argsort(-agents, axis=None, kind="stable")
+    return intensity.ravel()[order], agents.ravel()[order], order
+
+
+def __unsort(values: Any, order: Any, shape: Tuple[int, ...]) -> Any:
+    """
+    Restore original order and shape of calculated values.
+
+    Parameters
+    ----------
+    values : ndarray
+        Values in sorted order.
+    order : ndarray
+        Order returned by __prepare().
+    shape : Tuple[int, ...]
+        Shape of broadcasted inputs.
+
+    Returns
+    -------
+    ndarray
+        Values in original order and shape. Scalar if inputs were scalars.
+    """
+    result = np.empty_like(values)
+    result[order] = values
+    return result.reshape(shape)[()]
+
+
+def erlang_b_array(t_intensity: Any, agents: Any) -> Any:
+    """
+    Calculates blocking probability using Erlang B formula for arrays of inputs.
+
+    Inputs are broadcasted against each other. Uses the same recurrence as erlang_b(),
+    but each step is done for all elements at once, so there are max(agents) Python
+    iterations instead of sum(agents).
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs.
+    agents : array_like
+        Numbers of agents.
+
+    Returns
+    -------
+    ndarray
+        Probabilities of blocking. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> erlang_b_array([123, 12], [132, 15])
+    array([0.03124282, 0.08572925])
+    """
+    __require_numpy()
+    shape = np.broadcast_shapes(np.shape(t_intensity), np.shape(agents))
+    intensity, agents, order = __prepare(t_intensity, agents)
+    result = np.ones(intensity.shape)
+    max_agents = int(agents[0]) if agents.size else 0
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        for i in range(1, max_agents + 1):
+            # Number of elements which need at least i steps.
+            active = np.searchsorted(-agents, -i, side="right")
+            result[:active] = 1 + result[:active] * i / intensity[:active]
+        result = 1 / result
+    return __unsort(result, order, shape)
+
+
+def erlang_c_array(t_intensity: Any, agents: Any) -> Any:
+    """
+    Calculates wait probability using Erlang C formula for arrays of inputs.
+
+    Inputs are broadcasted against each other. Uses the same algorithm as erlang_c(),
+    but each step is done for all elements at once, so there are max(agents) Python
+    iterations instead of sum(agents).
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs.
+    agents : array_like
+        Numbers of agents.
+
+    Returns
+    -------
+    ndarray
+        Probabilities that there is no available agents to answer the call.
+        Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> erlang_c_array([123, 12], [132, 15])
+    array([0.32111618, 0.31919043])
+    """
+    __require_numpy()
+    shape = np.broadcast_shapes(np.shape(t_intensity), np.shape(agents))
+    intensity, agents, order = __prepare(t_intensity, agents)
+    product = np.ones(intensity.shape)
+    total = np.zeros(intensity.shape)
+    max_agents = int(agents[0]) if agents.size else 0
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        for i in range(max_agents):
+            # Number of elements which need more than i steps.
+            active = np.searchsorted(-agents, -i, side="left")
+            product[:active] *= (agents[:active] - i) / intensity[:active]
+            total[:active] += product[:active]
+        result = 1 / (total * (agents - intensity) / agents + 1)
+    result = np.where(agents <= intensity, 1.0, np.minimum(result, 1.0))
+    return __unsort(result, order, shape)
+
+
+def __engset_blocking(intensity: Any, agents: Any, sources: Any) -> Any:
+    """
+    Calculate Engset blocking for flat arrays sorted by number of agents in descending order.
+
+    Parameters
+    ----------
+    intensity : ndarray
+        Traffic intensities in Erlangs when all sources are idle.
+    agents : ndarray
+        Numbers of agents, sorted in descending order.
+    sources : ndarray
+        Numbers of sources.
+
+    Returns
+    -------
+    ndarray
+        Probabilities of blocking.
+    """
+    per_source = intensity / sources
+    result = np.ones(intensity.shape)
+    max_agents = int(agents[0]) if agents.size else 0
+    for i in range(1, max_agents + 1):
+        # Number of elements which need at least i steps.
+        active = np.searchsorted(-agents, -i, side="right")
+        load = np.maximum(sources[:active] - i, 0) * per_source[:active] * result[:active]
+        result[:active] = load / (i + load)
+    return result
+
+
+def __prepare_sources(t_intensity: Any, agents: Any, sources: Any) -> Tuple[Any, ...]:
+    """
+    Broadcast inputs with sources and sort them by number of agents in descending order.
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs when all sources are idle.
+    agents : array_like
+        Numbers of agents.
+    sources : array_like
+        Numbers of sources. Should be positive.
+
+    Returns
+    -------
+    Tuple[ndarray, ndarray, ndarray, ndarray, Tuple[int, ...]]
+        Sorted intensities, agents and sources, order of sorting and shape of inputs.
+    """
+    intensity, agents, sources = np.broadcast_arrays(
+        np.asarray(t_intensity, dtype=float),
+        np.asarray(agents, dtype=np.int64),
+        np.asarray(sources, dtype=np.int64),
+    )
+    if np.any(sources <= 0):
+        raise ValueError("Number of sources should be positive")
+    order = np.argsort(-agents, axis=None, kind="stable")
+    return (
+        intensity.ravel()[order],
+        agents.ravel()[order],
+        sources.ravel()[order],
+        order,
+        intensity.shape,
+    )
+
+
+def engset_b_array(t_intensity: Any, agents: Any, sources: Any) -> Any:
+    """
+    Calculates blocking probability using Engset formula for arrays of inputs.
+
+    Inputs are broadcasted against each other. Uses the same recurrence as engset_b(),
+    each step is done for all elements at once.
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs when all sources are idle.
+    agents : array_like
+        Numbers of agents.
+    sources : array_like
+        Numbers of sources.
+
+    Returns
+    -------
+    ndarray
+        Probabilities of blocking. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> engset_b_array([30, 12], [35, 15], 300)
+    array([0.02405701, 0.07172678])
+    """
+    __require_numpy()
+    intensity, agents, sources, order, shape = __prepare_sources(t_intensity, agents, sources)
+    result = __engset_blocking(intensity, agents, sources)
+    return __unsort(result, order, shape)
+
+
+def engset_c_array(t_intensity: Any, agents: Any, sources: Any) -> Any:
+    """
+    Calculates wait probability of finite source delay model for arrays of inputs.
+
+    Inputs are broadcasted against each other. Uses the same sums as engset_c(),
+    each queue state is added for all elements at once, and summation stops when
+    the rest of the queue is negligible for all elements.
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs when all sources are idle.
+    agents : array_like
+        Numbers of agents.
+    sources : array_like
+        Numbers of sources.
+
+    Returns
+    -------
+    ndarray
+        Probabilities that there is no available agents to answer the call.
+        Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> engset_c_array([30, 12], [35, 15], 300)
+    array([0.08852849, 0.23584648])
+    """
+    __require_numpy()
+    intensity, agents, sources, order, shape = __prepare_sources(t_intensity, agents, sources)
+    weight = __engset_blocking(intensity, agents, sources)
+    free = 1 - weight
+    queued = np.zeros(intensity.shape)
+    room = sources - agents
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_agent = intensity / sources / agents
+        for j in range(int(room.max(initial=0))):
+            queued += weight
+            ratio = np.maximum(room - j - 1, 0) * per_agent
+            weight = weight * ratio
+            # Ratios only decrease, so the rest of the tail is less than weight / (1 - ratio).
+            if np.all((ratio < 1) & (weight < (1 - ratio) * (free + queued) * STABLE_EPSILON)):
+                break
+            large = weight > SCALE_LIMIT
+            weight[large] /= SCALE_LIMIT
+            free[large] /= SCALE_LIMIT
+            queued[large] /= SCALE_LIMIT
+        result = np.where(agents > 0, queued / (free + queued), 1.0)
+    return __unsort(result, order, shape)
+
+
+def wait_time_cdf_array(t_intensity: Any, agents: Any, aht: Any, times: Any) -> Any:
+    """
+    Calculates distribution of waiting time for arrays of inputs.
+
+    Erlang C is calculated once for each pair of intensity and agents, then it's broadcasted
+    against times. For example intensities[:, None] and times[None, :] give table of
+    service levels with row for each interval and column for each answer time.
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs.
+    agents : array_like
+        Numbers of agents.
+    aht : array_like
+        Average Handling Times.
+    times : array_like
+        Answer times. Should have same unit as aht.
+
+    Returns
+    -------
+    ndarray
+        Probabilities to be answered in each time. Range 0-1(0%-100%).
+
+    Examples
+    --------
+    >>> wait_time_cdf_array(123, 130, 300, [0, 20, 60])
+    array([0.57561925, 0.73387546, 0.89534899])
+    """
+    __require_numpy()
+    wait = erlang_c_array(t_intensity, agents)
+    intensity, agents, aht, times, wait = np.broadcast_arrays(
+        np.asarray(t_intensity, dtype=float),
+        np.asarray(agents, dtype=float),
+        np.asarray(aht, dtype=float),
+        np.asarray(times, dtype=float),
+        wait,
+    )
+    result = 1 - wait * np.exp(-np.maximum(agents - intensity, 0) * times / aht)
+    return np.where(agents > intensity, result, 0.0)[()]
+
+
+def wait_time_quantiles_array(t_intensity: Any, agents: Any, aht: Any, probabilities: Any) -> Any:
+    """
+    Calculates answer times in which given parts of calls are answered for arrays of inputs.
+
+    Erlang C is calculated once for each pair of intensity and agents, then it's broadcasted
+    against probabilities, the same way as in wait_time_cdf_array().
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs.
+    agents : array_like
+        Numbers of agents.
+    aht : array_like
+        Average Handling Times.
+    probabilities : array_like
+        Parts of calls which should be answered. Should be 0-1 (0-100%).
+
+    Returns
+    -------
+    ndarray
+        Answer times for each probability. Unit is the same as for AHT.
+
+    Examples
+    --------
+    >>> wait_time_quantiles_array([123, 125], 130, 300, [[0.9], [0.99]])
+    array([[ 61.94832298, 102.80924228],
+           [160.63054125, 240.96434786]])
+    """
+    __require_numpy()
+    probabilities = np.asarray(probabilities, dtype=float)
+    if np.any((probabilities < 0) | (probabilities > 1)):
+        raise ValueError("Probabilities should be 0-1")
+    wait = erlang_c_array(t_intensity, agents)
+    intensity, agents, aht, probabilities, wait = np.broadcast_arrays(
+        np.asarray(t_intensity, dtype=float),
+        np.asarray(agents, dtype=float),
+        np.asarray(aht, dtype=float),
+        probabilities,
+        wait,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.log(wait / (1 - probabilities)) * aht / (agents - intensity)
+    result = np.where(agents > intensity, result, np.inf)
+    # Wait probability is 1 without enough agents, so p = 0 is answered immediately as well.
+    return np.where(probabilities <= 1 - wait, 0.0, result)[()]
+
+
+def agents_for_blocking_array(t_intensity: Any, target_blocking: Any) -> Any:
+    """
+    Calculates the lowest numbers of agents with blocking not more than target for arrays.
+
+    Inputs are broadcasted against each other. Uses the same recurrence as
+    agents_for_blocking(), each step is done for all unsolved elements at once.
+
+    Parameters
+    ----------
+    t_intensity : array_like
+        Traffic intensities in Erlangs.
+    target_blocking : array_like
+        The highest allowed probabilities of blocking. Should be more than 0.
+
+    Returns
+    -------
+    ndarray
+        Numbers of agents.
+
+    Examples
+    --------
+    >>> agents_for_blocking_array([340, 12.5], 0.005)
+    array([373,  22])
+    """
+    __require_numpy()
+    intensity, target = np.broadcast_arrays(
+        np.asarray(t_intensity, dtype=float), np.asarray(target_blocking, dtype=float)
+    )
+    if np.any(target <= 0):
+        raise ValueError("Target blocking should be more than 0")
+    shape = intensity.shape
+    intensity, target = intensity.ravel(), target.ravel()
+    result = np.zeros(intensity.shape, dtype=np.int64)
+    # Blocking for 0 agents is 1.
+    active = np.flatnonzero(target < 1)
+    blocking = np.ones(active.shape)
+    agents = 0
+    while active.size:
+        agents += 1
+        load = intensity[active] * blocking
+        blocking = load / (agents + load)
+        done = blocking <= target[active]
+        result[active[done]] = agents
+        active, blocking = active[~done], blocking[~done]
+    return result.reshape(shape)[()]
+
+
+def max_calls_for_agents_array(
+    agents: Any,
+    aht: Any,
+    target_answer_time: Any = 20,
+    target_service_level: Any = 0.80,
+    max_occupancy: Any = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> Any:
+    """
+    Calculates the highest numbers of calls per hour which teams handle at targets for arrays.
+
+    Inputs are broadcasted against each other, for example agents of every interval
+    of a roster. Uses the same bisection as max_calls_for_agents(), each probe is
+    one erlang_c_array() call for all elements.
+
+    Parameters
+    ----------
+    agents : array_like
+        Numbers of agents.
+    aht : array_like
+        Average Handling Times. Default unit is seconds.
+    target_answer_time : array_like, default=20
+        Target times of answer to incoming call. Should have same time unit as aht.
+    target_service_level : array_like, default=0.80 (80%).
+        Percentages of calls that should be answered in target_answer_time.
+    max_occupancy : array_like, optional
+        If specified - numbers of calls are also limited by occupancy.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Returns
+    -------
+    ndarray
+        Numbers of calls per hour.
+
+    Examples
+    --------
+    >>> max_calls_for_agents_array([45, 10], 120)
+    array([1221.64204915,  224.59156498])
+    """
+    __require_numpy()
+    agents, aht, answer_time, target, occupancy = np.broadcast_arrays(
+        np.asarray(agents, dtype=np.int64),
+        np.asarray(aht, dtype=float),
+        np.asarray(target_answer_time, dtype=float),
+        np.asarray(target_service_level, dtype=float),
+        np.asarray(1.0 if max_occupancy is None else max_occupancy, dtype=float),
+    )
+
+    def meets_target(t_intensity: Any) -> Any:
+        return __meets_service_level(t_intensity, agents, aht, answer_time, target)
+
+    high = np.maximum(agents, 0) * np.minimum(occupancy, 1)
+    t_intensity = __bisect_highest_array(meets_target, high)
+    calls_per_hour = t_intensity / (aht / time_unit.value)
+    # Rounding of intensity may need one more agent for occupancy.
+    while True:
+        t_intensity = calls_per_hour * (aht / time_unit.value)
+        extra = np.ceil(t_intensity / occupancy) > np.maximum(agents, 0)
+        if not extra.any():
+            break
+        calls_per_hour = np.where(extra, calls_per_hour * (1 - np.finfo(float).eps), calls_per_hour)
+    return np.where(target >= 1, 0.0, calls_per_hour)[()]
+
+
+def max_aht_for_agents_array(
+    calls_per_hour: Any,
+    agents: Any,
+    target_answer_time: Any = 20,
+    target_service_level: Any = 0.80,
+    max_occupancy: Any = None,
+    time_unit: TimeUnit = TimeUnit.SEC,
+) -> Any:
+    """
+    Calculates the highest average handling times which staffed intervals absorb for arrays.
+
+    Inputs are broadcasted against each other, for example calls and agents of every
+    interval of a roster. Uses the same bisection as max_aht_for_agents(), each probe is
+    one erlang_c_array() call for all elements.
+
+    Parameters
+    ----------
+    calls_per_hour : array_like
+        Numbers of calls offered per hour.
+    agents : array_like
+        Numbers of scheduled agents.
+    target_answer_time : array_like, default=20
+        Target times of answer to incoming call. Should have same time unit as aht.
+    target_service_level : array_like, default=0.80 (80%).
+        Percentages of calls that should be answered in target_answer_time.
+    max_occupancy : array_like, optional
+        If specified - handling times are also limited by occupancy.
+    time_unit : TimeUnit, default = TimeUnit.SEC
+        Unit for average handling time and target_answer_time.
+
+    Returns
+    -------
+    ndarray
+        Average handling times. Infinite where there are no calls.
+
+    Examples
+    --------
+    >>> max_aht_for_agents_array([1000, 1200], [45, 45])
+    array([145.42782388, 122.07497548])
+    """
+    __require_numpy()
+    calls, agents, answer_time, target, occupancy = np.broadcast_arrays(
+        np.asarray(calls_per_hour, dtype=float),
+        np.asarray(agents, dtype=np.int64),
+        np.asarray(target_answer_time, dtype=float),
+        np.asarray(target_service_level, dtype=float),
+        np.asarray(1.0 if max_occupancy is None else max_occupancy, dtype=float),
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        def meets_target(aht: Any) -> Any:
+            t_intensity = calls * (aht / time_unit.value)
+            return __meets_service_level(t_intensity, agents, aht, answer_time, target)
+
+        high = np.maximum(agents, 0) * np.minimum(occupancy, 1) / calls * time_unit.value
+        high = np.where(calls > 0, high, 0.0)
+        aht = __bisect_highest_array(meets_target, high)
+    # Rounding of intensity may need one more agent for occupancy.
+    while True:
+        extra = np.ceil(calls * (aht / time_unit.value) / occupancy) > np.maximum(agents, 0)
+        if not extra.any():
+            break
+        aht = np.where(extra, aht * (1 - np.finfo(float).eps), aht)
+    aht = np.where(target >= 1, 0.0, aht)
+    return np.where(calls > 0, aht, np.inf)[()]
+
+
+def __meets_service_level(
+    t_intensity: Any, agents: Any, aht: Any, target_answer_time: Any, target_service_level: Any
+) -> Any:
+    """
+    Check service level target for arrays.
+
+    Parameters
+    ----------
+    t_intensity : ndarray
+        Traffic intensities in Erlangs.
+    agents : ndarray
+        Numbers of agents.
+    aht : ndarray
+        Average Handling Times.
+    target_answer_time : ndarray
+        Target times of answer to incoming call. Should have same unit as aht.
+    target_service_level : ndarray
+        Percentages of calls that should be answered in target_answer_time.
+
+    Returns
+    -------
+    ndarray
+        True where service level meets target.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        wait_probability = erlang_c_array(t_intensity, agents)
+        expon = -(agents - t_intensity) * target_answer_time / aht
+        service_level = 1 - wait_probability * np.exp(expon)
+    return (agents > t_intensity) & (service_level >= target_service_level)
+
+
+def __bisect_highest_array(meets_target: Callable[[Any], Any], high: Any) -> Any:
+    """
+    Find the highest values between 0 and high which meet target.
+
+    Parameters
+    ----------
+    meets_target : Callable[[ndarray], ndarray]
+        True for values which meet target, should be monotonic for each element.
+    high : ndarray
+        Upper bounds, returned where they meet target.
+
+    Returns
+    -------
+    ndarray
+        The highest values which meet target.
+    """
+    low = np.where(meets_target(high), high, 0.0)
+    # 60 halvings reach precision of float for any upper bound.
+    for _ in range(60):
+        middle = (low + high) / 2
+        meets = meets_target(middle)
+        low, high = np.where(meets, middle, low), np.where(meets, high, middle)
+    return low
@@ -0,0 +1,5 @@
+"""
+Version of the package.
+"""
+
+__version__ = "1.0.0"